@@ -0,0 +1,72 @@
+import re
+from fastapi.responses import JSONResponse
+from app.config import settings
+from app.services import AdmissionRejected
+
+# Endpoints that start pipelines (a batch is admitted once, not per lecture)
+ADMITTED_PATHS = ("/api/upload", "/api/batch")
+
+# Batch lectures: a per-client batch quota, their pipelines are scheduled by the batch
+BATCH_UPLOAD_PATH = re.compile(r"^/api/batch/[^/]+/upload$")
+
+
+def client_id(scope: dict) -> str:
+    """Client address, or the first X-Forwarded-For hop behind a trusted proxy."""
+    if settings.admission_trust_proxy:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class AdmissionMiddleware:
+    """
+    Apply admission control to uploads before their body is read.
+
+    Rejected uploads get 429 with Retry-After straight away instead of after
+    hundreds of megabytes have been received. Admitted ones carry their
+    ticket in request.state.admission; the route hands it to the pipeline,
+    and it is released here if the request ends without doing so. Batch
+    lecture uploads only draw on their client's batch quota.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        # Looked up per request so the controller can be swapped (benchmarks)
+        from app.api import routes
+
+        admission = routes.admission
+        if admission is None or scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        batch_lecture = BATCH_UPLOAD_PATH.match(scope["path"])
+        if not batch_lecture and scope["path"] not in ADMITTED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            if batch_lecture:
+                admission.admit_batch_lecture(client_id(scope))
+            else:
+                ticket = admission.admit(client_id(scope))
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                {"detail": str(e), "reason": e.reason},
+                status_code=429,
+                headers={"Retry-After": str(e.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        if batch_lecture:
+            await self.app(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["admission"] = ticket
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.release(ticket)
@@ -0,0 +1,137 @@
+import os
+import asyncio
+import hashlib
+from typing import Dict, Optional, Tuple
+import aiofiles
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+# Generated files never change once written, so clients may keep them
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+READ_CHUNK_SIZE = 64 * 1024
+
+# (path, size, mtime_ns) -> strong ETag, so each file is hashed once
+_etags: Dict[Tuple[str, int, int], str] = {}
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def file_etag(path: str) -> str:
+    """Strong ETag derived from the file's content."""
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    if key not in _etags:
+        _etags[key] = f'"{await asyncio.to_thread(_hash_file, path)}"'
+    return _etags[key]
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=" range into inclusive (start, end).
+
+    Returns:
+        The range, or None if the header should be ignored (malformed or
+        several ranges; the full file is sent instead)
+
+    Raises:
+        ValueError: If the range can't be satisfied
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if not sep or (start is None and end is None):
+        return None
+
+    if start is None:
+        # Suffix range: the last N bytes
+        if end == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - end), size - 1
+
+    end = size - 1 if end is None else min(end, size - 1)
+    if start >= size:
+        raise ValueError("Range starts past the end of the file")
+    if start > end:
+        return None
+    return start, end
+
+
+async def _read_range(path: str, start: int, length: int):
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        while length > 0:
+            data = await f.read(min(READ_CHUNK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+async def serve_file(
+    request: Request, path: str, media_type: str, filename: Optional[str] = None
+) -> Response:
+    """
+    Serve an immutable file with range and conditional request support.
+
+    Handles If-None-Match (304), Range / If-Range (206, 416) and sends a
+    content-derived ETag with a long-lived Cache-Control header.
+    """
+    size = os.path.getsize(path)
+    etag = await file_etag(path)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+        "Accept-Ranges": "bytes"
+    }
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    start, end = 0, size - 1
+    status_code = 200
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and size and (not if_range or if_range.strip() == etag):
+        try:
+            byte_range = _parse_range(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"}
+            )
+        if byte_range:
+            start, end = byte_range
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    length = end - start + 1 if size else 0
+    headers["Content-Length"] = str(length)
+    return StreamingResponse(
+        _read_range(path, start, length),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers
+    )
@@ -1,15 +1,21 @@
 import os
 import uuid
 import asyncio
-from typing import Dict
-from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+import time
+from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
 
 from app.config import settings
+from app.api.file_response import serve_file
 from app.models import (
     UploadResponse,
     StatusResponse,
     ResultsResponse,
+    PartialResultsResponse,
+    BatchCreate,
+    BatchResponse,
+    BatchLecture,
+    BatchStatusResponse,
     ProcessingStatus,
     NoteSection,
     QuizQuestion
@@ -18,86 +24,331 @@ from app.services import (
     VideoProcessor,
     TranscriptionService,
     AIGeneratorService,
-    TTSService
+    TTSService,
+    UploadService,
+    FileTooLargeError,
+    ResultCache,
+    Stage,
+    StageGraph,
+    TaskStore,
+    create_task_store,
+    ProgressBroker,
+    JobQueue,
+    StageLimits,
+    TranscriptIndex,
+    AdmissionController,
+    BatchScheduler,
+    summarize_batch
 )
+from app.services import metrics
 
 router = APIRouter()
 
-# In-memory task storage (use Redis/DB in production)
-tasks: Dict[str, dict] = {}
+# Task storage (in-memory or SQLite, see settings.task_store)
+tasks: TaskStore = create_task_store()
+
+# Wakes /status/{task_id}/stream subscribers whenever a task changes
+progress_broker = ProgressBroker()
+tasks.add_listener(progress_broker.publish)
 
 # Service instances
 video_processor = VideoProcessor()
 transcription_service = TranscriptionService()
 ai_generator = AIGeneratorService()
 tts_service = TTSService()
+upload_service = UploadService()
+result_cache = ResultCache()
+job_queue = JobQueue() if settings.job_queue_enabled else None
+transcript_index = TranscriptIndex() if settings.dedup_enabled else None
+
+# Upload quotas and pipeline slots (see AdmissionMiddleware); with the job
+# queue, pipelines run in workers and the limit applies to pending jobs
+admission = AdmissionController(
+    backlog=(lambda: job_queue.depth().get("pending", 0)) if job_queue else None
+) if settings.admission_enabled else None
+
+# Feeds batch lectures into the pipeline a few at a time (see BatchScheduler)
+batch_scheduler = BatchScheduler()
+
+# Caps concurrent stages per resource across every pipeline in this process
+stage_limits = StageLimits({
+    "ffmpeg": settings.ffmpeg_max_concurrency,
+    "whisper": settings.stage_limit_whisper,
+    "llm": settings.stage_limit_llm,
+    "tts": settings.stage_limit_tts
+})
+
+
+def _record_stage_metrics(graph: StageGraph):
+    """Export per-stage timings of a finished (or failed) pipeline run."""
+    for name, seconds in graph.timings.items():
+        if name in graph.failed:
+            outcome = "failed"
+        elif name in graph.completed:
+            outcome = "ok"
+        else:
+            outcome = "cancelled"
+        wait = graph.waits.get(name, 0.0)
+        metrics.stage_duration.observe(seconds, stage=name, outcome=outcome)
+        metrics.stage_wait.observe(wait, stage=name)
+        metrics.log_event(
+            "stage", stage=name, outcome=outcome,
+            duration_s=round(seconds, 3), wait_s=round(wait, 3)
+        )
 
 
 async def process_video_task(task_id: str, video_path: str):
     """Background task to process video through the full pipeline."""
-    try:
-        # Step 1: Extract audio
-        tasks[task_id]["status"] = ProcessingStatus.EXTRACTING_AUDIO
-        tasks[task_id]["progress"] = 10
-        tasks[task_id]["current_step"] = "Extracting audio from video..."
+    metrics.current_task_id.set(task_id)
+    started = time.perf_counter()
 
+    # Lecture length decides the Whisper model (see TranscriptionService.choose_model)
+    try:
+        duration = await video_processor.get_video_duration(video_path)
+    except Exception:
+        duration = None
+    model = transcription_service.choose_model(duration)
+
+    keys = result_cache.stage_keys(tasks.get(task_id)["content_hash"], model)
+    audio_paths = []
+    generated = {}  # Narration and quiz produced early by combined generation
+    ready = []  # Artifacts readable through /results/{task_id}/partial
+    streaming_notes = False
+
+    def publish(artifact: str, **fields):
+        """Store a finished artifact so clients can read it before the job ends."""
+        if artifact not in ready:
+            ready.append(artifact)
+            metrics.artifact_ready.observe(time.perf_counter() - started, artifact=artifact)
+        tasks.update(task_id, ready=list(ready), **fields)
+
+    def publish_sections(sections):
+        """Expose note sections while the notes reply is still streaming."""
+        nonlocal streaming_notes
+        if "notes" in ready:
+            return
+        if not streaming_notes:
+            streaming_notes = True
+            metrics.artifact_ready.observe(time.perf_counter() - started, artifact="notes_partial")
+        tasks.update(task_id, notes=sections)
+
+    async def extract_audio(inputs):
         audio_path = await video_processor.extract_audio(video_path, task_id)
+        audio_paths.append(audio_path)
+        # Recorded so expiry or deletion can still remove it if this run dies
+        tasks.update(task_id, audio_paths=list(audio_paths))
+        return audio_path
+
+    async def reuse_near_duplicate(transcript: str):
+        """Point downstream cache keys at an earlier, nearly identical lecture."""
+        if not transcript_index or not transcript_index.usable(transcript):
+            return
+        signature = await asyncio.to_thread(transcript_index.signature, transcript)
+        match = await asyncio.to_thread(transcript_index.find, signature)
+        if match and match[0] != keys["transcript"]:
+            reused = result_cache.transcript_keys(match[0])
+            # Only worth it while the earlier results are still cached
+            if result_cache.has(reused["notes"]):
+                keys.update({k: v for k, v in reused.items() if k != "transcript"})
+                metrics.log_event("near_duplicate", match=match[0], similarity=round(match[1], 3))
+                return
+        await asyncio.to_thread(transcript_index.add, keys["transcript"], signature)
+
+    async def transcribe(inputs):
+        transcript = await transcription_service.transcribe(
+            inputs["extract_audio"], job_id=task_id, model=model
+        )
+        result_cache.put(keys["transcript"], transcript)
+        publish("transcript", transcript=transcript)
+        await reuse_near_duplicate(transcript)
+        return transcript
+
+    async def stream_and_transcribe(inputs):
+        # ffmpeg's PCM output feeds Whisper directly, no audio file on disk
+        transcript = await transcription_service.transcribe_stream(
+            video_processor.stream_audio(video_path), job_id=task_id, model=model
+        )
+        result_cache.put(keys["transcript"], transcript)
+        publish("transcript", transcript=transcript)
+        await reuse_near_duplicate(transcript)
+        return transcript
+
+    async def generate_notes(inputs):
+        cached = result_cache.get("notes", keys["notes"])
+        if cached is not None:
+            notes = [NoteSection(**n) for n in cached]
+        elif settings.llm_combined_generation:
+            # One request for all three; summarize and build_quiz pick up the rest
+            notes, generated["narration"], generated["quiz"] = (
+                await ai_generator.generate_materials(inputs["transcribe"], on_sections=publish_sections)
+            )
+            result_cache.put(keys["notes"], [n.model_dump() for n in notes])
+        else:
+            notes = await ai_generator.generate_notes(inputs["transcribe"], on_sections=publish_sections)
+            result_cache.put(keys["notes"], [n.model_dump() for n in notes])
+        publish("notes", notes=notes)
+        return notes
+
+    async def summarize(inputs):
+        if "narration" in generated:
+            summary_text = generated["narration"]
+            result_cache.put(keys["narration"], summary_text)
+            return summary_text
+
+        summary_text = result_cache.get("narration", keys["narration"])
+        if summary_text is None:
+            summary_text = await ai_generator.summarize_for_tts(inputs["generate_notes"])
+            result_cache.put(keys["narration"], summary_text)
+        return summary_text
+
+    async def create_voice(inputs):
+        # A near-duplicate lecture may already have this narration recorded
+        voice_path = os.path.join(settings.output_dir, f"{task_id}_voice.mp3")
+        if not (result_cache.has(keys["voice"])
+                and await result_cache.get_file("voice", keys["voice"], voice_path)):
+            voice_path = await tts_service.generate_audio(inputs["summarize"], task_id)
+            await result_cache.put_file(keys["voice"], voice_path)
+        publish("audio", audio_path=voice_path)
+        return voice_path
+
+    async def build_quiz(inputs):
+        if "quiz" in generated:
+            quiz = generated["quiz"]
+            result_cache.put(keys["quiz"], [q.model_dump() for q in quiz])
+            publish("quiz", quiz=quiz)
+            return quiz
+
+        cached = result_cache.get("quiz", keys["quiz"])
+        if cached is not None:
+            quiz = [QuizQuestion(**q) for q in cached]
+        else:
+            quiz = await ai_generator.generate_quiz(inputs["transcribe"], inputs["generate_notes"])
+            result_cache.put(keys["quiz"], [q.model_dump() for q in quiz])
+        publish("quiz", quiz=quiz)
+        return quiz
+
+    def report(graph: StageGraph):
+        # Bookkeeping stages (e.g. a cached transcript) have no status to show
+        if graph.current_status is not None:
+            tasks.update(
+                task_id,
+                status=graph.current_status,
+                current_step=graph.current_step,
+                progress=graph.progress
+            )
+        else:
+            tasks.update(task_id, progress=graph.progress)
 
-        # Step 2: Transcribe
-        tasks[task_id]["status"] = ProcessingStatus.TRANSCRIBING
-        tasks[task_id]["progress"] = 30
-        tasks[task_id]["current_step"] = "Transcribing speech to text..."
-
-        transcript = await transcription_service.transcribe(audio_path)
-
-        # Step 3: Generate notes
-        tasks[task_id]["status"] = ProcessingStatus.GENERATING_NOTES
-        tasks[task_id]["progress"] = 50
-        tasks[task_id]["current_step"] = "Generating study notes..."
+    try:
+        # Skip audio extraction and Whisper entirely when the transcript is cached
+        stages = []
+        transcript = result_cache.get("transcript", keys["transcript"])
+        if transcript is None and settings.stream_audio:
+            stages.append(
+                Stage("transcribe", stream_and_transcribe,
+                      status=ProcessingStatus.TRANSCRIBING,
+                      description="Extracting and transcribing audio...", weight=40,
+                      resource="whisper")
+            )
+        elif transcript is None:
+            stages += [
+                Stage("extract_audio", extract_audio,
+                      status=ProcessingStatus.EXTRACTING_AUDIO,
+                      description="Extracting audio from video...", weight=10,
+                      resource="ffmpeg", retries=settings.stage_retries),
+                Stage("transcribe", transcribe, depends_on=["extract_audio"],
+                      status=ProcessingStatus.TRANSCRIBING,
+                      description="Transcribing speech to text...", weight=30,
+                      resource="whisper")
+            ]
+        else:
+            async def cached_transcript(inputs):
+                publish("transcript", transcript=transcript)
+                return transcript
+
+            stages.append(Stage("transcribe", cached_transcript, weight=0))
+
+        # Voice comes straight from the cache when the narration is unchanged
+        voice_path = os.path.join(settings.output_dir, f"{task_id}_voice.mp3")
+        if await result_cache.get_file("voice", keys["voice"], voice_path):
+            publish("audio", audio_path=voice_path)
+            voice_stages = []
+        else:
+            voice_stages = [
+                Stage("summarize", summarize, depends_on=["generate_notes"],
+                      status=ProcessingStatus.CREATING_VOICE,
+                      description="Creating voice summary...", weight=10,
+                      resource="llm", retries=settings.stage_retries),
+                Stage("create_voice", create_voice, depends_on=["summarize"],
+                      status=ProcessingStatus.CREATING_VOICE,
+                      description="Recording voice summary...", weight=15,
+                      resource="tts", retries=settings.stage_retries)
+            ]
+
+        stages += [
+            Stage("generate_notes", generate_notes, depends_on=["transcribe"],
+                  status=ProcessingStatus.GENERATING_NOTES,
+                  description="Generating study notes...", weight=20,
+                  resource="llm", retries=settings.stage_retries),
+            *voice_stages,
+            Stage("build_quiz", build_quiz, depends_on=["transcribe", "generate_notes"],
+                  status=ProcessingStatus.BUILDING_QUIZ,
+                  description="Building interactive quiz...", weight=15,
+                  resource="llm", retries=settings.stage_retries)
+        ]
+
+        graph = StageGraph(stages, limits=stage_limits)
+        try:
+            await graph.run(on_change=report)
+        finally:
+            _record_stage_metrics(graph)
 
-        notes = await ai_generator.generate_notes(transcript)
-        tasks[task_id]["notes"] = notes
+        # Done!
+        tasks.update(
+            task_id,
+            status=ProcessingStatus.COMPLETED,
+            progress=100,
+            current_step="Processing complete!"
+        )
 
-        # Step 4: Create voice summary
-        tasks[task_id]["status"] = ProcessingStatus.CREATING_VOICE
-        tasks[task_id]["progress"] = 70
-        tasks[task_id]["current_step"] = "Creating voice summary..."
+        # Cleanup uploaded video
+        video_processor.cleanup(video_path, *audio_paths)
+        status = "completed"
 
-        summary_text = await ai_generator.summarize_for_tts(notes)
-        voice_path = await tts_service.generate_audio(summary_text, task_id)
-        tasks[task_id]["audio_path"] = voice_path
+    except Exception as e:
+        tasks.update(
+            task_id,
+            status=ProcessingStatus.FAILED,
+            error=str(e),
+            current_step=f"Error: {str(e)}"
+        )
+        # The video stays for a job queue retry until the task expires
+        video_processor.cleanup(*audio_paths)
+        status = "failed"
 
-        # Step 5: Generate quiz
-        tasks[task_id]["status"] = ProcessingStatus.BUILDING_QUIZ
-        tasks[task_id]["progress"] = 90
-        tasks[task_id]["current_step"] = "Building interactive quiz..."
+    elapsed = time.perf_counter() - started
+    metrics.jobs_total.inc(status=status)
+    metrics.job_duration.observe(elapsed, status=status)
+    metrics.log_event("job", status=status, duration_s=round(elapsed, 3))
 
-        quiz = await ai_generator.generate_quiz(transcript, notes)
-        tasks[task_id]["quiz"] = quiz
+    batch_id = (tasks.get(task_id) or {}).get("batch_id")
+    if batch_id:
+        refresh_batch(batch_id)
 
-        # Done!
-        tasks[task_id]["status"] = ProcessingStatus.COMPLETED
-        tasks[task_id]["progress"] = 100
-        tasks[task_id]["current_step"] = "Processing complete!"
 
-        # Cleanup uploaded video
-        video_processor.cleanup(video_path, audio_path)
+async def run_admitted(ticket, task_id: str, video_path: str):
+    """Run a pipeline once admission control has a slot for it."""
+    if admission is None or ticket is None:
+        await process_video_task(task_id, video_path)
+        return
+    async with admission.slot(ticket):
+        await process_video_task(task_id, video_path)
 
-    except Exception as e:
-        tasks[task_id]["status"] = ProcessingStatus.FAILED
-        tasks[task_id]["error"] = str(e)
-        tasks[task_id]["current_step"] = f"Error: {str(e)}"
 
+async def _accept_upload(file: UploadFile, check_saturation: bool = True):
+    """Validate and save an uploaded video and create its task; returns (task_id, video_path)."""
+    # Oversized bodies never get here: UploadLimitMiddleware cuts them off
 
-@router.post("/upload", response_model=UploadResponse)
-async def upload_video(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...)
-):
-    """
-    Upload a video file for processing.
-    Returns a task_id to track progress.
-    """
     # Validate file type
     allowed_types = ["video/mp4", "video/avi", "video/mov", "video/x-matroska"]
     if file.content_type not in allowed_types:
@@ -106,37 +357,63 @@ async def upload_video(
             detail=f"Invalid file type. Allowed: MP4, AVI, MOV, MKV"
         )
 
+    # Backpressure: don't accept work the transcription queue can't hold
+    if check_saturation and transcription_service.is_saturated:
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy transcribing other lectures. Please try again shortly."
+        )
+
     # Generate task ID
     task_id = str(uuid.uuid4())
 
-    # Save uploaded file
-    video_path = os.path.join(settings.upload_dir, f"{task_id}_{file.filename}")
-    with open(video_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-
-    # Check file size
-    file_size_mb = len(content) / (1024 * 1024)
-    if file_size_mb > settings.max_file_size_mb:
-        os.remove(video_path)
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Maximum size: {settings.max_file_size_mb}MB"
-        )
+    # Stream uploaded file to disk, stopping as soon as it goes over the limit
+    try:
+        upload = await upload_service.save(file, task_id)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Initialize task
-    tasks[task_id] = {
+    tasks.create(task_id, {
         "status": ProcessingStatus.PENDING,
         "progress": 0,
         "current_step": "Queued for processing...",
+        "transcript": None,
         "notes": None,
         "quiz": None,
         "audio_path": None,
+        "video_path": upload["path"],
+        "audio_paths": [],
+        "ready": [],
+        "content_hash": upload["sha256"],
         "error": None
-    }
+    })
+    return task_id, upload["path"]
+
+
+@router.post("/upload", response_model=UploadResponse)
+async def upload_video(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...)
+):
+    """
+    Upload a video file for processing.
+    Returns a task_id to track progress.
 
-    # Start background processing
-    background_tasks.add_task(process_video_task, task_id, video_path)
+    Uploads over quota are rejected with 429 and Retry-After before this
+    runs (see AdmissionMiddleware).
+    """
+    task_id, video_path = await _accept_upload(file)
+
+    # Hand off to the worker processes if the job queue is on, else run here
+    if job_queue:
+        job_queue.enqueue(task_id, {"video_path": video_path})
+    else:
+        ticket = getattr(request.state, "admission", None)
+        if ticket is not None:
+            ticket.handed_off = True
+        background_tasks.add_task(run_admitted, ticket, task_id, video_path)
 
     return UploadResponse(
         task_id=task_id,
@@ -144,28 +421,264 @@ async def upload_video(
     )
 
 
-@router.get("/status/{task_id}", response_model=StatusResponse)
-async def get_status(task_id: str):
-    """Get the current processing status of a task."""
-    if task_id not in tasks:
-        raise HTTPException(status_code=404, detail="Task not found")
+def refresh_batch(batch_id: str):
+    """
+    Recompute a batch's aggregate progress from its lectures and store it.
+
+    Returns the batch record and its summary, or None if there is no such
+    batch. The stored status turns completed once every lecture has been
+    uploaded and has finished, so finished batches expire like tasks.
+    """
+    batch = tasks.get(batch_id)
+    if batch is None or batch.get("kind") != "batch":
+        return None
+    lectures = [tasks.get(task_id) for task_id in batch["task_ids"]]
+    summary = summarize_batch(batch, lectures)
+
+    fields = {
+        "status": ProcessingStatus.COMPLETED if summary["finished"] else ProcessingStatus.PENDING,
+        "progress": summary["progress"],
+        "current_step": (
+            f"{summary['completed'] + summary['failed']} of {summary['total']} lectures processed"
+        )
+    }
+    if any(batch[key] != value for key, value in fields.items()):
+        tasks.update(batch_id, **fields)
+        if summary["finished"]:
+            metrics.log_event(
+                "batch", total=summary["total"], failed=summary["failed"],
+                duration_s=summary["elapsed_seconds"],
+                lectures_per_hour=summary["lectures_per_hour"]
+            )
+    return {**batch, **fields}, summary
+
+
+async def run_batch_lecture(task_id: str, video_path: str):
+    """Run one batch lecture once the batch scheduler gives it a turn."""
+    # Batch uploads skip the per-upload quotas, but still share pipeline slots
+    ticket = admission.reserve("batch") if admission else None
+    await run_admitted(ticket, task_id, video_path)
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def create_batch(batch: BatchCreate):
+    """
+    Start a batch, e.g. a whole course; its lectures follow through
+    /batch/{batch_id}/upload.
+
+    Creating a batch counts as one upload for admission control. Its
+    lectures then draw on the client's batch quota (admission_batch_*)
+    instead of the per-upload one, and are scheduled so that some are
+    transcribed while others are in ffmpeg or the LLM.
+    """
+    if not 1 <= batch.total <= settings.batch_max_lectures:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch holds 1 to {settings.batch_max_lectures} lectures"
+        )
+
+    batch_id = str(uuid.uuid4())
+    tasks.create(batch_id, {
+        "kind": "batch",
+        "name": batch.name,
+        "total": batch.total,
+        "task_ids": [],
+        "filenames": [],
+        "created_at": time.time(),
+        "status": ProcessingStatus.PENDING,
+        "progress": 0,
+        "current_step": f"0 of {batch.total} lectures processed",
+        "error": None
+    })
+    return BatchResponse(
+        batch_id=batch_id,
+        total=batch.total,
+        message=f"Batch created. Upload {batch.total} lectures to /api/batch/{batch_id}/upload."
+    )
+
+
+@router.post("/batch/{batch_id}/upload", response_model=UploadResponse)
+async def upload_batch_lecture(batch_id: str, file: UploadFile = File(...)):
+    """Upload one lecture of a batch; it starts as soon as the batch scheduler has room."""
+    batch = tasks.get(batch_id)
+    if batch is None or batch.get("kind") != "batch":
+        raise HTTPException(status_code=404, detail="Batch not found")
+    if len(batch["task_ids"]) >= batch["total"]:
+        raise HTTPException(status_code=400, detail="All lectures of this batch are already uploaded")
+
+    # The scheduler bounds batch work itself, so no 503 when Whisper is busy
+    task_id, video_path = await _accept_upload(file, check_saturation=False)
+    tasks.update(task_id, batch_id=batch_id, filename=file.filename)
+
+    def add_lecture(batch: dict) -> dict:
+        # Checked again here: other uploads may have filled the batch meanwhile
+        if len(batch["task_ids"]) >= batch["total"]:
+            raise HTTPException(status_code=400, detail="All lectures of this batch are already uploaded")
+        return {
+            "task_ids": batch["task_ids"] + [task_id],
+            "filenames": batch["filenames"] + [file.filename]
+        }
+
+    try:
+        added = tasks.modify(batch_id, add_lecture)
+        if added is None:
+            raise HTTPException(status_code=404, detail="Batch not found")
+    except HTTPException:
+        _cleanup_task_files(tasks.delete(task_id))
+        raise
+
+    if job_queue:
+        job_queue.enqueue(task_id, {"video_path": video_path})
+    else:
+        batch_scheduler.submit(lambda: run_batch_lecture(task_id, video_path))
+
+    return UploadResponse(task_id=task_id, message="Lecture uploaded. Processing is scheduled.")
+
+
+@router.get("/batch/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch_status(batch_id: str):
+    """Aggregate progress, throughput and per-lecture status of a batch."""
+    refreshed = refresh_batch(batch_id)
+    if refreshed is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    batch, summary = refreshed
+
+    lectures = []
+    for task_id, filename in zip(batch["task_ids"], batch["filenames"]):
+        task = tasks.get(task_id)
+        if task is None:
+            lectures.append(BatchLecture(task_id=task_id, filename=filename))
+            continue
+        lectures.append(BatchLecture(
+            task_id=task_id,
+            filename=filename,
+            status=task["status"],
+            progress=100 if task["status"] == ProcessingStatus.COMPLETED else task["progress"],
+            current_step=task["current_step"],
+            error=task.get("error")
+        ))
+
+    return BatchStatusResponse(batch_id=batch_id, name=batch.get("name"), lectures=lectures, **summary)
+
+
+def _status_response(task_id: str, task: dict) -> StatusResponse:
+    current_step = task["current_step"]
+    queue_position = transcription_service.queue_position(task_id)
+    if queue_position is not None:
+        current_step = f"Waiting for a transcription worker (position {queue_position})..."
 
-    task = tasks[task_id]
     return StatusResponse(
         task_id=task_id,
         status=task["status"],
         progress=task["progress"],
-        current_step=task["current_step"]
+        current_step=current_step,
+        queue_position=queue_position,
+        ready=task.get("ready") or []
+    )
+
+
+def _partial_response(task_id: str, task: dict) -> PartialResultsResponse:
+    ready = task.get("ready") or []
+    audio_ready = "audio" in ready or tts_service.is_rendering(task_id)
+    return PartialResultsResponse(
+        task_id=task_id,
+        status=task["status"],
+        progress=task["progress"],
+        ready=ready,
+        transcript=task.get("transcript"),
+        notes=task.get("notes"),
+        quiz=task.get("quiz"),
+        audio_url=f"/api/audio/{task_id}" if audio_ready else None,
+        error=task.get("error")
+    )
+
+
+@router.get("/status/{task_id}", response_model=StatusResponse)
+async def get_status(task_id: str):
+    """Get the current processing status of a task."""
+    task = tasks.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return _status_response(task_id, task)
+
+
+@router.get("/status/{task_id}/stream")
+async def stream_status(task_id: str, request: Request):
+    """
+    Push status changes as Server-Sent Events.
+
+    Sends a "status" event with a StatusResponse each time the task
+    changes, a "results" event with a PartialResultsResponse whenever an
+    artifact or streamed note section becomes readable, a comment line as
+    heartbeat when idle, and closes once the task completes, fails or is
+    deleted.
+    """
+    if tasks.get(task_id) is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    async def events():
+        wake = progress_broker.subscribe(task_id)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.status_stream_timeout_seconds
+        # Worker processes update the shared store without notifying this one
+        poll = settings.status_stream_poll_seconds if job_queue else settings.status_stream_heartbeat_seconds
+        last_sent = loop.time()
+        last = None
+        last_results = None
+        try:
+            while loop.time() < deadline:
+                task = tasks.get(task_id)
+                if task is None:
+                    yield "event: deleted\ndata: {}\n\n"
+                    return
+
+                status = _status_response(task_id, task).model_dump_json()
+                if status != last:
+                    last = status
+                    last_sent = loop.time()
+                    yield f"event: status\ndata: {status}\n\n"
+                results = (
+                    tuple(task.get("ready") or ()),
+                    len(task.get("notes") or ()),
+                    tts_service.is_rendering(task_id)
+                )
+                if results != last_results:
+                    last_results = results
+                    partial = _partial_response(task_id, task).model_dump_json()
+                    yield f"event: results\ndata: {partial}\n\n"
+                if task["status"] in (ProcessingStatus.COMPLETED, ProcessingStatus.FAILED):
+                    return
+
+                # Re-read on every poll too, which picks up updates made by
+                # other processes sharing the task store
+                try:
+                    await asyncio.wait_for(wake.wait(), poll)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    if loop.time() - last_sent >= settings.status_stream_heartbeat_seconds:
+                        last_sent = loop.time()
+                        yield ": heartbeat\n\n"
+                wake.clear()
+        finally:
+            progress_broker.unsubscribe(task_id, wake)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
 @router.get("/results/{task_id}", response_model=ResultsResponse)
 async def get_results(task_id: str):
     """Get the processing results for a completed task."""
-    if task_id not in tasks:
+    task = tasks.get(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
-
-    task = tasks[task_id]
+    if task.get("kind") == "batch":
+        raise HTTPException(status_code=404, detail=f"This is a batch; see /api/batch/{task_id}")
 
     if task["status"] == ProcessingStatus.FAILED:
         raise HTTPException(status_code=500, detail=task["error"])
@@ -184,35 +697,117 @@ async def get_results(task_id: str):
     )
 
 
+@router.get("/results/{task_id}/partial", response_model=PartialResultsResponse)
+async def get_partial_results(task_id: str):
+    """
+    Get whatever a task has produced so far.
+
+    Transcript, notes, quiz and audio URL appear as soon as their stage
+    finishes (listed in "ready"); notes may also hold sections that are
+    still being streamed from the LLM. Failed tasks return their partial
+    results along with the error.
+    """
+    task = tasks.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if task.get("kind") == "batch":
+        raise HTTPException(status_code=404, detail=f"This is a batch; see /api/batch/{task_id}")
+
+    return _partial_response(task_id, task)
+
+
 @router.get("/audio/{task_id}")
-async def get_audio(task_id: str):
+async def get_audio(task_id: str, request: Request):
     """Stream the generated voice summary audio."""
-    if task_id not in tasks:
+    task = tasks.get(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    task = tasks[task_id]
+    # Still rendering: send the finished leading chunks and follow along
+    if tts_service.is_rendering(task_id):
+        return StreamingResponse(
+            tts_service.stream(task_id),
+            media_type="audio/mpeg",
+            headers={"Cache-Control": "no-store"}
+        )
+
     if not task.get("audio_path") or not os.path.exists(task["audio_path"]):
         raise HTTPException(status_code=404, detail="Audio not found")
 
-    return FileResponse(
+    # Finished audio never changes: support seeking, revalidation and caching
+    return await serve_file(
+        request,
         task["audio_path"],
         media_type="audio/mpeg",
         filename=f"cramAI_voice_{task_id}.mp3"
     )
 
 
+def _cleanup_task_files(task: dict):
+    """Delete the voice audio, uploaded video and extracted audio of a task."""
+    video_processor.cleanup(
+        task.get("audio_path"), task.get("video_path"), *(task.get("audio_paths") or [])
+    )
+
+
+def expire_tasks() -> int:
+    """Drop finished tasks older than task_ttl_minutes and delete their files."""
+    expired = tasks.expire(time.time() - settings.task_ttl_minutes * 60)
+    for task in expired:
+        _cleanup_task_files(task)
+    return len(expired)
+
+
+def recover_interrupted_tasks() -> int:
+    """
+    Fail tasks a previous run left in progress, so they can expire.
+
+    Only safe without the job queue: there, pipelines in worker processes
+    may still be running and expired leases are retried instead.
+    """
+    failed = tasks.fail_unfinished("Processing was interrupted by a server restart")
+    for task in failed:
+        video_processor.cleanup(*(task.get("audio_paths") or []))
+    for batch_id in {task["batch_id"] for task in failed if task.get("batch_id")}:
+        refresh_batch(batch_id)
+    return len(failed)
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Result cache, TTS phrase cache and near-duplicate index statistics."""
+    return {
+        **result_cache.stats(),
+        "phrases": tts_service.phrase_cache.stats(),
+        "dedup": transcript_index.stats() if transcript_index else {"enabled": False}
+    }
+
+
+@router.get("/models")
+async def get_model_stats():
+    """Loaded Whisper models with load, warm-up, memory and speed figures."""
+    return transcription_service.model_stats()
+
+
+@router.get("/queue/stats")
+async def get_queue_stats():
+    """Job counts per status (durable job queue), admission control and batch scheduling state."""
+    return {
+        "enabled": bool(job_queue),
+        "jobs": job_queue.depth() if job_queue else {},
+        "admission": admission.stats() if admission else {"enabled": False},
+        "batch": batch_scheduler.stats()
+    }
+
+
 @router.delete("/task/{task_id}")
 async def delete_task(task_id: str):
     """Delete a task and its associated files."""
-    if task_id not in tasks:
+    task = tasks.delete(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    task = tasks[task_id]
-
     # Cleanup files
-    if task.get("audio_path"):
-        video_processor.cleanup(task["audio_path"])
-
-    del tasks[task_id]
+    _cleanup_task_files(task)
 
     return {"message": "Task deleted successfully"}
@@ -0,0 +1,75 @@
+import re
+from fastapi.responses import JSONResponse
+from app.config import settings
+
+# Endpoints that receive lecture videos
+UPLOAD_PATHS = re.compile(r"^/api/(upload|batch/[^/]+/upload)$")
+MULTIPART_OVERHEAD = 1024 * 1024  # Boundaries and part headers around the file
+
+
+class UploadTooLarge(Exception):
+    """Raised from receive() when the request body goes over the limit."""
+
+
+class UploadLimitMiddleware:
+    """
+    Stop oversized uploads while they are being received.
+
+    FastAPI parses the whole multipart body into a temporary file before
+    the route runs, so a size check in the route only fires once every byte
+    has arrived. Here a declared Content-Length over the limit is rejected
+    before any of the body is read, and bodies without one (chunked) are
+    counted as they stream in and cut off as soon as they cross it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not UPLOAD_PATHS.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        limit = settings.max_file_size_mb * 1024 * 1024 + MULTIPART_OVERHEAD
+        rejection = JSONResponse(
+            {"detail": f"File too large. Maximum size: {settings.max_file_size_mb}MB"},
+            status_code=400,
+            headers={"Connection": "close"}
+        )
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length" and value.isdigit() and int(value) > limit:
+                await rejection(scope, receive, send)
+                return
+
+        received = 0
+        too_large = False
+        rejected = False
+
+        async def counting_receive():
+            nonlocal received, too_large
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    too_large = True
+                    raise UploadTooLarge()
+            return message
+
+        async def reject():
+            nonlocal rejected
+            if not rejected:
+                rejected = True
+                await rejection(scope, receive, send)
+
+        async def guarded_send(message):
+            # The route may turn the aborted body into its own error response
+            if too_large:
+                await reject()
+            else:
+                await send(message)
+
+        try:
+            await self.app(scope, counting_receive, guarded_send)
+        except UploadTooLarge:
+            await reject()
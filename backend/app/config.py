@@ -16,12 +16,113 @@ class Settings(BaseSettings):
     upload_dir: str = "uploads"
     output_dir: str = "outputs"
     max_file_size_mb: int = 500
+    upload_chunk_size_kb: int = 1024  # Streaming write size for uploads
+
+    # FFmpeg settings
+    audio_format: str = "wav"  # wav or f32 (raw PCM, no re-decode) or mp3
+    ffmpeg_max_concurrency: int = 2  # Concurrent ffmpeg processes per process
+    ffmpeg_timeout_seconds: float = 1800.0
+    # stream_audio runs ffmpeg for as long as Whisper takes; it doesn't use the slots above
+    ffmpeg_max_streams: int = 4  # Concurrent streamed extractions per process
+    ffmpeg_stall_timeout_seconds: float = 120.0  # Streamed extraction: longest wait for more audio
 
     # Whisper settings (local)
     whisper_model: str = "base"  # tiny, base, small, medium, large
+    whisper_models: str = ""  # Comma-separated models to preload (default: whisper_model)
+    whisper_model_tiers: str = ""  # e.g. "small:900,base:3600,tiny" (max lecture seconds)
+    transcription_sla_seconds: float = 0  # Pick the largest model that fits (0 = off)
+    whisper_rtf_half_life_seconds: float = 1800  # Unused models' speed estimates drift back to defaults
+    whisper_memory_budget_mb: int = 4096  # Loaded models per process before LRU eviction
+    whisper_backend: str = "openai"  # openai (openai-whisper) or faster (faster-whisper)
+    whisper_compute_type: str = "default"  # float32, float16, int8 (default: float32 / int8)
+    whisper_threads: int = 0  # Per worker process (0 = CPU cores / transcription_workers)
+    whisper_beam_size: int = 1  # 1 = greedy decoding
+    whisper_language: str = "en"  # Empty to auto-detect per lecture
+    transcription_workers: int = 1  # Worker processes (0 = run in a thread)
+    transcription_queue_size: int = 8  # Jobs allowed to wait for a worker
+
+    # Chunked transcription: split long audio at silences and transcribe in parallel
+    chunked_transcription: bool = True
+    chunk_min_seconds: float = 30.0
+    chunk_max_seconds: float = 120.0
+    chunk_overlap_seconds: float = 1.0
+    stream_audio: bool = True  # Pipe ffmpeg PCM into Whisper, no audio file (always chunked)
+    # Voice activity detection: only speech is sent to Whisper
+    vad_enabled: bool = True
+    vad_min_silence_seconds: float = 2.0  # Shorter pauses are kept
+    vad_padding_seconds: float = 0.3  # Kept around each speech region
+    vad_energy_floor_db: float = -50.0  # Quieter audio is never speech (dBFS)
+
+    # LLM settings
+    llm_model: str = "llama-3.3-70b-versatile"
+    llm_base_url: str = "https://api.groq.com/openai/v1"  # Any OpenAI-compatible API
+    llm_max_concurrency: int = 8  # Concurrent LLM requests per process
+    llm_timeout_seconds: float = 60.0
+    llm_max_retries: int = 3  # Retries on 429/5xx and network errors
+    llm_chunk_tokens: int = 3000  # Longer transcripts use map-reduce generation
+    llm_combined_generation: bool = True  # Notes, narration and quiz in one request
+    llm_stream: bool = True  # Stream notes replies so sections show up as they're written
 
     # TTS settings
     tts_voice: str = "en-US-AriaNeural"  # Edge TTS voice
+    tts_max_concurrency: int = 4  # Narration chunks synthesized at once
+    tts_chunk_chars: int = 400  # Sentence-aligned chunk size
+    # Per-sentence audio cache shared across lectures (intros, definitions...)
+    tts_phrase_cache_enabled: bool = True
+    tts_phrase_cache_dir: str = "phrase_cache"
+    tts_phrase_cache_max_size_mb: int = 256
+
+    # Task storage
+    task_store: str = "sqlite"  # sqlite (shared across workers) or memory
+    task_db_path: str = "tasks.db"
+    task_ttl_minutes: int = 1440  # Finished tasks and their files are removed after this
+    task_expiry_interval_seconds: int = 300
+    json_logs: bool = False  # One JSON line per pipeline event on stderr
+    status_stream_heartbeat_seconds: float = 15.0
+    status_stream_poll_seconds: float = 1.0  # Store re-reads when job queue workers make the updates
+    status_stream_timeout_seconds: float = 3600.0
+
+    # Admission control: uploads over quota get 429 with Retry-After
+    admission_enabled: bool = True
+    admission_rate_per_minute: float = 30  # All clients together (0 = unlimited)
+    admission_burst: int = 10
+    admission_client_rate_per_minute: float = 4  # Per client (0 = unlimited)
+    admission_client_burst: int = 3
+    admission_max_inflight: int = 0  # Pipelines at once (0 = from CPU cores and RAM)
+    admission_job_memory_mb: int = 1536  # Peak memory per pipeline, for the automatic limit
+    admission_queue_size: int = 16  # Admitted uploads waiting for a pipeline slot
+    admission_trust_proxy: bool = False  # Identify clients by X-Forwarded-For
+    admission_batch_rate_per_minute: float = 2  # Batch lectures per client (0 = unlimited)
+    admission_batch_burst: int = 40  # About one course uploaded back to back
+
+    # Batch ingestion (POST /api/batch): lectures of all batches in flight at once
+    batch_concurrency: int = 0  # 0 = two per transcription worker
+    batch_max_lectures: int = 500
+
+    # Job queue: hand pipelines to separate worker processes (python worker.py)
+    job_queue_enabled: bool = False
+    job_db_path: str = "jobs.db"
+    job_lease_seconds: int = 120  # Workers renew leases while a job runs
+    job_max_attempts: int = 3
+    worker_concurrency: int = 4  # Pipelines per worker process
+    worker_poll_seconds: float = 1.0
+
+    # Concurrent stages per resource, per process (0 = unlimited)
+    stage_limit_whisper: int = 0  # Already bounded by transcription_workers
+    stage_limit_llm: int = 8
+    stage_limit_tts: int = 4
+    stage_retries: int = 1  # Extra attempts for a failed stage
+
+    # Near-duplicate lectures (re-encoded, trimmed...) reuse earlier notes/quiz/voice
+    dedup_enabled: bool = True
+    dedup_db_path: str = "dedup.db"
+    dedup_threshold: float = 0.8  # Estimated transcript similarity (0-1)
+    dedup_min_words: int = 50
+
+    # Result cache (content-addressed, skips work for repeat uploads)
+    cache_enabled: bool = True
+    cache_dir: str = "cache"
+    cache_max_size_mb: int = 2048
 
     class Config:
         env_file = ".env"
@@ -32,3 +133,7 @@ settings = Settings()
 # Create directories if they don't exist
 os.makedirs(settings.upload_dir, exist_ok=True)
 os.makedirs(settings.output_dir, exist_ok=True)
+if settings.cache_enabled:
+    os.makedirs(settings.cache_dir, exist_ok=True)
+if settings.tts_phrase_cache_enabled:
+    os.makedirs(settings.tts_phrase_cache_dir, exist_ok=True)
@@ -32,6 +32,13 @@ class QuizQuestion(BaseModel):
     explanation: str
 
 
+class StudyMaterials(BaseModel):
+    """Notes, narration script and quiz from one combined LLM request."""
+    sections: List[NoteSection]
+    narration: str
+    questions: List[QuizQuestion]
+
+
 class ProcessingResult(BaseModel):
     status: ProcessingStatus
     progress: int  # 0-100
@@ -52,6 +59,8 @@ class StatusResponse(BaseModel):
     status: ProcessingStatus
     progress: int
     current_step: str
+    queue_position: Optional[int] = None  # Set while waiting for a worker
+    ready: List[str] = []  # Artifacts already readable via /results/{task_id}/partial
 
 
 class ResultsResponse(BaseModel):
@@ -59,3 +68,54 @@ class ResultsResponse(BaseModel):
     notes: List[NoteSection]
     quiz: List[QuizQuestion]
     audio_url: str
+
+
+class PartialResultsResponse(BaseModel):
+    """Whatever a task has produced so far; fields stay None until ready."""
+    task_id: str
+    status: ProcessingStatus
+    progress: int
+    ready: List[str]  # Finished artifacts: transcript, notes, quiz, audio
+    transcript: Optional[str] = None
+    notes: Optional[List[NoteSection]] = None  # May hold sections still streaming in
+    quiz: Optional[List[QuizQuestion]] = None
+    audio_url: Optional[str] = None  # Also set while the voice is still rendering
+    error: Optional[str] = None
+
+
+class BatchCreate(BaseModel):
+    total: int  # Lectures that will be uploaded to the batch
+    name: Optional[str] = None  # E.g. the course title
+
+
+class BatchResponse(BaseModel):
+    batch_id: str
+    total: int
+    message: str
+
+
+class BatchLecture(BaseModel):
+    task_id: str
+    filename: Optional[str] = None
+    status: Optional[ProcessingStatus] = None  # None once the task has expired
+    progress: int = 0
+    current_step: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchStatusResponse(BaseModel):
+    """Aggregate progress of a batch plus the status of each lecture."""
+    batch_id: str
+    name: Optional[str] = None
+    total: int
+    uploaded: int
+    completed: int
+    failed: int
+    running: int
+    pending: int  # Uploaded, waiting for a pipeline slot
+    expired: int = 0  # Lecture tasks already removed after task_ttl_minutes
+    progress: int  # 0-100 over all lectures, including ones not uploaded yet
+    finished: bool
+    elapsed_seconds: float
+    lectures_per_hour: Optional[float] = None  # Completed lectures over elapsed time
+    lectures: List[BatchLecture]
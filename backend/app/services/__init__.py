@@ -1,12 +1,47 @@
 # Services
 from .transcription import TranscriptionService
+from .transcription_pool import TranscriptionPool, TranscriptionQueueFullError
+from .audio_chunker import AudioChunker
 from .ai_generator import AIGeneratorService
-from .tts import TTSService
+from .llm_client import LLMClient, LLMError
+from .tts import TTSService, EdgeTTSBackend
 from .video_processor import VideoProcessor
+from .upload import UploadService, FileTooLargeError
+from .result_cache import ResultCache
+from .pipeline import Stage, StageGraph, StageLimits
+from .task_store import TaskStore, MemoryTaskStore, SQLiteTaskStore, create_task_store
+from .progress import ProgressBroker
+from .job_queue import JobQueue
+from .transcript_index import TranscriptIndex
+from .admission import AdmissionController, AdmissionRejected
+from .batch import BatchScheduler, summarize_batch
 
 __all__ = [
     "TranscriptionService",
+    "TranscriptionPool",
+    "TranscriptionQueueFullError",
+    "AudioChunker",
     "AIGeneratorService",
+    "LLMClient",
+    "LLMError",
     "TTSService",
-    "VideoProcessor"
+    "EdgeTTSBackend",
+    "VideoProcessor",
+    "UploadService",
+    "FileTooLargeError",
+    "ResultCache",
+    "Stage",
+    "StageGraph",
+    "StageLimits",
+    "TaskStore",
+    "MemoryTaskStore",
+    "SQLiteTaskStore",
+    "create_task_store",
+    "ProgressBroker",
+    "JobQueue",
+    "TranscriptIndex",
+    "AdmissionController",
+    "AdmissionRejected",
+    "BatchScheduler",
+    "summarize_batch"
 ]
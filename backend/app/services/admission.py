@@ -0,0 +1,231 @@
+import os
+import math
+import time
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional
+from app.config import settings
+from . import metrics
+
+MAX_TRACKED_CLIENTS = 10000  # Least recently seen clients' buckets are dropped first
+DEFAULT_JOB_SECONDS = 120.0  # Pipeline duration assumed until one has finished
+
+
+class AdmissionRejected(Exception):
+    """Raised when an upload is over quota; retry_after is in seconds."""
+
+    def __init__(self, message: str, reason: str, retry_after: int):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Allows bursts of up to capacity, refilled at rate tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        if self.rate > 0:
+            self.tokens -= 1
+
+
+class AdmissionTicket:
+    """An admitted upload, held until its pipeline starts (or the request ends)."""
+
+    def __init__(self, client: str):
+        self.client = client
+        self.admitted_at = time.perf_counter()
+        self.handed_off = False  # A pipeline will pick it up via slot()
+        self.released = False
+
+
+def auto_max_inflight() -> int:
+    """Pipelines the machine can run at once: bounded by CPU cores and RAM."""
+    cores = os.cpu_count() or 1
+    try:
+        ram_mb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return cores
+    return max(1, min(cores, ram_mb // max(1, settings.admission_job_memory_mb)))
+
+
+class AdmissionController:
+    """
+    Decides which uploads are accepted and when their pipelines may start.
+
+    Every upload needs a token from the global bucket and from its client's
+    bucket, otherwise it is rejected with a Retry-After hint. Lectures of a
+    batch draw on a separate, larger per-client bucket instead (see
+    admit_batch_lecture), so a course can be uploaded in one go but
+    declaring a huge batch doesn't lift a client's limits. At most
+    max_inflight pipelines run at once; admitted uploads beyond that wait
+    for a slot, and once admission_queue_size of them are waiting new
+    uploads are rejected too. Rejection happens before the upload body is
+    read (see AdmissionMiddleware), so an overloaded server stays cheap to
+    say no.
+
+    With the durable job queue, pipelines run in worker processes instead;
+    pass backlog (pending job count) and the queue limit applies to it.
+    """
+
+    def __init__(
+        self,
+        max_inflight: Optional[int] = None,
+        backlog: Optional[Callable[[], int]] = None
+    ):
+        self.max_inflight = max_inflight or settings.admission_max_inflight or auto_max_inflight()
+        self.max_queue = settings.admission_queue_size
+        self.backlog = backlog
+        self.global_bucket = TokenBucket(
+            settings.admission_rate_per_minute / 60, settings.admission_burst
+        )
+        self._clients: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._batch_clients: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.waiting = 0  # Admitted, not running yet (uploading or queued)
+        self.running = 0
+        self.rejected: Dict[str, int] = {}
+        self._job_seconds = DEFAULT_JOB_SECONDS
+
+    @staticmethod
+    def _bucket(
+        buckets: "OrderedDict[str, TokenBucket]", client: str, rate_per_minute: float, burst: int
+    ) -> TokenBucket:
+        bucket = buckets.pop(client, None)
+        if bucket is None:
+            bucket = TokenBucket(rate_per_minute / 60, burst)
+        buckets[client] = bucket
+        if len(buckets) > MAX_TRACKED_CLIENTS:
+            buckets.popitem(last=False)
+        return bucket
+
+    def _client_bucket(self, client: str) -> TokenBucket:
+        return self._bucket(
+            self._clients, client,
+            settings.admission_client_rate_per_minute, settings.admission_client_burst
+        )
+
+    def _is_full(self) -> bool:
+        if self.backlog:
+            return self.waiting + self.backlog() >= self.max_queue
+        return self.running + self.waiting >= self.max_inflight + self.max_queue
+
+    def _reject(self, message: str, reason: str, retry_after: float):
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        metrics.admission_rejected.inc(reason=reason)
+        metrics.log_event("admission_rejected", reason=reason, retry_after_s=math.ceil(retry_after))
+        raise AdmissionRejected(message, reason, max(1, math.ceil(retry_after)))
+
+    def admit(self, client: str) -> AdmissionTicket:
+        """
+        Admit an upload from client or reject it.
+
+        Raises:
+            AdmissionRejected: With the reason and a Retry-After estimate
+        """
+        if self._is_full():
+            self._reject(
+                "Server is at capacity. Please try again later.",
+                "queue_full",
+                self._job_seconds / self.max_inflight
+            )
+
+        client_bucket = self._client_bucket(client)
+        client_wait = client_bucket.wait_time()
+        if client_wait > 0:
+            self._reject("Too many uploads. Please slow down.", "client_rate", client_wait)
+        global_wait = self.global_bucket.wait_time()
+        if global_wait > 0:
+            self._reject("Server is receiving too many uploads. Please try again later.",
+                         "global_rate", global_wait)
+
+        client_bucket.take()
+        self.global_bucket.take()
+        self.waiting += 1
+        self._update_gauges()
+        return AdmissionTicket(client)
+
+    def admit_batch_lecture(self, client: str):
+        """
+        Count a batch lecture upload against its client's batch quota.
+
+        Raises:
+            AdmissionRejected: When the client is over its batch quota
+        """
+        bucket = self._bucket(
+            self._batch_clients, client,
+            settings.admission_batch_rate_per_minute, settings.admission_batch_burst
+        )
+        wait = bucket.wait_time()
+        if wait > 0:
+            self._reject("Too many batch uploads. Please slow down.", "batch_rate", wait)
+        bucket.take()
+
+    def reserve(self, client: str) -> AdmissionTicket:
+        """A ticket for work already accepted elsewhere (batch lectures): no quota checks."""
+        self.waiting += 1
+        self._update_gauges()
+        return AdmissionTicket(client)
+
+    def release(self, ticket: AdmissionTicket):
+        """Give back an admitted upload that won't start a pipeline here."""
+        if ticket.handed_off or ticket.released:
+            return
+        ticket.released = True
+        self.waiting -= 1
+        self._update_gauges()
+
+    @asynccontextmanager
+    async def slot(self, ticket: AdmissionTicket):
+        """Wait for a pipeline slot and hold it while the pipeline runs."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_inflight)
+        ticket.handed_off = True
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            self.waiting -= 1
+            self._update_gauges()
+            raise
+
+        self.waiting -= 1
+        self.running += 1
+        self._update_gauges()
+        metrics.admission_wait.observe(time.perf_counter() - ticket.admitted_at)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._slots.release()
+            self._job_seconds = 0.8 * self._job_seconds + 0.2 * (time.perf_counter() - started)
+            self._update_gauges()
+
+    def _update_gauges(self):
+        metrics.admission_inflight.set(self.running)
+        metrics.admission_queued.set(self.waiting)
+
+    def stats(self) -> dict:
+        return {
+            "max_inflight": self.max_inflight,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "waiting": self.waiting,
+            "rejected": dict(self.rejected),
+            "avg_job_seconds": round(self._job_seconds, 1)
+        }
@@ -1,8 +1,27 @@
 import json
-from typing import List
-from groq import Groq
+import asyncio
+from typing import Callable, List, Optional, Tuple
 from app.config import settings
-from app.models import NoteSection, QuizQuestion, QuizOption
+from app.models import NoteSection, QuizQuestion, QuizOption, StudyMaterials
+from .llm_client import LLMClient
+from .json_stream import ArrayItemStream
+from .text_chunker import chunk_text, estimate_tokens
+from . import metrics
+
+# Bump whenever a prompt changes so cached LLM results are regenerated
+PROMPT_VERSION = 2
+
+# Receives every note section parsed so far while a reply streams in
+SectionsCallback = Callable[[List[NoteSection]], None]
+
+NOTES_FORMAT = """{
+    "sections": [
+        {
+            "title": "Section Title",
+            "content": ["bullet point 1", "bullet point 2", ...]
+        }
+    ]
+}"""
 
 
 class AIGeneratorService:
@@ -11,20 +30,130 @@ class AIGeneratorService:
 
     Currently uses Groq (free tier with Llama 3).
     Can be swapped to OpenAI, Anthropic, or Google Gemini.
+
+    Requests go through an async LLMClient; pass a different client (any
+    object with an async complete() method) to change the transport.
     """
 
-    def __init__(self):
-        if settings.groq_api_key:
-            self.client = Groq(api_key=settings.groq_api_key)
+    def __init__(self, client: Optional[LLMClient] = None):
+        if client is not None:
+            self.client = client
+        elif settings.groq_api_key:
+            self.client = LLMClient()
         else:
             self.client = None
 
-    async def generate_notes(self, transcript: str) -> List[NoteSection]:
+    async def close(self):
+        """Release pooled LLM connections."""
+        if self.client is not None and hasattr(self.client, "close"):
+            await self.client.close()
+
+    async def generate_materials(
+        self, transcript: str, num_questions: int = 5, on_sections: Optional[SectionsCallback] = None
+    ) -> Tuple[List[NoteSection], str, List[QuizQuestion]]:
+        """
+        Generate notes, narration script and quiz together.
+
+        Transcripts that fit in one request get all three from a single
+        JSON-mode call, validated against StudyMaterials. If that reply
+        doesn't validate, or the transcript needs map-reduce, it falls back
+        to generate_notes() followed by summarize_for_tts() and
+        generate_quiz() in parallel.
+
+        on_sections is called with the note sections parsed so far while
+        the notes are still being generated (see generate_notes()).
+
+        Returns:
+            (notes, narration, quiz)
+        """
+        if not self.client:
+            raise Exception("Groq API key not configured. Add GROQ_API_KEY to .env")
+
+        if estimate_tokens(transcript) <= settings.llm_chunk_tokens:
+            try:
+                materials = await self._materials_for_text(transcript, num_questions, on_sections)
+                metrics.llm_combined.inc(outcome="ok")
+                return materials
+            except ValueError as e:
+                metrics.llm_combined.inc(outcome="fallback")
+                metrics.log_event("llm_combined_fallback", error=str(e)[:200])
+
+        notes = await self.generate_notes(transcript, on_sections)
+        narration, quiz = await asyncio.gather(
+            self.summarize_for_tts(notes),
+            self.generate_quiz(transcript, notes, num_questions)
+        )
+        return notes, narration, quiz
+
+    async def _materials_for_text(
+        self, transcript: str, num_questions: int, on_sections: Optional[SectionsCallback] = None
+    ) -> Tuple[List[NoteSection], str, List[QuizQuestion]]:
+        prompt = f"""You are an expert educator turning a lecture transcript into study materials.
+
+TRANSCRIPT:
+{transcript}
+
+Create three things:
+1. "sections": structured study notes. Break the content into logical sections
+   with a clear title and 3-6 bullet points of key concepts each, and add a
+   final "Key Takeaways" section.
+2. "narration": a natural, conversational summary of the notes for audio
+   narration, like a helpful tutor explaining the material. It should flow
+   with transitions between topics and be 2-3 minutes when spoken
+   (~300-400 words), with no formatting.
+3. "questions": {num_questions} multiple choice questions that test
+   understanding of key concepts, each with 4 options (A, B, C, D), one
+   clearly correct answer and an explanation of why it is correct.
+
+Respond in JSON format:
+{{
+    "sections": [
+        {{"title": "Section Title", "content": ["bullet point 1", "bullet point 2"]}}
+    ],
+    "narration": "Summary text...",
+    "questions": [
+        {{
+            "id": 1,
+            "question": "Question text?",
+            "options": [
+                {{"id": "A", "text": "Option A"}},
+                {{"id": "B", "text": "Option B"}},
+                {{"id": "C", "text": "Option C"}},
+                {{"id": "D", "text": "Option D"}}
+            ],
+            "correct_answer": "A",
+            "explanation": "Explanation of why A is correct..."
+        }}
+    ]
+}}
+
+Only respond with valid JSON, no other text."""
+
+        content = await self._complete(
+            prompt,
+            on_sections,
+            temperature=0.4,
+            max_tokens=4000,
+            json_mode=True
+        )
+
+        return self._parse_materials(content, num_questions)
+
+    async def generate_notes(
+        self, transcript: str, on_sections: Optional[SectionsCallback] = None
+    ) -> List[NoteSection]:
         """
         Generate structured study notes from transcript.
 
+        Transcripts longer than llm_chunk_tokens are handled map-reduce
+        style: each chunk gets its own notes in parallel, then one call
+        merges them into the final sections.
+
         Args:
             transcript: The lecture transcript
+            on_sections: Called with the sections parsed so far while the
+                final notes stream in (llm_stream), so they can be shown
+                before the reply is complete
 
         Returns:
             List of note sections with titles and bullet points
@@ -32,9 +161,33 @@ class AIGeneratorService:
         if not self.client:
             raise Exception("Groq API key not configured. Add GROQ_API_KEY to .env")
 
+        chunks = chunk_text(transcript, settings.llm_chunk_tokens)
+        if len(chunks) <= 1:
+            return await self._notes_for_text(transcript, on_sections=on_sections)
+
+        partials = await asyncio.gather(*(
+            self._notes_for_text(chunk, part=(i + 1, len(chunks)))
+            for i, chunk in enumerate(chunks)
+        ))
+        return await self._merge_notes([s for sections in partials for s in sections], on_sections)
+
+    async def _notes_for_text(
+        self,
+        transcript: str,
+        part: Optional[tuple] = None,
+        on_sections: Optional[SectionsCallback] = None
+    ) -> List[NoteSection]:
+        """Generate notes for a whole transcript, or for one part of it."""
+        if part:
+            intro = f"Given part {part[0]} of {part[1]} of a lecture transcript, create detailed study notes for this part."
+            takeaways = "4. Do not add a summary or takeaways section; parts are merged later"
+        else:
+            intro = "Given the following lecture transcript, create comprehensive study notes."
+            takeaways = '4. Add a final "Key Takeaways" section'
+
         prompt = f"""You are an expert at creating study notes from lecture transcripts.
 
-Given the following lecture transcript, create comprehensive study notes.
+{intro}
 
 TRANSCRIPT:
 {transcript}
@@ -43,33 +196,53 @@ Create structured notes with the following format:
 1. Break the content into logical sections
 2. Each section should have a clear title
 3. Include 3-6 bullet points per section with key concepts
-4. Add a final "Key Takeaways" section
+{takeaways}
 
 Respond in JSON format:
-{{
-    "sections": [
-        {{
-            "title": "Section Title",
-            "content": ["bullet point 1", "bullet point 2", ...]
-        }}
-    ]
-}}
+{NOTES_FORMAT}
 
 Only respond with valid JSON, no other text."""
 
-        response = self.client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
+        content = await self._complete(
+            prompt,
+            on_sections,
             temperature=0.3,
             max_tokens=2000
         )
 
-        result = json.loads(response.choices[0].message.content)
+        return self._parse_notes(content)
 
-        return [
-            NoteSection(title=s["title"], content=s["content"])
-            for s in result["sections"]
-        ]
+    async def _merge_notes(
+        self, sections: List[NoteSection], on_sections: Optional[SectionsCallback] = None
+    ) -> List[NoteSection]:
+        """Reduce step: merge notes from all transcript parts."""
+        prompt = f"""You are an expert at creating study notes from lecture transcripts.
+
+The following notes were written separately for consecutive parts of one lecture.
+Merge them into a single set of study notes.
+
+NOTES:
+{self._notes_to_outline(sections)}
+
+Create structured notes with the following format:
+1. Combine sections that cover the same topic and remove repetition
+2. Keep the order in which topics appear in the lecture
+3. Include 3-6 bullet points per section with key concepts
+4. Add a final "Key Takeaways" section
+
+Respond in JSON format:
+{NOTES_FORMAT}
+
+Only respond with valid JSON, no other text."""
+
+        content = await self._complete(
+            prompt,
+            on_sections,
+            temperature=0.3,
+            max_tokens=3000
+        )
+
+        return self._parse_notes(content)
 
     async def generate_quiz(
         self, transcript: str, notes: List[NoteSection], num_questions: int = 5
@@ -77,6 +250,12 @@ Only respond with valid JSON, no other text."""
         """
         Generate quiz questions from transcript and notes.
 
+        Questions are drawn from the whole transcript: every chunk is sent
+        to the LLM (in parallel) for its share of the questions. When there
+        are more chunks than questions, each chunk proposes one candidate
+        and evenly spaced candidates are kept, so the quiz still spans the
+        lecture from start to end.
+
         Args:
             transcript: The lecture transcript
             notes: Generated notes for context
@@ -88,20 +267,41 @@ Only respond with valid JSON, no other text."""
         if not self.client:
             raise Exception("Groq API key not configured. Add GROQ_API_KEY to .env")
 
-        notes_text = "\n".join([
-            f"{s.title}:\n" + "\n".join(f"- {c}" for c in s.content)
-            for s in notes
-        ])
+        notes_text = self._notes_to_outline(notes)
+        chunks = chunk_text(transcript, settings.llm_chunk_tokens) or [transcript]
 
+        # Split the question count over every chunk, at least one candidate each
+        counts = [
+            max(1, num_questions // len(chunks) + (1 if i < num_questions % len(chunks) else 0))
+            for i in range(len(chunks))
+        ]
+        batches = await asyncio.gather(*(
+            self._quiz_for_excerpt(chunk, notes_text, count)
+            for chunk, count in zip(chunks, counts)
+        ))
+
+        candidates = [q for batch in batches for q in batch]
+        if len(candidates) > num_questions:
+            candidates = [
+                candidates[i * len(candidates) // num_questions] for i in range(num_questions)
+            ]
+        for number, question in enumerate(candidates, start=1):
+            question.id = number
+        return candidates
+
+    async def _quiz_for_excerpt(
+        self, excerpt: str, notes_text: str, num_questions: int
+    ) -> List[QuizQuestion]:
         prompt = f"""You are an expert educator creating quiz questions.
 
 Based on the following lecture content, create {num_questions} multiple choice questions.
+Focus the questions on the transcript excerpt.
 
 NOTES:
 {notes_text}
 
 TRANSCRIPT EXCERPT:
-{transcript[:3000]}
+{excerpt}
 
 Create questions that:
 1. Test understanding of key concepts
@@ -129,25 +329,13 @@ Respond in JSON format:
 
 Only respond with valid JSON, no other text."""
 
-        response = self.client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
+        content = await self.client.complete(
+            prompt,
             temperature=0.5,
             max_tokens=2000
         )
 
-        result = json.loads(response.choices[0].message.content)
-
-        return [
-            QuizQuestion(
-                id=q["id"],
-                question=q["question"],
-                options=[QuizOption(**opt) for opt in q["options"]],
-                correct_answer=q["correct_answer"],
-                explanation=q["explanation"]
-            )
-            for q in result["questions"]
-        ]
+        return self._parse_quiz(content)
 
     async def summarize_for_tts(self, notes: List[NoteSection]) -> str:
         """
@@ -179,14 +367,96 @@ Create a flowing summary that:
 
 Just provide the summary text, no other formatting."""
 
-        response = self.client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
+        content = await self.client.complete(
+            prompt,
             temperature=0.7,
             max_tokens=800
         )
 
-        return response.choices[0].message.content
+        return content
+
+    async def _complete(
+        self, prompt: str, on_sections: Optional[SectionsCallback] = None, **options
+    ) -> str:
+        """
+        client.complete(), streamed when the caller wants sections early.
+
+        While streaming, each note section is parsed as soon as its JSON
+        object closes and on_sections gets the sections seen so far.
+        """
+        if on_sections is None or not settings.llm_stream or not hasattr(self.client, "stream"):
+            return await self.client.complete(prompt, **options)
+
+        parser = ArrayItemStream("sections")
+        sections: List[NoteSection] = []
+        parts = []
+        async for text in self.client.stream(prompt, **options):
+            parts.append(text)
+            items = parser.feed(text)
+            for item in items:
+                try:
+                    sections.append(NoteSection(**item))
+                except ValueError:
+                    continue
+            if items:
+                on_sections(list(sections))
+        return "".join(parts)
+
+    def _parse_materials(
+        self, content: str, num_questions: int
+    ) -> Tuple[List[NoteSection], str, List[QuizQuestion]]:
+        """
+        Validate a combined reply.
+
+        Raises:
+            ValueError: If the reply is malformed or incomplete (pydantic's
+                ValidationError and json's JSONDecodeError are ValueErrors)
+        """
+        materials = StudyMaterials.model_validate_json(content)
+
+        if not materials.sections or not materials.narration.strip():
+            raise ValueError("Combined reply is missing notes or narration")
+        if len(materials.questions) != num_questions:
+            raise ValueError(
+                f"Expected {num_questions} questions, got {len(materials.questions)}"
+            )
+        for question in materials.questions:
+            option_ids = {option.id for option in question.options}
+            if len(question.options) != 4 or question.correct_answer not in option_ids:
+                raise ValueError(f"Malformed question: {question.question!r}")
+
+        for number, question in enumerate(materials.questions, start=1):
+            question.id = number
+        return materials.sections, materials.narration.strip(), materials.questions
+
+    def _parse_notes(self, content: str) -> List[NoteSection]:
+        result = json.loads(content)
+
+        return [
+            NoteSection(title=s["title"], content=s["content"])
+            for s in result["sections"]
+        ]
+
+    def _parse_quiz(self, content: str) -> List[QuizQuestion]:
+        result = json.loads(content)
+
+        return [
+            QuizQuestion(
+                id=q["id"],
+                question=q["question"],
+                options=[QuizOption(**opt) for opt in q["options"]],
+                correct_answer=q["correct_answer"],
+                explanation=q["explanation"]
+            )
+            for q in result["questions"]
+        ]
+
+    def _notes_to_outline(self, notes: List[NoteSection]) -> str:
+        """Convert notes to a titled bullet list for prompts."""
+        return "\n".join([
+            f"{s.title}:\n" + "\n".join(f"- {c}" for c in s.content)
+            for s in notes
+        ])
 
     def _notes_to_text(self, notes: List[NoteSection]) -> str:
         """Convert notes to plain text."""
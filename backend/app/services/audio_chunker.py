@@ -0,0 +1,175 @@
+from typing import AsyncIterator, List, Tuple
+import numpy as np
+from app.config import settings
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03  # Energy analysis frame
+SMOOTH_SECONDS = 0.3  # Window used to find stretches of quiet, not single frames
+HOP_LENGTH = 160  # Whisper mel frame size in samples, used for "seek"
+
+
+class AudioChunker:
+    """
+    Splits long 16 kHz audio at silence boundaries and stitches chunk
+    transcripts back together.
+
+    Cuts are placed at the quietest point between chunk_min_seconds and
+    chunk_max_seconds after the previous cut. Each chunk after the first
+    starts chunk_overlap_seconds early so words at the seam aren't clipped;
+    segments from that lead-in are dropped again when merging.
+    """
+
+    def __init__(self):
+        self.min_seconds = settings.chunk_min_seconds
+        self.max_seconds = settings.chunk_max_seconds
+        self.overlap_seconds = settings.chunk_overlap_seconds
+
+    def find_split_points(self, audio: np.ndarray) -> List[int]:
+        """
+        Find sample offsets to cut the audio at.
+
+        Returns:
+            Sorted boundaries, starting with 0 and ending with len(audio)
+        """
+        total = len(audio)
+        max_len = int(self.max_seconds * SAMPLE_RATE)
+        min_len = int(self.min_seconds * SAMPLE_RATE)
+        if total <= max_len:
+            return [0, total]
+
+        frame = int(FRAME_SECONDS * SAMPLE_RATE)
+        n_frames = total // frame
+        frames = audio[:n_frames * frame].reshape(n_frames, frame)
+        energy = np.sqrt(np.mean(frames.astype(np.float32) ** 2, axis=1))
+
+        smooth = max(1, int(SMOOTH_SECONDS / FRAME_SECONDS))
+        energy = np.convolve(energy, np.ones(smooth) / smooth, mode="same")
+
+        points = [0]
+        while total - points[-1] > max_len:
+            lo = (points[-1] + min_len) // frame
+            hi = min((points[-1] + max_len) // frame, n_frames)
+            quietest = lo + int(np.argmin(energy[lo:hi]))
+            points.append(quietest * frame + frame // 2)
+        points.append(total)
+        return points
+
+    def split(self, audio: np.ndarray) -> List[Tuple[int, np.ndarray]]:
+        """
+        Split audio into overlapping chunks.
+
+        Returns:
+            List of (boundary, chunk) pairs. boundary is the sample where the
+            chunk's own region starts; the chunk itself may begin earlier.
+        """
+        overlap = int(self.overlap_seconds * SAMPLE_RATE)
+        points = self.find_split_points(audio)
+
+        chunks = []
+        for start, end in zip(points, points[1:]):
+            lead = max(0, start - overlap)
+            chunks.append((start, audio[lead:end]))
+        return chunks
+
+    async def split_stream(
+        self, blocks: AsyncIterator[np.ndarray]
+    ) -> AsyncIterator[Tuple[int, np.ndarray]]:
+        """
+        Split streamed audio into chunks as soon as enough has arrived.
+
+        Same cut rules and output format as split(), but only about one
+        chunk of audio is buffered at a time, so a chunk can be transcribed
+        while later audio is still being decoded.
+        """
+        overlap = int(self.overlap_seconds * SAMPLE_RATE)
+        max_len = int(self.max_seconds * SAMPLE_RATE)
+
+        buffer = np.empty(0, dtype=np.float32)
+        buffer_start = 0  # Absolute sample index of buffer[0]
+        boundary = 0  # Absolute start of the current chunk's own region
+
+        async for block in blocks:
+            buffer = np.concatenate([buffer, block])
+
+            while buffer_start + len(buffer) - boundary > max_len:
+                region = buffer[boundary - buffer_start:]
+                cut = boundary + self.find_split_points(region)[1]
+                lead = max(0, boundary - overlap)
+                yield boundary, buffer[lead - buffer_start:cut - buffer_start].copy()
+
+                # Keep only the lead-in of the next chunk
+                boundary = cut
+                keep_from = max(0, cut - overlap)
+                buffer = buffer[keep_from - buffer_start:]
+                buffer_start = keep_from
+
+        if buffer_start + len(buffer) > boundary:
+            lead = max(0, boundary - overlap)
+            yield boundary, buffer[lead - buffer_start:]
+
+    def merge(self, boundaries: List[int], results: List[dict]) -> dict:
+        """
+        Merge per-chunk transcription results into one result.
+
+        Args:
+            boundaries: The boundary returned by split() for each chunk
+            results: Whisper results ({"text", "segments"}) in chunk order
+
+        Returns:
+            Dict with "text" and "segments" on the original timeline
+        """
+        overlap = int(self.overlap_seconds * SAMPLE_RATE)
+        segments = []
+
+        for boundary, result in zip(boundaries, results):
+            chunk_start = max(0, boundary - overlap)
+            offset = chunk_start / SAMPLE_RATE
+            region_start = boundary / SAMPLE_RATE
+
+            for segment in result["segments"]:
+                start = segment["start"] + offset
+                end = segment["end"] + offset
+
+                # The lead-in belongs to the previous chunk
+                if boundary > 0 and (start + end) / 2 < region_start:
+                    continue
+
+                shifted = dict(segment)
+                shifted["id"] = len(segments)
+                shifted["start"] = start
+                shifted["end"] = end
+                if "seek" in shifted:
+                    shifted["seek"] += chunk_start // HOP_LENGTH
+                if shifted.get("words"):
+                    shifted["words"] = [
+                        {**w, "start": w["start"] + offset, "end": w["end"] + offset}
+                        for w in shifted["words"]
+                        if boundary == 0 or w["end"] + offset > region_start
+                    ]
+
+                if segments and boundary > 0 and start < segments[-1]["end"] + self.overlap_seconds:
+                    shifted["text"] = self._trim_repeated_prefix(
+                        segments[-1]["text"], shifted["text"]
+                    )
+                    if not shifted["text"].strip():
+                        continue
+
+                segments.append(shifted)
+
+        return {
+            "text": "".join(s["text"] for s in segments),
+            "segments": segments
+        }
+
+    @staticmethod
+    def _trim_repeated_prefix(previous: str, text: str, max_words: int = 8) -> str:
+        """Drop words at the start of text that repeat the end of previous."""
+        prev_words = previous.split()
+        words = text.split()
+        normalize = lambda ws: [w.strip(".,!?;:").lower() for w in ws]
+
+        for n in range(min(max_words, len(prev_words), len(words)), 0, -1):
+            if normalize(prev_words[-n:]) == normalize(words[:n]):
+                remainder = " ".join(words[n:])
+                return f" {remainder}" if remainder else ""
+        return text
@@ -0,0 +1,26 @@
+import wave
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def load_audio(path: str) -> np.ndarray:
+    """
+    Load 16 kHz mono audio as float32 samples in [-1, 1].
+
+    Raw .f32 files are memory-mapped and 16-bit .wav files are read
+    directly, so neither needs another ffmpeg decode. Anything else goes
+    through Whisper's ffmpeg-based loader.
+    """
+    if path.endswith(".f32"):
+        return np.memmap(path, dtype=np.float32, mode="r")
+
+    if path.endswith(".wav"):
+        with wave.open(path, "rb") as wav:
+            if (wav.getframerate() == SAMPLE_RATE and wav.getnchannels() == 1
+                    and wav.getsampwidth() == 2):
+                frames = wav.readframes(wav.getnframes())
+                return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+
+    import whisper
+    return whisper.load_audio(path)
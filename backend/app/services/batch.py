@@ -0,0 +1,114 @@
+import time
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set
+from app.config import settings
+
+# Task statuses that end a lecture's pipeline
+FINISHED = ("completed", "failed")
+
+
+def default_concurrency() -> int:
+    """
+    Lectures of one process's batches in flight at once.
+
+    Two per transcription worker: one in Whisper and one in the ffmpeg or
+    LLM/TTS stages around it, so neither side waits for the other.
+    """
+    if settings.batch_concurrency > 0:
+        return settings.batch_concurrency
+    return max(2, 2 * max(1, settings.transcription_workers))
+
+
+def _status(task: dict) -> str:
+    status = task["status"]
+    return getattr(status, "value", status)
+
+
+def summarize_batch(batch: dict, lectures: List[Optional[dict]]) -> dict:
+    """
+    Aggregate progress of a batch from its lectures' tasks.
+
+    Args:
+        batch: The batch record (total, created_at, ...)
+        lectures: The lecture tasks in upload order; None for expired ones
+
+    Returns:
+        Counts per state, overall progress, whether the batch is finished
+        and its throughput in lectures per hour
+    """
+    total = max(batch["total"], len(lectures))
+    found = [task for task in lectures if task is not None]
+    completed = sum(1 for task in found if _status(task) == "completed")
+    failed = sum(1 for task in found if _status(task) == "failed")
+    running = sum(1 for task in found if _status(task) not in FINISHED + ("pending",))
+    expired = len(lectures) - len(found)
+
+    # Lectures not uploaded yet count as 0%
+    progress = sum(100 if _status(task) in FINISHED else task["progress"] for task in found)
+    progress = int((progress + 100 * expired) / total) if total else 100
+
+    done = completed + failed + expired
+    finished = len(lectures) >= batch["total"] and done == len(lectures)
+    finished_at = max([task["updated_at"] for task in found if _status(task) in FINISHED], default=None)
+    end = finished_at if finished and finished_at else time.time()
+    elapsed = max(0.0, end - batch["created_at"])
+
+    return {
+        "total": total,
+        "uploaded": len(lectures),
+        "completed": completed,
+        "failed": failed,
+        "running": running,
+        "pending": len(found) - completed - failed - running,
+        "expired": expired,
+        "progress": progress,
+        "finished": finished,
+        "elapsed_seconds": round(elapsed, 1),
+        "lectures_per_hour": round(completed * 3600 / elapsed, 2) if completed and elapsed else None
+    }
+
+
+class BatchScheduler:
+    """
+    Runs batch lectures through the pipeline a few at a time.
+
+    Starting everything at once would only pile lectures up in front of
+    Whisper; starting one at a time leaves Whisper idle while a lecture is
+    in ffmpeg or waiting for the LLM and TTS. Keeping `concurrency`
+    lectures in flight lets the stages overlap, one lecture being
+    transcribed while others are extracted or summarized, with StageLimits
+    capping each resource. Lectures start in upload order across all
+    batches.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None):
+        self.concurrency = concurrency or default_concurrency()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._running: Set[asyncio.Task] = set()
+        self.waiting = 0
+
+    def submit(self, run: Callable[[], Awaitable[None]]):
+        """Schedule a lecture; run() processes it once a slot is free."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        task = asyncio.create_task(self._run(run))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, run: Callable[[], Awaitable[None]]):
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            await run()
+        finally:
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "in_flight": len(self._running) - self.waiting,
+            "waiting": self.waiting
+        }
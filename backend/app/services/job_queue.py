@@ -0,0 +1,191 @@
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from typing import List, Optional
+from app.config import settings
+
+
+class JobQueue:
+    """
+    Durable SQLite job queue shared by the API and worker processes.
+
+    Workers claim jobs with a time-limited lease and renew it while they
+    work. If a worker dies, its lease runs out and the job is queued again
+    with the same backoff as a failed attempt. Failed jobs, and jobs whose
+    workers keep dying on them (e.g. OOM kills), are retried until
+    max_attempts is reached.
+    """
+
+    def __init__(self, path: str = settings.job_db_path):
+        self.lease_seconds = settings.job_lease_seconds
+        self.max_attempts = settings.job_max_attempts
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY,"
+            " task_id TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " status TEXT NOT NULL,"  # queued, running, done, failed
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " worker_id TEXT,"
+            " lease_until REAL,"
+            " run_after REAL NOT NULL,"
+            " error TEXT,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, run_after, created_at)"
+        )
+        self._lock = threading.Lock()
+
+    def enqueue(self, task_id: str, payload: dict) -> str:
+        """Add a job and return its id."""
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, task_id, payload, status, run_after, created_at)"
+                " VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, task_id, json.dumps(payload), now, now)
+            )
+        return job_id
+
+    @staticmethod
+    def _backoff(attempts: int) -> float:
+        """Delay before the next attempt: a little longer after every one."""
+        return 5 * 2 ** attempts
+
+    def release_expired(self) -> List[dict]:
+        """
+        Take back jobs whose worker stopped renewing the lease.
+
+        They are queued again after the retry backoff, or marked failed
+        once they have used up max_attempts.
+
+        Returns:
+            The jobs given up on (job_id, task_id, error), so their tasks
+            can be marked failed
+        """
+        now = time.time()
+        failed = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT job_id, task_id, attempts FROM jobs"
+                    " WHERE status = 'running' AND lease_until < ?",
+                    (now,)
+                ).fetchall()
+                for job_id, task_id, attempts in rows:
+                    error = f"Worker stopped responding (attempt {attempts} of {self.max_attempts})"
+                    if attempts < self.max_attempts:
+                        self._conn.execute(
+                            "UPDATE jobs SET status = 'queued', lease_until = NULL, worker_id = NULL,"
+                            " run_after = ?, error = ? WHERE job_id = ?",
+                            (now + self._backoff(attempts), error, job_id)
+                        )
+                    else:
+                        self._conn.execute(
+                            "UPDATE jobs SET status = 'failed', lease_until = NULL, error = ?"
+                            " WHERE job_id = ?",
+                            (error, job_id)
+                        )
+                        failed.append({"job_id": job_id, "task_id": task_id, "error": error})
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return failed
+
+    def claim(self, worker_id: str) -> Optional[dict]:
+        """
+        Lease the oldest queued job that is due to a worker.
+
+        Jobs with expired leases become claimable through release_expired().
+
+        Returns:
+            Dict with job_id, task_id, payload and attempts, or None
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT job_id, task_id, payload, attempts FROM jobs"
+                    " WHERE status = 'queued' AND run_after <= ?"
+                    " ORDER BY created_at LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', worker_id = ?, lease_until = ?,"
+                    " attempts = attempts + 1 WHERE job_id = ?",
+                    (worker_id, now + self.lease_seconds, row[0])
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return {
+            "job_id": row[0],
+            "task_id": row[1],
+            "payload": json.loads(row[2]),
+            "attempts": row[3] + 1
+        }
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend a lease. Returns False if the worker no longer owns the job."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (time.time() + self.lease_seconds, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'done', lease_until = NULL WHERE job_id = ?",
+                (job_id,)
+            )
+
+    def fail(self, job_id: str, error: str) -> bool:
+        """
+        Record a failed attempt.
+
+        Returns:
+            True if the job was requeued for another attempt
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            retry = row is not None and row[0] < self.max_attempts
+            if retry:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', lease_until = NULL, worker_id = NULL,"
+                    " run_after = ?, error = ? WHERE job_id = ?",
+                    (time.time() + self._backoff(row[0]), error, job_id)
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', lease_until = NULL, error = ? WHERE job_id = ?",
+                    (error, job_id)
+                )
+            return retry
+
+    def depth(self) -> dict:
+        """Number of jobs in each status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return dict(rows)
@@ -0,0 +1,68 @@
+import re
+import json
+from typing import List, Optional
+
+
+class ArrayItemStream:
+    """
+    Pull finished objects out of a JSON array while the document streams in.
+
+    Feed it the LLM reply as it arrives; every call returns the objects of
+    the array under `key` that were completed by that piece of text. Only
+    the first array with that key is read, and only objects nested directly
+    in it count as items.
+    """
+
+    def __init__(self, key: str):
+        self._start = re.compile(r'"' + re.escape(key) + r'"\s*:\s*\[')
+        self._buffer = ""
+        self._pos: Optional[int] = None  # Scan position once inside the array
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_start = 0
+        self.done = False
+
+    def feed(self, text: str) -> List[dict]:
+        self._buffer += text
+        if self.done:
+            return []
+
+        if self._pos is None:
+            match = self._start.search(self._buffer)
+            if not match:
+                return []
+            self._pos = match.end()
+
+        items = []
+        buffer = self._buffer
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 0:
+                    self._item_start = i
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # End of the array itself
+                    self.done = True
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        item = json.loads(buffer[self._item_start:i + 1])
+                    except ValueError:
+                        continue
+                    if isinstance(item, dict):
+                        items.append(item)
+        self._pos = len(buffer)
+        return items
@@ -0,0 +1,229 @@
+import json
+import time
+import asyncio
+import random
+from typing import AsyncIterator, Optional
+import httpx
+from app.config import settings
+from . import metrics
+
+
+class LLMError(Exception):
+    """Raised when the LLM API keeps failing after all retries."""
+
+
+class LLMClient:
+    """
+    Async chat-completions client with a shared connection pool.
+
+    Talks to any OpenAI-compatible endpoint (Groq by default). Requests are
+    capped per process by a semaphore, time out after llm_timeout_seconds,
+    and are retried with jittered exponential backoff on 429 and 5xx
+    responses. Point llm_base_url at a local mock server for testing.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.api_key = api_key or settings.groq_api_key
+        self.base_url = (base_url or settings.llm_base_url).rstrip("/")
+        self.max_retries = settings.llm_max_retries
+        self._transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Shared HTTP client, created on first use inside the event loop."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=httpx.Timeout(settings.llm_timeout_seconds, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=settings.llm_max_concurrency,
+                    max_keepalive_connections=settings.llm_max_concurrency
+                ),
+                transport=self._transport
+            )
+            self._slots = asyncio.Semaphore(settings.llm_max_concurrency)
+        return self._http
+
+    async def close(self):
+        """Close pooled connections."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def complete(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        model: Optional[str] = None,
+        json_mode: bool = False
+    ) -> str:
+        """
+        Send a single-message chat completion and return the reply text.
+
+        With json_mode the API is asked to return a JSON object.
+
+        Raises:
+            LLMError: If the request still fails after all retries
+        """
+        payload = self._payload(prompt, temperature, max_tokens, model, json_mode)
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            data = await self._post("/chat/completions", payload)
+            outcome = "ok"
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.llm_duration.observe(elapsed, model=payload["model"], outcome=outcome)
+
+        self._record_usage(payload["model"], elapsed, data.get("usage") or {})
+        return data["choices"][0]["message"]["content"]
+
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        max_tokens: int = 2000,
+        model: Optional[str] = None,
+        json_mode: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Like complete(), but yield the reply text as it is generated.
+
+        Failures before the first piece of text are retried like complete();
+        once text has been yielded the request can't be replayed, so later
+        failures raise immediately.
+
+        Raises:
+            LLMError: If the request fails
+        """
+        payload = self._payload(prompt, temperature, max_tokens, model, json_mode)
+        payload["stream"] = True
+        http = self.http
+        start = time.perf_counter()
+        outcome = "error"
+        usage: dict = {}
+        last_error = None
+        received = False
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    async with self._slots:
+                        async with http.stream("POST", "/chat/completions", json=payload) as response:
+                            if response.status_code < 400:
+                                async for line in response.aiter_lines():
+                                    if not line.startswith("data:"):
+                                        continue
+                                    data = line[5:].strip()
+                                    if data == "[DONE]":
+                                        break
+                                    chunk = json.loads(data)
+                                    # Groq reports usage under x_groq on the last chunk
+                                    usage = chunk.get("usage") or chunk.get("x_groq", {}).get("usage") or usage
+                                    for choice in chunk.get("choices") or []:
+                                        text = (choice.get("delta") or {}).get("content")
+                                        if text:
+                                            if not received:
+                                                received = True
+                                                metrics.llm_first_token.observe(
+                                                    time.perf_counter() - start, model=payload["model"]
+                                                )
+                                            yield text
+                                outcome = "ok"
+                                break
+
+                            await response.aread()
+                            if response.status_code not in self.RETRY_STATUSES:
+                                raise LLMError(f"LLM API error {response.status_code}: {response.text}")
+                            last_error = f"HTTP {response.status_code}"
+                            retry_after = response.headers.get("retry-after")
+                except (httpx.TimeoutException, httpx.TransportError) as e:
+                    if received:
+                        raise LLMError(f"LLM stream interrupted ({type(e).__name__}: {e})")
+                    last_error = f"{type(e).__name__}: {e}"
+                    retry_after = None
+
+                if attempt == self.max_retries:
+                    raise LLMError(
+                        f"LLM request failed after {self.max_retries + 1} attempts ({last_error})"
+                    )
+                metrics.llm_retries.inc(model=payload["model"])
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.llm_duration.observe(elapsed, model=payload["model"], outcome=outcome)
+
+        self._record_usage(payload["model"], elapsed, usage)
+
+    @staticmethod
+    def _payload(
+        prompt: str, temperature: float, max_tokens: int, model: Optional[str], json_mode: bool
+    ) -> dict:
+        payload = {
+            "model": model or settings.llm_model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+
+    @staticmethod
+    def _record_usage(model: str, elapsed: float, usage: dict):
+        for kind in ("prompt", "completion"):
+            metrics.llm_tokens.inc(usage.get(f"{kind}_tokens", 0), model=model, kind=kind)
+        metrics.log_event(
+            "llm_request",
+            model=model,
+            duration_s=round(elapsed, 3),
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens")
+        )
+
+    async def _post(self, path: str, payload: dict) -> dict:
+        http = self.http
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._slots:
+                    response = await http.post(path, json=payload)
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                last_error = f"{type(e).__name__}: {e}"
+                retry_after = None
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                if response.status_code not in self.RETRY_STATUSES:
+                    raise LLMError(f"LLM API error {response.status_code}: {response.text}")
+                last_error = f"HTTP {response.status_code}"
+                retry_after = response.headers.get("retry-after")
+
+            if attempt == self.max_retries:
+                break
+            metrics.llm_retries.inc(model=payload["model"])
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        raise LLMError(f"LLM request failed after {self.max_retries + 1} attempts ({last_error})")
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[str]) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After if given."""
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return random.uniform(0, min(30.0, 0.5 * 2 ** attempt))
@@ -0,0 +1,241 @@
+import sys
+import json
+import time
+import logging
+import threading
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+from app.config import settings
+
+# Seconds; covers quick LLM calls up to long transcriptions
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+RTF_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5)
+
+# Task being processed by the current asyncio task; copied into child tasks
+current_task_id: ContextVar[Optional[str]] = ContextVar("current_task_id", default=None)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def _format_labels(self, key: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{label}="{_escape(value)}"' for label, value in zip(self.labels, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> list:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        lines += self.samples()
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list:
+        with self._lock:
+            return [
+                f"{self.name}{self._format_labels(key)} {_number(value)}"
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Gauge(_Metric):
+    """Value per label set that can go up and down."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self) -> list:
+        with self._lock:
+            return [
+                f"{self.name}{self._format_labels(key)} {_number(value)}"
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set."""
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DURATION_BUCKETS
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], list] = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self) -> list:
+        lines = []
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, state):
+                    le = self._format_labels(key, f'le="{_number(bound)}"')
+                    lines.append(f"{self.name}_bucket{le} {count}")
+                inf = self._format_labels(key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf} {state[-1]}")
+                lines.append(f"{self.name}_sum{self._format_labels(key)} {_number(state[-2])}")
+                lines.append(f"{self.name}_count{self._format_labels(key)} {state[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collects metrics and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+registry = MetricsRegistry()
+
+# Pipeline
+stage_duration = Histogram(
+    "cramai_stage_duration_seconds", "Time spent running a pipeline stage", ["stage", "outcome"]
+)
+stage_wait = Histogram(
+    "cramai_stage_wait_seconds", "Time a stage waited for a resource slot", ["stage"]
+)
+jobs_total = Counter("cramai_jobs_total", "Finished processing jobs", ["status"])
+job_duration = Histogram("cramai_job_duration_seconds", "End-to-end processing time per job", ["status"])
+artifact_ready = Histogram(
+    "cramai_artifact_ready_seconds", "Time from job start until an artifact is readable", ["artifact"]
+)
+
+# Admission control
+admission_inflight = Gauge("cramai_admission_inflight_jobs", "Pipelines running in this process")
+admission_queued = Gauge(
+    "cramai_admission_queued_jobs", "Admitted uploads waiting for a pipeline slot"
+)
+admission_rejected = Counter("cramai_admission_rejected_total", "Uploads rejected with 429", ["reason"])
+admission_wait = Histogram(
+    "cramai_admission_wait_seconds", "Time from admission until the pipeline started"
+)
+
+# ffmpeg
+ffmpeg_duration = Histogram(
+    "cramai_ffmpeg_duration_seconds", "Wall time of ffmpeg/ffprobe runs", ["operation"]
+)
+
+# Whisper
+transcription_duration = Histogram(
+    "cramai_transcription_duration_seconds", "Wall time per transcription", ["model"]
+)
+transcription_audio = Counter(
+    "cramai_transcription_audio_seconds_total", "Seconds of audio transcribed", ["model"]
+)
+transcription_rtf = Histogram(
+    "cramai_transcription_rtf", "Processing seconds per second of audio", ["model"], RTF_BUCKETS
+)
+vad_skipped_audio = Counter(
+    "cramai_vad_skipped_audio_seconds_total", "Seconds of silence not sent to Whisper"
+)
+transcription_queue_wait = Histogram(
+    "cramai_transcription_queue_wait_seconds", "Time a job waited for a transcription worker"
+)
+
+# LLM
+llm_duration = Histogram(
+    "cramai_llm_request_duration_seconds", "LLM request latency including retries", ["model", "outcome"]
+)
+llm_tokens = Counter("cramai_llm_tokens_total", "LLM tokens used", ["model", "kind"])
+llm_first_token = Histogram(
+    "cramai_llm_first_token_seconds", "Time until a streamed LLM reply starts", ["model"]
+)
+llm_retries = Counter("cramai_llm_retries_total", "Retried LLM requests", ["model"])
+llm_combined = Counter(
+    "cramai_llm_combined_total", "Combined notes/narration/quiz requests", ["outcome"]
+)
+
+# TTS
+tts_duration = Histogram("cramai_tts_request_duration_seconds", "Latency per synthesized TTS chunk")
+tts_characters = Counter("cramai_tts_characters_total", "Characters sent to the TTS backend")
+
+
+_logger = logging.getLogger("cramai.events")
+
+
+def configure_logging():
+    """Emit one JSON object per line on stderr when json_logs is enabled."""
+    if not settings.json_logs or _logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _logger.addHandler(handler)
+    _logger.setLevel(logging.INFO)
+    _logger.propagate = False
+
+
+def log_event(event: str, **fields):
+    """
+    Write a structured log line (json_logs only).
+
+    The current task id is added automatically inside a pipeline run.
+    """
+    if not settings.json_logs:
+        return
+    record = {"ts": round(time.time(), 3), "event": event}
+    task_id = current_task_id.get()
+    if task_id is not None:
+        record["task_id"] = task_id
+    record.update(fields)
+    _logger.info(json.dumps(record, default=str))
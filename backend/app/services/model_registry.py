@@ -0,0 +1,181 @@
+import os
+import math
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import numpy as np
+from app.config import settings
+from .whisper_backends import load_model
+
+# Rough CPU processing time per second of audio, used until real numbers
+# have been observed
+DEFAULT_RTF = {"tiny": 0.05, "base": 0.1, "small": 0.3, "medium": 0.8, "large": 1.5}
+
+# Smallest to largest
+MODEL_SIZES = ["tiny", "base", "small", "medium", "large"]
+
+# Default speed relative to openai-whisper, until real numbers are observed
+BACKEND_SPEEDUP = {"openai": 1.0, "faster": 4.0}
+
+
+def parse_model_list(value: str) -> List[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def _size_rank(name: str) -> int:
+    """Position of a model name (e.g. "base.en", "large-v3") in MODEL_SIZES."""
+    for rank, size in reversed(list(enumerate(MODEL_SIZES))):
+        if name.startswith(size):
+            return rank
+    return 0
+
+
+def _default_rtf(name: str) -> float:
+    speedup = BACKEND_SPEEDUP.get(settings.whisper_backend, 1.0)
+    return DEFAULT_RTF[MODEL_SIZES[_size_rank(name)]] / speedup
+
+
+class ModelRegistry:
+    """
+    Per-process cache of loaded Whisper models (see whisper_backends).
+
+    Models are loaded on demand (or preloaded at startup), warmed up on a
+    short silent clip so the first real request doesn't pay one-off setup
+    costs, and evicted least recently used first when the loaded models
+    exceed whisper_memory_budget_mb. Load time, warm-up time and resident
+    size are recorded per model.
+    """
+
+    def __init__(self, budget_mb: int = settings.whisper_memory_budget_mb):
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self._models: "OrderedDict[str, object]" = OrderedDict()
+        self._stats: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str):
+        """Return a loaded model, loading and warming it up if needed."""
+        with self._lock:
+            if name in self._models:
+                self._models.move_to_end(name)
+                self._stats[name]["last_used"] = time.time()
+                return self._models[name]
+
+            model = self._load(name)
+            self._models[name] = model
+            self._evict(keep=name)
+            return model
+
+    def preload(self, names: List[str]):
+        for name in names:
+            self.get(name)
+
+    def record(self, name: str, audio_seconds: float, elapsed: float):
+        """Track observed inference time per second of audio (EWMA), without queueing."""
+        if audio_seconds <= 0 or name not in self._stats:
+            return
+        rtf = elapsed / audio_seconds
+        previous = self._stats[name].get("rtf")
+        self._stats[name]["rtf"] = rtf if previous is None else 0.8 * previous + 0.2 * rtf
+        self._stats[name]["rtf_measured_at"] = time.time()
+
+    def stats(self) -> Dict[str, dict]:
+        """Snapshot of per-model statistics for models loaded in this process."""
+        return {
+            name: {**self._stats[name], "loaded": name in self._models, "pid": os.getpid()}
+            for name in self._stats
+        }
+
+    def _load(self, name: str):
+        print(f"Loading Whisper model: {name} ({settings.whisper_backend})")
+        start = time.perf_counter()
+        model = load_model(name)
+        load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        model.transcribe(np.zeros(16000, dtype=np.float32), language="en")
+        warmup_seconds = time.perf_counter() - start
+
+        self._stats[name] = {
+            **self._stats.get(name, {}),
+            "backend": model.backend,
+            "compute_type": model.compute_type,
+            "load_seconds": round(load_seconds, 3),
+            "warmup_seconds": round(warmup_seconds, 3),
+            "memory_mb": round(model.memory_bytes / (1024 * 1024), 1),
+            "last_used": time.time()
+        }
+        return model
+
+    def _evict(self, keep: str):
+        used = sum(self._stats[name]["memory_mb"] for name in self._models) * 1024 * 1024
+        for name in list(self._models):
+            if used <= self.budget_bytes:
+                break
+            if name == keep:
+                continue
+            print(f"Evicting Whisper model: {name}")
+            del self._models[name]
+            used -= self._stats[name]["memory_mb"] * 1024 * 1024
+
+
+def estimated_rtf(stats: List[Dict[str, dict]]) -> Dict[str, float]:
+    """
+    Processing seconds per audio second per model, for choose_model().
+
+    Combines ModelRegistry.stats() from one or more processes (newest
+    measurement wins). A model that hasn't been used for a while drifts back
+    towards its default estimate with half-life whisper_rtf_half_life_seconds,
+    so one slow spell can't rule a model out for good: once its estimate
+    fits the SLA again it gets picked and measured afresh.
+    """
+    latest: Dict[str, dict] = {}
+    for registry_stats in stats:
+        for name, model_stats in registry_stats.items():
+            if model_stats.get("rtf") is None:
+                continue
+            if model_stats["rtf_measured_at"] > latest.get(name, {}).get("rtf_measured_at", 0):
+                latest[name] = model_stats
+
+    now = time.time()
+    half_life = settings.whisper_rtf_half_life_seconds
+    estimates = {}
+    for name, model_stats in latest.items():
+        age = max(0.0, now - model_stats["rtf_measured_at"])
+        weight = math.pow(0.5, age / half_life) if half_life > 0 else 1.0
+        estimates[name] = weight * model_stats["rtf"] + (1 - weight) * _default_rtf(name)
+    return estimates
+
+
+def choose_model(duration: Optional[float], observed_rtf: Dict[str, float]) -> str:
+    """
+    Pick a Whisper model size for a lecture.
+
+    With transcription_sla_seconds set, the largest model from
+    whisper_models whose estimated transcription time fits the SLA wins.
+    Otherwise whisper_model_tiers maps lecture length to a model, e.g.
+    "small:900,base:3600,tiny" uses small up to 15 minutes, base up to an
+    hour and tiny beyond that.
+
+    Args:
+        duration: Lecture length in seconds, if known
+        observed_rtf: Processing seconds per audio second per model (see estimated_rtf)
+    """
+    if duration is None:
+        return settings.whisper_model
+
+    if settings.transcription_sla_seconds > 0:
+        candidates = parse_model_list(settings.whisper_models) or [settings.whisper_model]
+        by_size = sorted(candidates, key=_size_rank, reverse=True)
+        for name in by_size:
+            rtf = observed_rtf.get(name, _default_rtf(name))
+            if duration * rtf <= settings.transcription_sla_seconds:
+                return name
+        return by_size[-1]
+
+    for tier in parse_model_list(settings.whisper_model_tiers):
+        name, _, limit = tier.partition(":")
+        if not limit or duration <= float(limit):
+            return name
+
+    return settings.whisper_model
@@ -0,0 +1,186 @@
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+
+class Stage:
+    """
+    One step of the processing pipeline.
+
+    Args:
+        name: Unique stage name; also the key of its result
+        run: Coroutine function called with the results of its dependencies
+        depends_on: Names of stages that must finish first
+        status: Status to report while the stage is running
+        description: Human readable step shown to the user
+        weight: Share of overall progress this stage accounts for
+        resource: Shared resource the stage uses ("ffmpeg", "whisper",
+            "llm", "tts"); concurrency per resource is capped by StageLimits
+        retries: Extra attempts if the stage raises
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Dict[str, Any]], Awaitable[Any]],
+        depends_on: Sequence[str] = (),
+        status: Any = None,
+        description: str = "",
+        weight: int = 1,
+        resource: Optional[str] = None,
+        retries: int = 0
+    ):
+        self.name = name
+        self.run = run
+        self.depends_on = tuple(depends_on)
+        self.status = status
+        self.description = description
+        self.weight = weight
+        self.resource = resource
+        self.retries = retries
+
+
+class StageLimits:
+    """
+    Per-resource concurrency caps shared by every running pipeline.
+
+    Semaphores are created on first use so they bind to the running loop.
+    Resources without a configured limit are not capped.
+    """
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = limits
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def get(self, resource: Optional[str]) -> Optional[asyncio.Semaphore]:
+        if resource is None or not self.limits.get(resource):
+            return None
+        if resource not in self._semaphores:
+            self._semaphores[resource] = asyncio.Semaphore(self.limits[resource])
+        return self._semaphores[resource]
+
+
+class StageGraph:
+    """
+    Runs pipeline stages as a dependency graph.
+
+    Each stage starts as soon as everything it depends on has finished, so
+    independent branches (e.g. TTS and quiz generation) run concurrently.
+    Stages are retried up to their retries count; if one still fails the
+    remaining ones are cancelled and the error is re-raised.
+    """
+
+    def __init__(self, stages: List[Stage], limits: Optional[StageLimits] = None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.limits = limits
+        self.order = [stage.name for stage in stages]
+        self.active: List[str] = []
+        self.completed: List[str] = []
+        self.timings: Dict[str, float] = {}  # Seconds spent running each stage
+        self.waits: Dict[str, float] = {}  # Seconds spent waiting for a resource slot
+        self.failed: List[str] = []
+        self._validate()
+
+    def _validate(self):
+        for stage in self.stages.values():
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        # Kahn's algorithm to reject cycles up front
+        remaining = {name: set(s.depends_on) for name, s in self.stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Stage graph has a cycle: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    @property
+    def progress(self) -> int:
+        """Percentage of total stage weight completed."""
+        total = sum(s.weight for s in self.stages.values()) or 1
+        done = sum(self.stages[name].weight for name in self.completed)
+        return int(done * 100 / total)
+
+    @property
+    def current_status(self) -> Optional[Any]:
+        """Status of the earliest declared running stage that has one."""
+        for name in self.order:
+            if name in self.active and self.stages[name].status is not None:
+                return self.stages[name].status
+        return None
+
+    @property
+    def current_step(self) -> str:
+        """Descriptions of all running stages."""
+        return " ".join(
+            self.stages[name].description for name in self.order if name in self.active
+        )
+
+    async def run(self, on_change: Optional[Callable[["StageGraph"], None]] = None) -> Dict[str, Any]:
+        """
+        Execute all stages.
+
+        Args:
+            on_change: Called whenever a stage starts or finishes
+
+        Returns:
+            Dict mapping stage name to its result
+        """
+        results: Dict[str, Any] = {}
+        futures = {name: asyncio.get_running_loop().create_future() for name in self.stages}
+
+        def notify():
+            if on_change:
+                on_change(self)
+
+        async def execute(stage: Stage):
+            inputs = {}
+            for dep in stage.depends_on:
+                inputs[dep] = await futures[dep]
+
+            limit = self.limits.get(stage.resource) if self.limits else None
+            queued = time.perf_counter()
+            if limit:
+                await limit.acquire()
+            started = time.perf_counter()
+            self.waits[stage.name] = started - queued
+
+            self.active.append(stage.name)
+            notify()
+            try:
+                for attempt in range(stage.retries + 1):
+                    try:
+                        result = await stage.run(inputs)
+                        break
+                    except Exception:
+                        if attempt == stage.retries:
+                            self.failed.append(stage.name)
+                            raise
+                        await asyncio.sleep(2 ** attempt)
+            finally:
+                self.timings[stage.name] = time.perf_counter() - started
+                self.active.remove(stage.name)
+                if limit:
+                    limit.release()
+
+            results[stage.name] = result
+            self.completed.append(stage.name)
+            futures[stage.name].set_result(result)
+            notify()
+
+        tasks = [asyncio.create_task(execute(stage)) for stage in self.stages.values()]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for future in futures.values():
+                future.cancel()
+            raise
+
+        return results
@@ -0,0 +1,36 @@
+import asyncio
+from typing import Dict, Set
+
+
+class ProgressBroker:
+    """
+    Fans task updates out to status stream subscribers.
+
+    Subscribers only get a wake-up signal, not the data itself; they re-read
+    the task store when woken. That keeps slow subscribers from piling up a
+    backlog and means a burst of updates collapses into one read.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Event]] = {}
+
+    def subscribe(self, task_id: str) -> asyncio.Event:
+        event = asyncio.Event()
+        self._subscribers.setdefault(task_id, set()).add(event)
+        return event
+
+    def unsubscribe(self, task_id: str, event: asyncio.Event):
+        subscribers = self._subscribers.get(task_id)
+        if subscribers is None:
+            return
+        subscribers.discard(event)
+        if not subscribers:
+            del self._subscribers[task_id]
+
+    def publish(self, task_id: str):
+        """Wake every subscriber of a task."""
+        for event in self._subscribers.get(task_id, ()):
+            event.set()
+
+    def subscriber_count(self, task_id: str) -> int:
+        return len(self._subscribers.get(task_id, ()))
@@ -0,0 +1,233 @@
+import os
+import json
+import shutil
+import asyncio
+import hashlib
+import threading
+import aiofiles
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.config import settings
+from .ai_generator import PROMPT_VERSION
+from .whisper_backends import decoding_signature
+
+
+class ResultCache:
+    """
+    Persistent content-addressed cache for pipeline results.
+
+    Every stage result is stored under a key derived from the uploaded
+    bytes and the settings that stage depends on. Keys are chained, so a
+    settings change only invalidates the stages downstream of it (e.g. a
+    new tts_voice re-runs TTS but reuses the transcript, notes and quiz).
+
+    Entries live as files under settings.cache_dir and are evicted least
+    recently used first once the total size passes cache_max_size_mb. Other
+    caches (e.g. TTS phrases) can reuse it with their own directory and size.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = settings.cache_dir,
+        max_size_mb: int = settings.cache_max_size_mb,
+        enabled: bool = settings.cache_enabled
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self.enabled = enabled
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # path -> size
+        self._size = 0
+        self._lock = threading.Lock()
+
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._load_index()
+
+    @staticmethod
+    def make_key(stage: str, *parts: Any) -> str:
+        """Hash a stage name and its inputs into a cache key."""
+        raw = json.dumps([stage, *parts], separators=(",", ":"))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def stage_keys(self, content_hash: str, whisper_model: Optional[str] = None) -> Dict[str, str]:
+        """
+        Build the chained cache keys for every pipeline stage.
+
+        Args:
+            content_hash: SHA-256 of the uploaded video
+            whisper_model: Model the transcript is made with (default: whisper_model);
+                backend, compute type, beam size and language are keyed too
+
+        Returns:
+            Dict mapping stage name to cache key
+        """
+        transcript = self.make_key(
+            "transcript", content_hash, whisper_model or settings.whisper_model, *decoding_signature()
+        )
+        return self.transcript_keys(transcript)
+
+    def transcript_keys(self, transcript: str) -> Dict[str, str]:
+        """Chained keys for everything derived from a transcript cache key."""
+        llm = (settings.llm_model, PROMPT_VERSION)
+        notes = self.make_key("notes", transcript, *llm)
+        narration = self.make_key("narration", notes, *llm)
+        return {
+            "transcript": transcript,
+            "notes": notes,
+            "narration": narration,
+            "voice": self.make_key("voice", narration, settings.tts_voice),
+            "quiz": self.make_key("quiz", notes, *llm)
+        }
+
+    def has(self, key: str) -> bool:
+        """True if a value or file is cached under key (doesn't count as a hit)."""
+        if not self.enabled:
+            return False
+        return any(os.path.exists(self._path(key, suffix)) for suffix in (".json", ".bin"))
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        """Return the cached JSON value for a stage, or None."""
+        if not self.enabled:
+            return None
+        path = self._path(key, ".json")
+        try:
+            with open(path) as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self._count(self.misses, stage)
+            return None
+        self._touch(path)
+        self._count(self.hits, stage)
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store a JSON-serializable value."""
+        if not self.enabled:
+            return
+        path = self._path(key, ".json")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
+        self._add(path)
+
+    async def get_bytes(self, stage: str, key: str) -> Optional[bytes]:
+        """Return cached binary data, or None."""
+        if not self.enabled:
+            return None
+        path = self._path(key, ".bin")
+        try:
+            async with aiofiles.open(path, "rb") as f:
+                data = await f.read()
+        except OSError:
+            self._count(self.misses, stage)
+            return None
+        self._touch(path)
+        self._count(self.hits, stage)
+        return data
+
+    async def put_bytes(self, key: str, data: bytes):
+        """Store binary data."""
+        if not self.enabled:
+            return
+        path = self._path(key, ".bin")
+        tmp = f"{path}.tmp"
+        async with aiofiles.open(tmp, "wb") as f:
+            await f.write(data)
+        os.replace(tmp, path)
+        self._add(path)
+
+    async def get_file(self, stage: str, key: str, destination: str) -> bool:
+        """Copy a cached file to destination. Returns True on a hit."""
+        if not self.enabled:
+            return False
+        path = self._path(key, ".bin")
+        try:
+            await asyncio.to_thread(shutil.copyfile, path, destination)
+        except OSError:
+            self._count(self.misses, stage)
+            return False
+        self._touch(path)
+        self._count(self.hits, stage)
+        return True
+
+    async def put_file(self, key: str, source: str):
+        """Store a copy of a file."""
+        if not self.enabled:
+            return
+        path = self._path(key, ".bin")
+        tmp = f"{path}.tmp"
+        await asyncio.to_thread(shutil.copyfile, source, tmp)
+        os.replace(tmp, path)
+        self._add(path)
+
+    def stats(self) -> dict:
+        """Hit/miss counters per stage and current disk usage."""
+        hits = sum(self.hits.values())
+        misses = sum(self.misses.values())
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "stages": {
+                stage: {"hits": self.hits.get(stage, 0), "misses": self.misses.get(stage, 0)}
+                for stage in sorted(set(self.hits) | set(self.misses))
+            }
+        }
+
+    def _path(self, key: str, suffix: str) -> str:
+        directory = os.path.join(self.cache_dir, key[:2])
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, key + suffix)
+
+    def _count(self, counter: Dict[str, int], stage: str):
+        counter[stage] = counter.get(stage, 0) + 1
+
+    def _load_index(self):
+        """Rebuild the LRU order from file modification times on startup."""
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith(".tmp"):
+                    os.remove(path)
+                    continue
+                stat = os.stat(path)
+                found.append((stat.st_mtime, path, stat.st_size))
+
+        for _, path, size in sorted(found):
+            self._entries[path] = size
+            self._size += size
+        self._evict()
+
+    def _touch(self, path: str):
+        with self._lock:
+            if path in self._entries:
+                self._entries.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _add(self, path: str):
+        size = os.path.getsize(path)
+        with self._lock:
+            self._size += size - self._entries.pop(path, 0)
+            self._entries[path] = size
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            while self._size > self.max_bytes and self._entries:
+                path, size = self._entries.popitem(last=False)
+                self._size -= size
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
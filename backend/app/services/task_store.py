@@ -0,0 +1,301 @@
+import json
+import time
+import sqlite3
+import threading
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+from pydantic import BaseModel
+from app.config import settings
+
+# Tasks in these states are finished and may be expired
+FINISHED_STATUSES = ("completed", "failed")
+
+
+class TaskStore:
+    """
+    Storage interface for processing tasks.
+
+    A task is a flat dict (status, progress, current_step, notes, quiz,
+    audio_path, error, ...). Backends must make update() atomic and
+    get() a primary-key lookup.
+
+    Listeners registered with add_listener() are called with the task_id
+    after every create, update or delete made through this instance.
+    """
+
+    def __init__(self):
+        self._listeners: List[Callable[[str], None]] = []
+
+    def add_listener(self, listener: Callable[[str], None]):
+        self._listeners.append(listener)
+
+    def _notify(self, task_id: str):
+        for listener in self._listeners:
+            listener(task_id)
+
+    def create(self, task_id: str, data: dict):
+        raise NotImplementedError
+
+    def get(self, task_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def update(self, task_id: str, **fields):
+        raise NotImplementedError
+
+    def modify(self, task_id: str, change: Callable[[dict], dict]) -> Optional[dict]:
+        """
+        Atomic read-modify-write: change(task) returns the fields to update.
+
+        change runs inside the store's lock or transaction and may raise to
+        leave the task untouched, e.g. when a limit it checks is reached.
+
+        Returns:
+            The updated task, or None if there is no such task
+        """
+        raise NotImplementedError
+
+    def delete(self, task_id: str) -> Optional[dict]:
+        """Remove a task and return its last state."""
+        raise NotImplementedError
+
+    def expire(self, older_than: float) -> List[dict]:
+        """
+        Remove finished tasks last updated before older_than (epoch seconds).
+
+        Returns:
+            The removed tasks, so their files can be cleaned up
+        """
+        raise NotImplementedError
+
+    def fail_unfinished(self, error: str) -> List[dict]:
+        """
+        Mark every task still in progress as failed, e.g. after a restart
+        killed its pipeline, so clients stop waiting and it can expire.
+        Batch records are left alone; they finish with their lectures.
+
+        Returns:
+            The failed tasks
+        """
+        raise NotImplementedError
+
+    def __contains__(self, task_id: str) -> bool:
+        return self.get(task_id) is not None
+
+
+class MemoryTaskStore(TaskStore):
+    """Process-local store. Fast, but lost on restart and not shared."""
+
+    def __init__(self):
+        super().__init__()
+        self._tasks: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def create(self, task_id: str, data: dict):
+        with self._lock:
+            self._tasks[task_id] = {**data, "task_id": task_id, "updated_at": time.time()}
+        self._notify(task_id)
+
+    def get(self, task_id: str) -> Optional[dict]:
+        task = self._tasks.get(task_id)
+        return dict(task) if task is not None else None
+
+    def update(self, task_id: str, **fields):
+        with self._lock:
+            if task_id in self._tasks:
+                self._tasks[task_id].update(fields, updated_at=time.time())
+        self._notify(task_id)
+
+    def modify(self, task_id: str, change: Callable[[dict], dict]) -> Optional[dict]:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return None
+            task.update(change(dict(task)), updated_at=time.time())
+            task = dict(task)
+        self._notify(task_id)
+        return task
+
+    def delete(self, task_id: str) -> Optional[dict]:
+        with self._lock:
+            task = self._tasks.pop(task_id, None)
+        self._notify(task_id)
+        return task
+
+    def expire(self, older_than: float) -> List[dict]:
+        with self._lock:
+            expired = [
+                task_id for task_id, task in self._tasks.items()
+                if task["status"] in FINISHED_STATUSES and task["updated_at"] < older_than
+            ]
+            return [self._tasks.pop(task_id) for task_id in expired]
+
+    def fail_unfinished(self, error: str) -> List[dict]:
+        failed = []
+        with self._lock:
+            for task in self._tasks.values():
+                if task["status"] not in FINISHED_STATUSES and task.get("kind") != "batch":
+                    task.update(_failed_fields(error), updated_at=time.time())
+                    failed.append(dict(task))
+        for task in failed:
+            self._notify(task["task_id"])
+        return failed
+
+
+def _failed_fields(error: str) -> dict:
+    return {"status": "failed", "error": error, "current_step": f"Error: {error}"}
+
+
+def _encode(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    SQLite-backed store in WAL mode.
+
+    State survives restarts and can be shared by several uvicorn workers on
+    one machine. Each update is a single read-modify-write transaction.
+    """
+
+    def __init__(self, path: str = settings.task_db_path):
+        super().__init__()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " task_id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS tasks_expiry ON tasks (status, updated_at)"
+        )
+        self._lock = threading.Lock()
+
+    def _row(self, task_id: str) -> Optional[dict]:
+        row = self._conn.execute(
+            "SELECT data FROM tasks WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write(self, task_id: str, data: dict):
+        data["task_id"] = task_id
+        data["updated_at"] = time.time()
+        status = data["status"]
+        if isinstance(status, Enum):
+            status = status.value
+        self._conn.execute(
+            "INSERT OR REPLACE INTO tasks (task_id, status, data, updated_at) VALUES (?, ?, ?, ?)",
+            (task_id, status, json.dumps(data, default=_encode), data["updated_at"])
+        )
+
+    def create(self, task_id: str, data: dict):
+        with self._lock:
+            self._write(task_id, dict(data))
+        self._notify(task_id)
+
+    def get(self, task_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._row(task_id)
+
+    def update(self, task_id: str, **fields):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                data = self._row(task_id)
+                if data is not None:
+                    data.update(fields)
+                    self._write(task_id, data)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._notify(task_id)
+
+    def modify(self, task_id: str, change: Callable[[dict], dict]) -> Optional[dict]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                data = self._row(task_id)
+                if data is not None:
+                    data.update(change(dict(data)))
+                    self._write(task_id, data)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if data is not None:
+            self._notify(task_id)
+        return data
+
+    def delete(self, task_id: str) -> Optional[dict]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                data = self._row(task_id)
+                self._conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._notify(task_id)
+        return data
+
+    def expire(self, older_than: float) -> List[dict]:
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    f"SELECT data FROM tasks WHERE status IN ({placeholders}) AND updated_at < ?",
+                    (*FINISHED_STATUSES, older_than)
+                ).fetchall()
+                self._conn.execute(
+                    f"DELETE FROM tasks WHERE status IN ({placeholders}) AND updated_at < ?",
+                    (*FINISHED_STATUSES, older_than)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [json.loads(row[0]) for row in rows]
+
+    def fail_unfinished(self, error: str) -> List[dict]:
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        failed = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    f"SELECT data FROM tasks WHERE status NOT IN ({placeholders})",
+                    FINISHED_STATUSES
+                ).fetchall()
+                for row in rows:
+                    data = json.loads(row[0])
+                    if data.get("kind") != "batch":
+                        data.update(_failed_fields(error))
+                        self._write(data["task_id"], data)
+                        failed.append(data)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        for task in failed:
+            self._notify(task["task_id"])
+        return failed
+
+
+def create_task_store() -> TaskStore:
+    """Build the task store selected by settings.task_store."""
+    if settings.task_store == "sqlite":
+        return SQLiteTaskStore(settings.task_db_path)
+    if settings.task_store == "memory":
+        return MemoryTaskStore()
+    raise ValueError(f"Unknown task store: {settings.task_store}")
@@ -0,0 +1,60 @@
+import re
+from typing import List
+
+# Rough average for English text with Llama-style tokenizers
+CHARS_PER_TOKEN = 4
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate that doesn't need the model's tokenizer."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text after sentence-ending punctuation."""
+    return [s for s in _SENTENCE_END.split(text.strip()) if s]
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text into chunks of at most max_tokens (estimated).
+
+    Chunks end on sentence boundaries where possible. A single sentence
+    longer than the limit (common in unpunctuated transcripts) is split on
+    whitespace instead.
+
+    Args:
+        text: Text to split
+        max_tokens: Token budget per chunk
+
+    Returns:
+        List of non-empty chunks, in order
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return [text] if text.strip() else []
+
+    pieces = []
+    for sentence in _SENTENCE_END.split(text):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            pieces.append(sentence)
+
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 1 > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,167 @@
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import List, Optional, Tuple
+import numpy as np
+from app.config import settings
+
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: pairs above ~0.7 similarity almost always collide
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 5
+_PRIME = np.uint64(4294967291)  # Largest prime below 2**32
+
+# Fixed seed so signatures stay comparable across restarts and processes
+_rng = np.random.RandomState(20240501)
+_A = _rng.randint(1, 2 ** 32 - 5, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, 2 ** 32 - 5, size=NUM_PERM, dtype=np.uint64)
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def _shingles(text: str) -> np.ndarray:
+    """32-bit hashes of overlapping word n-grams of normalized text."""
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        words = words + [""] * (SHINGLE_WORDS - len(words))
+    grams = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(g.encode(), digest_size=4).digest(), "little") for g in grams],
+        dtype=np.uint64
+    )
+
+
+def minhash(text: str) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint32 values) of a transcript."""
+    shingles = _shingles(text)
+    signature = np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+    # (a * x + b) mod p for every permutation/shingle pair (fits in uint64),
+    # a slice at a time to bound memory on long lectures
+    for i in range(0, len(shingles), 8192):
+        hashed = (np.outer(_A, shingles[i:i + 8192]) + _B[:, None]) % _PRIME
+        signature = np.minimum(signature, hashed.min(axis=1))
+    return signature.astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.mean(a == b))
+
+
+class TranscriptIndex:
+    """
+    Persistent near-duplicate index over lecture transcripts.
+
+    Re-uploads of the same lecture with a different encoding, trim or intro
+    don't share a byte hash but produce nearly the same transcript. Each
+    transcript gets a MinHash signature over 5-word shingles; locality
+    sensitive hashing splits it into bands so lookups only compare against
+    lectures sharing at least one band, via an indexed SQLite table. Adding
+    a lecture is one insert per band, so the index grows incrementally.
+
+    Entries map to the transcript's result cache key, which is what lets a
+    match reuse the earlier lecture's notes, quiz and narration.
+    """
+
+    def __init__(self, path: str = settings.dedup_db_path):
+        self.threshold = settings.dedup_threshold
+        self.min_words = settings.dedup_min_words
+        self.lookups = 0
+        self.matches = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS lectures ("
+            " key TEXT PRIMARY KEY,"
+            " signature BLOB NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS bands ("
+            " band INTEGER NOT NULL,"
+            " hash TEXT NOT NULL,"
+            " key TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS bands_lookup ON bands (band, hash)")
+        self._lock = threading.Lock()
+
+    def usable(self, transcript: str) -> bool:
+        """Very short transcripts match too easily to be trusted."""
+        return len(transcript.split()) >= self.min_words
+
+    def signature(self, transcript: str) -> np.ndarray:
+        return minhash(transcript)
+
+    @staticmethod
+    def _band_hashes(signature: np.ndarray) -> List[str]:
+        return [
+            hashlib.blake2b(signature[i * ROWS:(i + 1) * ROWS].tobytes(), digest_size=8).hexdigest()
+            for i in range(BANDS)
+        ]
+
+    def find(self, signature: np.ndarray) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar indexed lecture above dedup_threshold.
+
+        Returns:
+            (key, similarity) of the best match, or None
+        """
+        with self._lock:
+            self.lookups += 1
+            candidates = set()
+            for band, value in enumerate(self._band_hashes(signature)):
+                rows = self._conn.execute(
+                    "SELECT key FROM bands WHERE band = ? AND hash = ?", (band, value)
+                ).fetchall()
+                candidates.update(row[0] for row in rows)
+
+            best = None
+            for key in candidates:
+                row = self._conn.execute(
+                    "SELECT signature FROM lectures WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    continue
+                score = similarity(signature, np.frombuffer(row[0], dtype=np.uint32))
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (key, score)
+
+            if best:
+                self.matches += 1
+            return best
+
+    def add(self, key: str, signature: np.ndarray):
+        """Index a lecture's signature under its transcript cache key."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                exists = self._conn.execute(
+                    "SELECT 1 FROM lectures WHERE key = ?", (key,)
+                ).fetchone()
+                if not exists:
+                    self._conn.execute(
+                        "INSERT INTO lectures (key, signature, created_at) VALUES (?, ?, ?)",
+                        (key, signature.astype(np.uint32).tobytes(), time.time())
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO bands (band, hash, key) VALUES (?, ?, ?)",
+                        [(band, value, key) for band, value in enumerate(self._band_hashes(signature))]
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def stats(self) -> dict:
+        with self._lock:
+            lectures = self._conn.execute("SELECT COUNT(*) FROM lectures").fetchone()[0]
+        return {
+            "lectures": lectures,
+            "lookups": self.lookups,
+            "matches": self.matches,
+            "threshold": self.threshold
+        }
@@ -1,5 +1,17 @@
-import whisper
+import time
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
+import numpy as np
 from app.config import settings
+from .transcription_pool import TranscriptionPool
+from .audio_chunker import AudioChunker, SAMPLE_RATE
+from .audio_io import load_audio
+from .vad import SpeechAudio, SpeechDetector
+from .model_registry import ModelRegistry, choose_model, estimated_rtf, parse_model_list
+from . import metrics
+
+# What a piece of audio without speech transcribes to
+SILENT_RESULT = {"text": "", "segments": []}
 
 
 class TranscriptionService:
@@ -8,54 +20,267 @@ class TranscriptionService:
 
     Currently uses local Whisper (free).
     Can be swapped to Replicate API or OpenAI Whisper API for production.
+
+    Whisper runs in a process pool (see TranscriptionPool) so long lectures
+    don't block the event loop. With transcription_workers=0 it falls back
+    to a single in-process model on a worker thread.
+
+    With chunked_transcription enabled, long audio is split at silences
+    (see AudioChunker) and the chunks are spread across the pool. With
+    vad_enabled, silence is cut out of each chunk before Whisper sees it
+    (see SpeechDetector) and segment times are mapped back afterwards.
+
+    Several model sizes can be kept loaded (see ModelRegistry); each lecture
+    gets one picked by length or latency target (see choose_model). The
+    inference backend, compute type, threads and beam size are set per
+    deployment (see whisper_backends).
     """
 
     def __init__(self):
-        self._model = None
+        self.registry = ModelRegistry()
+        self.pool = TranscriptionPool() if settings.transcription_workers > 0 else None
+        self.chunker = AudioChunker()
+        self.vad = SpeechDetector()
+        self.models = parse_model_list(settings.whisper_models) or [settings.whisper_model]
+        self._wall_rtf: Dict[str, float] = {}  # Wall seconds per audio second, queueing included
+
+    @property
+    def decode_options(self) -> dict:
+        """Per-request options for WhisperModel.transcribe()."""
+        return {"language": settings.whisper_language or None, "task": "transcribe"}
 
     @property
     def model(self):
-        """Lazy load Whisper model."""
-        if self._model is None:
-            print(f"Loading Whisper model: {settings.whisper_model}")
-            self._model = whisper.load_model(settings.whisper_model)
-        return self._model
+        """Default in-process Whisper model, loaded on first use."""
+        return self.registry.get(settings.whisper_model)
+
+    def start(self):
+        """Start the worker pool and preload models."""
+        if self.pool:
+            self.pool.start(self.models)
+        else:
+            self.registry.preload(self.models)
+
+    async def shutdown(self):
+        """Stop the worker pool gracefully."""
+        if self.pool:
+            await self.pool.shutdown()
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """Position of a job waiting for a transcription worker."""
+        if self.pool:
+            return self.pool.queue_position(job_id)
+        return None
+
+    @property
+    def is_saturated(self) -> bool:
+        """True when no more jobs can be queued."""
+        return bool(self.pool and self.pool.is_full)
+
+    def observed_rtf(self) -> Dict[str, float]:
+        """
+        Inference speed per model as measured where Whisper runs.
+
+        Time spent waiting for a worker is left out, so a busy spell doesn't
+        make the larger models look too slow for the SLA.
+        """
+        if self.pool:
+            return estimated_rtf(list(self.pool.worker_stats.values()))
+        return estimated_rtf([self.registry.stats()])
+
+    def choose_model(self, duration: Optional[float]) -> str:
+        """Pick a model for a lecture of the given length in seconds."""
+        return choose_model(duration, self.observed_rtf())
+
+    def model_stats(self) -> dict:
+        """Load/warm-up times, memory and observed speed per model."""
+        return {
+            "models": self.models,
+            "backend": settings.whisper_backend,
+            "observed_rtf": {name: round(rtf, 3) for name, rtf in self.observed_rtf().items()},
+            "wall_rtf": {name: round(rtf, 3) for name, rtf in self._wall_rtf.items()},
+            "in_process": self.registry.stats(),
+            "workers": dict(self.pool.worker_stats) if self.pool else {}
+        }
+
+    def _record(self, model: str, samples: int, elapsed: float):
+        """Track wall time per audio second, including queueing and merging."""
+        if samples <= 0:
+            return
+        audio_seconds = samples / SAMPLE_RATE
+        rtf = elapsed / audio_seconds
+        previous = self._wall_rtf.get(model)
+        self._wall_rtf[model] = rtf if previous is None else 0.8 * previous + 0.2 * rtf
+
+        metrics.transcription_duration.observe(elapsed, model=model)
+        metrics.transcription_audio.inc(audio_seconds, model=model)
+        metrics.transcription_rtf.observe(rtf, model=model)
+        metrics.log_event(
+            "transcription",
+            model=model,
+            audio_s=round(audio_seconds, 3),
+            duration_s=round(elapsed, 3),
+            rtf=round(rtf, 4)
+        )
+
+    async def _run(
+        self, audio_path: str, job_id: Optional[str], model: Optional[str] = None, **options
+    ) -> dict:
+        options = {**self.decode_options, **options}
+        job_id = job_id or audio_path
+        start = time.perf_counter()
+
+        if not settings.chunked_transcription and not settings.vad_enabled:
+            options["model"] = model or settings.whisper_model
+            return (await self._transcribe_many([audio_path], job_id, options))[0]
+
+        audio = await asyncio.to_thread(load_audio, audio_path)
+        model = model or self.choose_model(len(audio) / SAMPLE_RATE)
+        options["model"] = model
+
+        chunks = self.chunker.split(audio) if settings.chunked_transcription else [(0, audio)]
+        if len(chunks) > 1:
+            results = await self._transcribe_speech([c for _, c in chunks], job_id, options)
+            result = self.chunker.merge([b for b, _ in chunks], results)
+        else:
+            result = (await self._transcribe_speech([audio], job_id, options))[0]
+
+        self._record(model, len(audio), time.perf_counter() - start)
+        return result
+
+    async def _compact(self, audio: np.ndarray) -> SpeechAudio:
+        speech = await asyncio.to_thread(self.vad.compact, audio)
+        if speech.skipped_seconds > 0:
+            metrics.vad_skipped_audio.inc(speech.skipped_seconds)
+        return speech
 
-    async def transcribe(self, audio_path: str) -> str:
+    async def _transcribe_speech(self, inputs: List[np.ndarray], job_id: str, options: dict) -> list:
+        """
+        Transcribe audio pieces with their silence cut out (vad_enabled).
+
+        Pieces without any speech don't reach Whisper at all.
+
+        Returns:
+            One result per input on the input's own timeline
+        """
+        if not settings.vad_enabled:
+            return await self._transcribe_many(inputs, job_id, options)
+
+        speech = [await self._compact(audio) for audio in inputs]
+        voiced = [s.audio for s in speech if s.samples]
+        results = iter(await self._transcribe_many(voiced, job_id, options) if voiced else [])
+        return [s.remap(next(results)) if s.samples else dict(SILENT_RESULT) for s in speech]
+
+    async def _transcribe_many(self, inputs: list, job_id: str, options: dict) -> list:
+        if self.pool:
+            return await self.pool.transcribe_batch(inputs, job_id, **options)
+
+        options = dict(options)
+        name = options.pop("model")
+        model = await asyncio.to_thread(self.registry.get, name)
+        results = []
+        for audio in inputs:
+            if isinstance(audio, str):
+                audio = await asyncio.to_thread(load_audio, audio)
+            results.append(await asyncio.to_thread(self._transcribe_local, name, model, audio, options))
+        return results
+
+    def _transcribe_local(self, name: str, model, audio: np.ndarray, options: dict) -> dict:
+        """Transcribe in this process, recording inference speed like a pool worker."""
+        start = time.perf_counter()
+        result = model.transcribe(audio, **options)
+        self.registry.record(name, len(audio) / SAMPLE_RATE, time.perf_counter() - start)
+        return {"text": result["text"], "segments": result["segments"]}
+
+    async def transcribe_stream(
+        self,
+        blocks: AsyncIterator[np.ndarray],
+        job_id: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> str:
+        """
+        Transcribe audio while it is still being decoded.
+
+        Blocks of 16 kHz float32 samples (e.g. from
+        VideoProcessor.stream_audio) are split at silences as they arrive and
+        each chunk is sent to a worker straight away, so decoding and
+        inference overlap and no audio file is written.
+
+        Args:
+            blocks: Async iterator of audio sample blocks
+            job_id: Optional identifier for queue position reporting
+            model: Whisper model to use (default: whisper_model)
+
+        Returns:
+            Transcribed text
+        """
+        model = model or settings.whisper_model
+        options = {**self.decode_options, "model": model}
+        job_id = job_id or "stream"
+        boundaries = []
+        speech: List[Optional[SpeechAudio]] = []  # Per chunk, when vad_enabled
+        overlap = int(self.chunker.overlap_seconds * SAMPLE_RATE)
+        samples = 0
+        start = time.perf_counter()
+
+        async def chunks():
+            nonlocal samples
+            async for boundary, chunk in self.chunker.split_stream(blocks):
+                boundaries.append(boundary)
+                samples = max(0, boundary - overlap) + len(chunk)
+                if not settings.vad_enabled:
+                    yield chunk
+                    continue
+                # Silent chunks are skipped; results are lined up again below
+                speech.append(await self._compact(chunk))
+                if speech[-1].samples:
+                    yield speech[-1].audio
+
+        if self.pool:
+            results = await self.pool.transcribe_stream(chunks(), job_id, **options)
+        else:
+            options.pop("model")
+            loaded = await asyncio.to_thread(self.registry.get, model)
+            results = []
+            async for chunk in chunks():
+                results.append(
+                    await asyncio.to_thread(self._transcribe_local, model, loaded, chunk, options)
+                )
+
+        if settings.vad_enabled:
+            voiced = iter(results)
+            results = [s.remap(next(voiced)) if s.samples else dict(SILENT_RESULT) for s in speech]
+
+        self._record(model, samples, time.perf_counter() - start)
+        return self.chunker.merge(boundaries, results)["text"]
+
+    async def transcribe(
+        self, audio_path: str, job_id: Optional[str] = None, model: Optional[str] = None
+    ) -> str:
         """
         Transcribe audio file to text.
 
         Args:
             audio_path: Path to the audio file
+            job_id: Optional identifier for queue position reporting
+            model: Whisper model to use (default: picked by choose_model)
 
         Returns:
             Transcribed text
         """
         # Local Whisper transcription (free)
-        result = self.model.transcribe(
-            audio_path,
-            language="en",
-            task="transcribe"
-        )
+        result = await self._run(audio_path, job_id, model)
 
         return result["text"]
 
-    async def transcribe_with_timestamps(self, audio_path: str) -> dict:
+    async def transcribe_with_timestamps(
+        self, audio_path: str, job_id: Optional[str] = None, model: Optional[str] = None
+    ) -> dict:
         """
         Transcribe with word-level timestamps.
         Useful for syncing with video later.
         """
-        result = self.model.transcribe(
-            audio_path,
-            language="en",
-            task="transcribe",
-            word_timestamps=True
-        )
-
-        return {
-            "text": result["text"],
-            "segments": result["segments"]
-        }
+        return await self._run(audio_path, job_id, model, word_timestamps=True)
 
 
 # For future production use:
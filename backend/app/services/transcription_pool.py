@@ -0,0 +1,203 @@
+import os
+import time
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterable, Dict, List, Optional
+from app.config import settings
+from .audio_io import load_audio
+from .model_registry import ModelRegistry
+from . import metrics
+
+
+class TranscriptionQueueFullError(Exception):
+    """Raised when the transcription queue has no room for another job."""
+
+
+# Per-process models, preloaded by the pool initializer
+_worker_registry: Optional[ModelRegistry] = None
+
+
+def _init_worker(model_names: List[str]):
+    """Load and warm up Whisper models once when a worker process starts."""
+    global _worker_registry
+    _worker_registry = ModelRegistry()
+    _worker_registry.preload(model_names)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _transcribe_in_worker(audio, options: dict) -> dict:
+    """Run Whisper inside a worker process."""
+    options = dict(options)
+    name = options.pop("model", None) or settings.whisper_model
+    if isinstance(audio, str):
+        audio = load_audio(audio)
+
+    model = _worker_registry.get(name)
+    start = time.perf_counter()
+    result = model.transcribe(audio, **options)
+    _worker_registry.record(name, len(audio) / 16000, time.perf_counter() - start)
+
+    return {
+        "text": result["text"],
+        "segments": result["segments"],
+        "worker_stats": (os.getpid(), _worker_registry.stats())
+    }
+
+
+class TranscriptionPool:
+    """
+    Process pool for CPU-bound Whisper transcription.
+
+    Each worker process preloads its models once (see ModelRegistry), so N
+    workers can transcribe N lectures at the same time without blocking the
+    API event loop. Jobs beyond the worker count wait in a bounded FIFO
+    queue and can report their position while they wait.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.transcription_workers,
+        max_queue: int = settings.transcription_queue_size
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting: List[str] = []
+        self.worker_stats: Dict[int, dict] = {}  # pid -> model stats
+
+    def start(self, models: Optional[List[str]] = None):
+        """Spin up the worker processes and preload their models."""
+        if self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(models or [settings.whisper_model],)
+        )
+        self._slots = asyncio.Semaphore(self.workers)
+
+        # Workers start on first submit; kick them off now so models load
+        # at startup instead of on the first lecture
+        for _ in range(self.workers):
+            self._executor.submit(_ping)
+
+    async def shutdown(self):
+        """Finish running jobs, drop queued ones and stop the workers."""
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    @property
+    def is_full(self) -> bool:
+        return len(self._waiting) >= self.max_queue
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position of a waiting job, or None if it isn't queued."""
+        try:
+            return self._waiting.index(job_id) + 1
+        except ValueError:
+            return None
+
+    async def transcribe(self, audio, job_id: str, **options) -> dict:
+        """
+        Queue a transcription job and wait for its result.
+
+        Args:
+            audio: Path to the audio file, or 16 kHz float32 samples
+            job_id: Identifier used for queue position reporting
+            **options: Extra keyword arguments for whisper's transcribe()
+
+        Returns:
+            Dict with "text" and "segments"
+        """
+        results = await self.transcribe_batch([audio], job_id, **options)
+        return results[0]
+
+    async def transcribe_batch(self, inputs: list, job_id: str, **options) -> List[dict]:
+        """
+        Transcribe several pieces of one job in parallel across workers.
+
+        The job takes a single queue slot and leaves the queue as soon as its
+        first piece reaches a worker.
+
+        Returns:
+            One result per input, in input order
+        """
+        async def pieces():
+            for audio in inputs:
+                yield audio
+
+        return await self.transcribe_stream(pieces(), job_id, **options)
+
+    async def transcribe_stream(
+        self, inputs: AsyncIterable, job_id: str, **options
+    ) -> List[dict]:
+        """
+        Like transcribe_batch(), but pieces are dispatched as they arrive.
+
+        Lets transcription of early audio start while later audio is still
+        being produced. At most workers + 1 pieces are held at once: the next
+        piece is only pulled from inputs when one finishes, so a decoder that
+        is faster than Whisper waits instead of buffering the whole lecture.
+
+        Returns:
+            One result per piece, in arrival order
+        """
+        if self._executor is None:
+            self.start()
+        if self.is_full:
+            raise TranscriptionQueueFullError(
+                "Transcription queue is full. Please try again later."
+            )
+
+        loop = asyncio.get_running_loop()
+        self._waiting.append(job_id)
+        queued = time.perf_counter()
+        started = False
+
+        async def run_one(audio):
+            nonlocal started
+            async with self._slots:
+                if not started:
+                    started = True
+                    self._waiting.remove(job_id)
+                    wait = time.perf_counter() - queued
+                    metrics.transcription_queue_wait.observe(wait)
+                    metrics.log_event("transcription_queued", wait_s=round(wait, 3))
+                result = await loop.run_in_executor(
+                    self._executor, _transcribe_in_worker, audio, options
+                )
+            pid, stats = result.pop("worker_stats")
+            self.worker_stats[pid] = stats
+            return result
+
+        outstanding = asyncio.Semaphore(self.workers + 1)
+        pieces = inputs.__aiter__()
+        running = []
+        try:
+            while True:
+                await outstanding.acquire()
+                try:
+                    audio = await pieces.__anext__()
+                except StopAsyncIteration:
+                    break
+                task = asyncio.create_task(run_one(audio))
+                task.add_done_callback(lambda _: outstanding.release())
+                running.append(task)
+                del audio  # Only the task holds the piece now
+            return await asyncio.gather(*running)
+        except BaseException:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+        finally:
+            if not started:
+                self._waiting.remove(job_id)
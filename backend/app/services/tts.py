@@ -1,6 +1,35 @@
 import os
+import time
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
+import aiofiles
 import edge_tts
 from app.config import settings
+from .text_chunker import chunk_text, split_sentences, CHARS_PER_TOKEN
+from .result_cache import ResultCache
+from . import metrics
+
+
+class EdgeTTSBackend:
+    """Synthesizes speech with Edge-TTS and returns the raw MP3 bytes."""
+
+    async def synthesize(self, text: str, voice: str) -> bytes:
+        audio = bytearray()
+        async for chunk in edge_tts.Communicate(text, voice).stream():
+            if chunk["type"] == "audio":
+                audio += chunk["data"]
+        return bytes(audio)
+
+
+class _Render:
+    """Progress of one narration: finished chunks, in order, as they land."""
+
+    def __init__(self, total: int):
+        self.chunks: List[Optional[bytes]] = [None] * total
+        self.ready = 0  # Leading chunks that are finished
+        self.done = False
+        self.error: Optional[Exception] = None
+        self.changed = asyncio.Condition()
 
 
 class TTSService:
@@ -8,12 +37,52 @@ class TTSService:
     Handles text-to-speech conversion.
 
     Currently uses Edge-TTS (free, high quality Microsoft voices).
-    Can be swapped to ElevenLabs, OpenAI TTS, or Google TTS.
+    Can be swapped to ElevenLabs, OpenAI TTS, or Google TTS by passing a
+    different backend (anything with an async synthesize(text, voice)).
+
+    Narration is split into sentence-aligned chunks of about
+    tts_chunk_chars, which are synthesized concurrently (at most
+    tts_max_concurrency at a time). Edge-TTS returns bare MPEG frames, so
+    the chunks are joined by appending them in order. While a narration is
+    rendering, stream() yields the leading chunks that are already done.
+
+    With the phrase cache enabled, every sentence is its own chunk and its
+    audio is cached by (normalized text, voice), so a narration only pays
+    for sentences no earlier lecture has used.
     """
 
-    def __init__(self):
+    def __init__(self, backend=None, phrase_cache: Optional[ResultCache] = None):
         self.voice = settings.tts_voice
         self.output_dir = settings.output_dir
+        self.backend = backend or EdgeTTSBackend()
+        self.max_concurrency = max(1, settings.tts_max_concurrency)
+        self.phrase_cache = phrase_cache or ResultCache(
+            cache_dir=settings.tts_phrase_cache_dir,
+            max_size_mb=settings.tts_phrase_cache_max_size_mb,
+            enabled=settings.tts_phrase_cache_enabled
+        )
+        self._renders: Dict[str, _Render] = {}
+
+    def split(self, text: str) -> List[str]:
+        """Split narration into sentences (phrase cache) or sentence-aligned chunks."""
+        if self.phrase_cache.enabled:
+            return split_sentences(text)
+        return chunk_text(text, max(1, settings.tts_chunk_chars // CHARS_PER_TOKEN))
+
+    def phrase_key(self, text: str) -> str:
+        """Cache key for a sentence: whitespace-normalized text plus voice."""
+        return ResultCache.make_key("phrase", " ".join(text.split()), self.voice)
+
+    async def _synthesize(self, text: str) -> bytes:
+        key = self.phrase_key(text)
+        audio = await self.phrase_cache.get_bytes("phrase", key)
+        if audio is None:
+            start = time.perf_counter()
+            audio = await self.backend.synthesize(text, self.voice)
+            metrics.tts_duration.observe(time.perf_counter() - start)
+            metrics.tts_characters.inc(len(text))
+            await self.phrase_cache.put_bytes(key, audio)
+        return audio
 
     async def generate_audio(self, text: str, task_id: str) -> str:
         """
@@ -27,11 +96,83 @@ class TTSService:
             Path to the generated audio file
         """
         output_path = os.path.join(self.output_dir, f"{task_id}_voice.mp3")
+        partial_path = f"{output_path}.part"
+
+        pieces = self.split(text)
+        render = _Render(len(pieces))
+        self._renders[task_id] = render
+        slots = asyncio.Semaphore(self.max_concurrency)
+
+        async def synthesize(index: int, piece: str):
+            try:
+                async with slots:
+                    audio = await self._synthesize(piece)
+            except Exception as e:
+                render.error = render.error or e
+                audio = None
+            async with render.changed:
+                render.chunks[index] = audio
+                while render.ready < len(pieces) and render.chunks[render.ready] is not None:
+                    render.ready += 1
+                render.changed.notify_all()
+
+        written = 0
+        running = [asyncio.create_task(synthesize(i, p)) for i, p in enumerate(pieces)]
+        try:
+            async with aiofiles.open(partial_path, "wb") as f:
+                # Append chunks in order as soon as each one and all before it are done
+                while written < len(pieces):
+                    async with render.changed:
+                        await render.changed.wait_for(
+                            lambda: render.ready > written or render.error is not None
+                        )
+                    if render.error is not None:
+                        raise render.error
+                    while written < render.ready:
+                        await f.write(render.chunks[written])
+                        written += 1
+            os.replace(partial_path, output_path)
+            return output_path
+        except BaseException:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            if render.error is None:
+                render.error = Exception("Voice generation was cancelled")
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        finally:
+            async with render.changed:
+                render.done = True
+                render.changed.notify_all()
+            del self._renders[task_id]
 
-        communicate = edge_tts.Communicate(text, self.voice)
-        await communicate.save(output_path)
+    def is_rendering(self, task_id: str) -> bool:
+        return task_id in self._renders
+
+    async def stream(self, task_id: str) -> AsyncIterator[bytes]:
+        """
+        Yield a narration's MP3 data while it is still being generated.
+
+        Chunks are yielded in order as soon as they and every chunk before
+        them are finished. Raises if generation fails part-way.
+        """
+        render = self._renders.get(task_id)
+        if render is None:
+            return
 
-        return output_path
+        sent = 0
+        while True:
+            async with render.changed:
+                await render.changed.wait_for(lambda: render.ready > sent or render.done)
+            if render.error is not None:
+                raise render.error
+            while sent < render.ready:
+                yield render.chunks[sent]
+                sent += 1
+            if render.done:
+                return
 
     async def list_voices(self, language: str = "en") -> list:
         """List available voices for a language."""
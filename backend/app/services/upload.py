@@ -0,0 +1,71 @@
+import os
+import hashlib
+import aiofiles
+from fastapi import UploadFile
+from app.config import settings
+
+
+class FileTooLargeError(Exception):
+    """Raised when an upload goes over settings.max_file_size_mb."""
+
+
+class UploadService:
+    """
+    Handles streaming ingest of uploaded videos.
+
+    The upload is copied to disk in fixed-size chunks, so peak memory per
+    upload stays at one chunk no matter how big the lecture is. The size
+    limit is enforced while streaming and the content is hashed as it goes.
+    """
+
+    def __init__(self):
+        self.upload_dir = settings.upload_dir
+        self.chunk_size = settings.upload_chunk_size_kb * 1024
+        self.max_bytes = settings.max_file_size_mb * 1024 * 1024
+
+    async def save(self, file: UploadFile, task_id: str) -> dict:
+        """
+        Stream an uploaded file to the upload directory.
+
+        Args:
+            file: The incoming upload
+            task_id: Unique task identifier
+
+        Returns:
+            Dict with the saved "path", its "size" in bytes and "sha256" digest
+
+        Raises:
+            FileTooLargeError: If the upload exceeds the configured maximum
+        """
+        filename = os.path.basename(file.filename or "upload")
+        video_path = os.path.join(self.upload_dir, f"{task_id}_{filename}")
+
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            async with aiofiles.open(video_path, "wb") as out:
+                while True:
+                    chunk = await file.read(self.chunk_size)
+                    if not chunk:
+                        break
+
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise FileTooLargeError(
+                            f"File too large. Maximum size: {settings.max_file_size_mb}MB"
+                        )
+
+                    digest.update(chunk)
+                    await out.write(chunk)
+        except BaseException:
+            # Don't leave partial uploads behind
+            if os.path.exists(video_path):
+                os.remove(video_path)
+            raise
+
+        return {
+            "path": video_path,
+            "size": size,
+            "sha256": digest.hexdigest()
+        }
@@ -0,0 +1,151 @@
+from typing import List, Tuple
+import numpy as np
+from app.config import settings
+from .audio_chunker import SAMPLE_RATE, HOP_LENGTH
+
+FRAME_SECONDS = 0.03
+NOISE_PERCENTILE = 10  # Quietest frames approximate the room's noise floor
+NOISE_MARGIN_DB = 10.0  # Speech must be this much louder than the noise floor
+MAX_THRESHOLD_DB = -30.0  # Never demand more than this, even in mostly-speech audio
+FRICATIVE_ZCR = 0.3  # Zero crossings per sample typical of "s", "f", "sh"
+FRICATIVE_MARGIN_DB = 6.0  # How far below the threshold fricatives may be
+MIN_SPEECH_SECONDS = 0.1  # Shorter bursts are clicks and bumps, not words
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end (exclusive) indexes of the True runs in a boolean array."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+class SpeechAudio:
+    """
+    Audio with silence cut out, plus the table to map times back.
+
+    regions are (start, end) sample ranges of the original audio that were
+    kept; offsets[i] is where region i begins in the compacted audio.
+    """
+
+    def __init__(self, audio: np.ndarray, regions: List[Tuple[int, int]], total: int):
+        self.regions = regions
+        self.total = total
+        if regions == [(0, total)]:
+            self.audio = audio
+        elif regions:
+            self.audio = np.concatenate([audio[start:end] for start, end in regions])
+        else:
+            self.audio = np.empty(0, dtype=np.float32)
+        lengths = np.array([end - start for start, end in regions], dtype=np.int64)
+        self._starts = np.array([start for start, _ in regions], dtype=np.int64)
+        self._offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if regions else lengths
+
+    @property
+    def samples(self) -> int:
+        return len(self.audio)
+
+    @property
+    def skipped_seconds(self) -> float:
+        return (self.total - self.samples) / SAMPLE_RATE
+
+    def to_original(self, seconds: float, end: bool = False) -> float:
+        """
+        Map a time in the compacted audio to the original timeline.
+
+        A time exactly on the seam between two regions belongs to the next
+        region for start times and to the previous one for end times.
+        """
+        if not self.regions:
+            return seconds
+        sample = seconds * SAMPLE_RATE
+        side = "left" if end else "right"
+        i = max(0, int(np.searchsorted(self._offsets, sample, side=side)) - 1)
+        return float(self._starts[i] + sample - self._offsets[i]) / SAMPLE_RATE
+
+    def remap(self, result: dict) -> dict:
+        """Move Whisper segment and word times back onto the original timeline."""
+        if self.regions == [(0, self.total)]:
+            return result
+
+        segments = []
+        for segment in result["segments"]:
+            shifted = dict(segment)
+            shifted["start"] = self.to_original(segment["start"])
+            shifted["end"] = self.to_original(segment["end"], end=True)
+            if "seek" in shifted:
+                shifted["seek"] = int(
+                    self.to_original(segment["seek"] * HOP_LENGTH / SAMPLE_RATE) * SAMPLE_RATE
+                ) // HOP_LENGTH
+            if shifted.get("words"):
+                shifted["words"] = [
+                    {**w, "start": self.to_original(w["start"]), "end": self.to_original(w["end"], end=True)}
+                    for w in shifted["words"]
+                ]
+            segments.append(shifted)
+        return {**result, "segments": segments}
+
+
+class SpeechDetector:
+    """
+    Energy and zero-crossing voice activity detection for 16 kHz audio.
+
+    Frames louder than the audio's own noise floor (plus a margin) count
+    as speech, as do slightly quieter frames with the high zero-crossing
+    rate of fricatives. Short bursts are dropped, pauses shorter than
+    vad_min_silence_seconds are kept so sentences stay intact, and each
+    speech region is padded by vad_padding_seconds. Everything is
+    vectorized, so an hour of audio takes well under a second.
+    """
+
+    def __init__(self):
+        self.min_silence_seconds = settings.vad_min_silence_seconds
+        self.padding_seconds = settings.vad_padding_seconds
+        self.energy_floor_db = settings.vad_energy_floor_db
+
+    def detect(self, audio: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        Find speech in the audio.
+
+        Returns:
+            Sorted, non-overlapping (start, end) sample ranges
+        """
+        total = len(audio)
+        frame = int(FRAME_SECONDS * SAMPLE_RATE)
+        n_frames = total // frame
+        if n_frames == 0:
+            return [(0, total)] if total else []
+
+        frames = np.asarray(audio[:n_frames * frame], dtype=np.float32).reshape(n_frames, frame)
+        energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame
+
+        noise_db = np.percentile(energy_db, NOISE_PERCENTILE)
+        threshold = min(max(noise_db + NOISE_MARGIN_DB, self.energy_floor_db), MAX_THRESHOLD_DB)
+        speech = (energy_db > threshold) | (
+            (energy_db > threshold - FRICATIVE_MARGIN_DB) & (zcr >= FRICATIVE_ZCR)
+        )
+
+        # Drop clicks, then close pauses too short to be worth cutting
+        starts, ends = _runs(speech)
+        for start, end in zip(starts, ends):
+            if end - start < MIN_SPEECH_SECONDS / FRAME_SECONDS:
+                speech[start:end] = False
+        starts, ends = _runs(~speech)
+        for start, end in zip(starts, ends):
+            if 0 < start and end < n_frames and end - start < self.min_silence_seconds / FRAME_SECONDS:
+                speech[start:end] = True
+
+        pad = int(self.padding_seconds * SAMPLE_RATE)
+        regions = []
+        for start, end in zip(*_runs(speech)):
+            start = max(0, int(start) * frame - pad)
+            end = total if end == n_frames else min(total, int(end) * frame + pad)
+            if regions and start <= regions[-1][1]:
+                regions[-1] = (regions[-1][0], end)
+            else:
+                regions.append((start, end))
+        return regions
+
+    def compact(self, audio: np.ndarray) -> SpeechAudio:
+        """Cut the silence out of audio, keeping a map back to the original."""
+        return SpeechAudio(audio, self.detect(audio), len(audio))
@@ -1,14 +1,77 @@
 import os
-import subprocess
-from pathlib import Path
+import time
+import asyncio
+from typing import AsyncIterator, List, Optional
+import numpy as np
 from app.config import settings
+from . import metrics
+
+# ffmpeg output options per audio_format, with the matching file extension
+AUDIO_FORMATS = {
+    # Compressed, smallest on disk, but Whisper has to decode it again
+    "mp3": ("mp3", ["-acodec", "libmp3lame", "-ab", "128k"]),
+    # 16-bit PCM, read directly without another ffmpeg run
+    "wav": ("wav", ["-acodec", "pcm_s16le"]),
+    # Raw float32 samples, memory-mapped straight into Whisper
+    "f32": ("f32", ["-acodec", "pcm_f32le", "-f", "f32le"]),
+}
 
 
 class VideoProcessor:
-    """Handles video to audio extraction using FFmpeg."""
+    """
+    Handles video to audio extraction using FFmpeg.
+
+    FFmpeg runs as an asyncio subprocess so the event loop stays free. The
+    number of concurrent ffmpeg/ffprobe processes is capped, each run has a
+    timeout, and a cancelled or timed-out run kills its process.
+
+    Streamed extractions (stream_audio) are paced by Whisper and spend most
+    of their life blocked on a full pipe, so they have their own cap
+    (ffmpeg_max_streams) instead of holding one of the ffmpeg slots for the
+    whole transcription, and time out only when ffmpeg stalls.
+    """
 
     def __init__(self):
         self.output_dir = settings.output_dir
+        self.audio_format = settings.audio_format
+        self.timeout = settings.ffmpeg_timeout_seconds
+        self.stall_timeout = settings.ffmpeg_stall_timeout_seconds
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._stream_slots: Optional[asyncio.Semaphore] = None
+
+        if self.audio_format not in AUDIO_FORMATS:
+            raise ValueError(
+                f"Unknown audio_format '{self.audio_format}'. Use one of: {', '.join(AUDIO_FORMATS)}"
+            )
+
+    async def _run(self, command: List[str], timeout: Optional[float] = None) -> tuple:
+        """
+        Run a command and return (returncode, stdout, stderr).
+
+        Raises:
+            asyncio.TimeoutError: If the command runs longer than the timeout
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(max(1, settings.ffmpeg_max_concurrency))
+
+        async with self._slots:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(), timeout or self.timeout
+                )
+            except BaseException:
+                # Timed out or cancelled: don't leave ffmpeg running
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
+
+        return process.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
 
     async def extract_audio(self, video_path: str, task_id: str) -> str:
         """
@@ -19,9 +82,10 @@ class VideoProcessor:
             task_id: Unique task identifier
 
         Returns:
-            Path to the extracted audio file
+            Path to the extracted 16 kHz mono audio file (see audio_format)
         """
-        audio_path = os.path.join(self.output_dir, f"{task_id}_audio.mp3")
+        extension, codec_args = AUDIO_FORMATS[self.audio_format]
+        audio_path = os.path.join(self.output_dir, f"{task_id}_audio.{extension}")
 
         try:
             # Use FFmpeg to extract audio
@@ -29,21 +93,21 @@ class VideoProcessor:
                 "ffmpeg",
                 "-i", video_path,
                 "-vn",  # No video
-                "-acodec", "libmp3lame",
-                "-ab", "128k",
+                *codec_args,
+                "-ac", "1",  # Mono
                 "-ar", "16000",  # 16kHz for Whisper
                 "-y",  # Overwrite output
                 audio_path
             ]
 
-            process = subprocess.run(
-                command,
-                capture_output=True,
-                text=True
-            )
+            start = time.perf_counter()
+            returncode, _, stderr = await self._run(command)
+            elapsed = time.perf_counter() - start
+            metrics.ffmpeg_duration.observe(elapsed, operation="extract_audio")
+            metrics.log_event("ffmpeg", operation="extract_audio", duration_s=round(elapsed, 3))
 
-            if process.returncode != 0:
-                raise Exception(f"FFmpeg error: {process.stderr}")
+            if returncode != 0:
+                raise Exception(f"FFmpeg error: {stderr}")
 
             return audio_path
 
@@ -52,6 +116,90 @@ class VideoProcessor:
                 "FFmpeg not found. Please install FFmpeg: "
                 "brew install ffmpeg (Mac) or apt install ffmpeg (Linux)"
             )
+        except asyncio.TimeoutError:
+            self.cleanup(audio_path)
+            raise Exception(f"FFmpeg timed out after {self.timeout:.0f}s")
+        except asyncio.CancelledError:
+            self.cleanup(audio_path)
+            raise
+
+    async def stream_audio(self, video_path: str, block_seconds: float = 1.0) -> AsyncIterator[np.ndarray]:
+        """
+        Decode a video's audio track and yield it as it is produced.
+
+        ffmpeg writes 16 kHz mono float32 PCM to stdout, so nothing touches
+        the disk and consumers can start on the first blocks while the rest
+        is still being decoded. Time spent suspended at a yield (the consumer
+        busy transcribing) doesn't count; only a single read waiting longer
+        than ffmpeg_stall_timeout_seconds for data fails the run.
+
+        Args:
+            video_path: Path to the video file
+            block_seconds: Approximate amount of audio per yielded block
+
+        Yields:
+            float32 numpy arrays of samples
+        """
+        if self._stream_slots is None:
+            self._stream_slots = asyncio.Semaphore(max(1, settings.ffmpeg_max_streams))
+
+        command = [
+            "ffmpeg",
+            "-v", "error",
+            "-i", video_path,
+            "-vn",
+            "-acodec", "pcm_f32le",
+            "-f", "f32le",
+            "-ac", "1",
+            "-ar", "16000",
+            "-"
+        ]
+        block_bytes = int(block_seconds * 16000) * 4
+
+        async with self._stream_slots:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+            except FileNotFoundError:
+                raise Exception(
+                    "FFmpeg not found. Please install FFmpeg: "
+                    "brew install ffmpeg (Mac) or apt install ffmpeg (Linux)"
+                )
+
+            # Drain stderr alongside stdout so ffmpeg never blocks on it
+            stderr = asyncio.create_task(process.stderr.read())
+            start = time.perf_counter()
+            try:
+                leftover = b""
+                while True:
+                    data = await asyncio.wait_for(process.stdout.read(block_bytes), self.stall_timeout)
+                    if not data:
+                        break
+                    data = leftover + data
+                    usable = len(data) - len(data) % 4
+                    leftover = data[usable:]
+                    if usable:
+                        yield np.frombuffer(data[:usable], dtype=np.float32)
+
+                await process.wait()
+                if process.returncode != 0:
+                    raise Exception(f"FFmpeg error: {(await stderr).decode(errors='replace')}")
+            except asyncio.TimeoutError:
+                raise Exception(f"FFmpeg produced no audio for {self.stall_timeout:.0f}s")
+            finally:
+                # Consumer stopped early, failed, or was cancelled
+                if process.returncode is None:
+                    process.kill()
+                # Read the pipes to EOF so their transports close now
+                await process.stdout.read()
+                await process.wait()
+                await stderr
+                elapsed = time.perf_counter() - start
+                metrics.ffmpeg_duration.observe(elapsed, operation="stream_audio")
+                metrics.log_event("ffmpeg", operation="stream_audio", duration_s=round(elapsed, 3))
 
     async def get_video_duration(self, video_path: str) -> float:
         """Get video duration in seconds."""
@@ -63,14 +211,16 @@ class VideoProcessor:
             video_path
         ]
 
-        process = subprocess.run(command, capture_output=True, text=True)
-        return float(process.stdout.strip())
+        start = time.perf_counter()
+        _, stdout, _ = await self._run(command, timeout=60)
+        metrics.ffmpeg_duration.observe(time.perf_counter() - start, operation="probe")
+        return float(stdout.strip())
 
     def cleanup(self, *file_paths: str):
         """Remove temporary files."""
         for path in file_paths:
             try:
-                if os.path.exists(path):
+                if path and os.path.exists(path):
                     os.remove(path)
             except Exception:
                 pass
@@ -0,0 +1,182 @@
+import os
+from typing import Dict, Optional, Type
+import numpy as np
+from app.config import settings
+
+# Approximate parameter counts, for backends that can't report memory use
+MODEL_PARAMS = {"tiny": 39e6, "base": 74e6, "small": 244e6, "medium": 769e6, "large": 1550e6}
+BYTES_PER_PARAM = {"float32": 4, "float16": 2, "int8_float32": 1, "int8_float16": 1, "int8": 1}
+
+
+def inference_threads() -> int:
+    """CPU threads per model: whisper_threads, or the cores shared between workers."""
+    if settings.whisper_threads > 0:
+        return settings.whisper_threads
+    return max(1, (os.cpu_count() or 1) // max(1, settings.transcription_workers))
+
+
+def _param_bytes(name: str, compute_type: str) -> int:
+    size = next((s for s in reversed(list(MODEL_PARAMS)) if name.startswith(s)), "base")
+    return int(MODEL_PARAMS[size] * BYTES_PER_PARAM.get(compute_type, 4))
+
+
+class WhisperModel:
+    """
+    A loaded speech-to-text model.
+
+    transcribe() takes 16 kHz float32 samples plus openai-whisper style
+    options (language, task, word_timestamps) and returns a dict with
+    "text" and "segments" in openai-whisper's format, whatever the backend.
+    Decoding settings (beam size, compute type, threads) are per
+    deployment and come from settings.
+    """
+
+    backend = ""
+    default_compute_type = "float32"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.compute_type = self.resolve_compute_type()
+
+    @classmethod
+    def resolve_compute_type(cls) -> str:
+        if settings.whisper_compute_type == "default":
+            return cls.default_compute_type
+        return settings.whisper_compute_type
+
+    def transcribe(self, audio: np.ndarray, **options) -> dict:
+        raise NotImplementedError
+
+    @property
+    def memory_bytes(self) -> int:
+        return _param_bytes(self.name, self.compute_type)
+
+
+class OpenAIWhisperModel(WhisperModel):
+    """
+    openai-whisper on PyTorch (CPU).
+
+    compute_type "int8" applies PyTorch dynamic int8 quantization to the
+    linear layers, which make up most of the compute; "float16" only helps
+    on a GPU.
+    """
+
+    backend = "openai"
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        import torch
+        import whisper
+
+        torch.set_num_threads(inference_threads())
+        self.model = whisper.load_model(name, device="cpu")
+        if self.compute_type == "int8":
+            # whisper subclasses nn.Linear only to cast fp16 weights, which
+            # the quantizer doesn't recognise; plain Linear is equivalent here
+            for module in self.model.modules():
+                if isinstance(module, torch.nn.Linear):
+                    module.__class__ = torch.nn.Linear
+            self.model = torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+    def transcribe(self, audio: np.ndarray, **options) -> dict:
+        options = {"fp16": self.compute_type == "float16", **options}
+        if settings.whisper_beam_size > 1:
+            options.setdefault("beam_size", settings.whisper_beam_size)
+        result = self.model.transcribe(audio, **options)
+        return {"text": result["text"], "segments": result["segments"]}
+
+    @property
+    def memory_bytes(self) -> int:
+        import torch
+
+        total = 0
+        for value in self.model.state_dict().values():
+            # Quantized layers store (weight, bias) tuples
+            for tensor in value if isinstance(value, tuple) else (value,):
+                if torch.is_tensor(tensor):
+                    total += tensor.numel() * tensor.element_size()
+        return total
+
+
+class FasterWhisperModel(WhisperModel):
+    """
+    faster-whisper (CTranslate2), int8 by default.
+
+    Typically several times faster than openai-whisper on a CPU at similar
+    accuracy, with a fraction of the memory. Needs `pip install faster-whisper`.
+    """
+
+    backend = "faster"
+    default_compute_type = "int8"
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        from faster_whisper import WhisperModel as CTranslate2Model
+
+        self.model = CTranslate2Model(
+            name,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=inference_threads(),
+            num_workers=1
+        )
+
+    def transcribe(self, audio: np.ndarray, **options) -> dict:
+        options.pop("fp16", None)
+        segments, _ = self.model.transcribe(
+            np.asarray(audio, dtype=np.float32),
+            beam_size=settings.whisper_beam_size,
+            **options
+        )
+
+        results = []
+        for segment in segments:  # A generator: decoding happens here
+            results.append({
+                "id": segment.id,
+                "seek": segment.seek,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "tokens": list(segment.tokens),
+                "temperature": segment.temperature,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob,
+                "words": [
+                    {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
+                    for w in segment.words
+                ] if segment.words else None
+            })
+        return {"text": "".join(s["text"] for s in results), "segments": results}
+
+
+BACKENDS: Dict[str, Type[WhisperModel]] = {
+    OpenAIWhisperModel.backend: OpenAIWhisperModel,
+    FasterWhisperModel.backend: FasterWhisperModel
+}
+
+
+def backend_class(backend: Optional[str] = None) -> Type[WhisperModel]:
+    backend = backend or settings.whisper_backend
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown whisper_backend '{backend}'. Choose one of: {', '.join(BACKENDS)}"
+        )
+    return BACKENDS[backend]
+
+
+def load_model(name: str) -> WhisperModel:
+    """Load a model with the configured backend."""
+    return backend_class()(name)
+
+
+def decoding_signature() -> tuple:
+    """Everything besides the model name that changes a transcript."""
+    return (
+        settings.whisper_backend,
+        backend_class().resolve_compute_type(),
+        settings.whisper_beam_size,
+        settings.whisper_language
+    )
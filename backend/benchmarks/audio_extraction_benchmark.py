@@ -0,0 +1,76 @@
+"""
+Audio extraction benchmark: MP3 vs. direct-to-PCM.
+
+Generates a synthetic lecture video with ffmpeg, then times each
+audio_format end to end: ffmpeg extraction plus loading the result into
+the float32 array Whisper consumes (an extra ffmpeg decode for MP3).
+
+Usage (from the backend folder):
+    python -m benchmarks.audio_extraction_benchmark --minutes 30 --runs 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.services import VideoProcessor
+from app.services.audio_io import load_audio
+from app.services.video_processor import AUDIO_FORMATS
+from benchmarks.common import make_video
+
+
+async def time_format(audio_format: str, video_path: str, runs: int) -> dict:
+    settings.audio_format = audio_format
+    processor = VideoProcessor()
+    extract, load, sizes = [], [], []
+
+    for run in range(runs):
+        start = time.perf_counter()
+        audio_path = await processor.extract_audio(video_path, f"bench_{audio_format}_{run}")
+        extract.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        audio = load_audio(audio_path)
+        audio.sum()  # Touch every page of memory-mapped files
+        load.append(time.perf_counter() - start)
+
+        sizes.append(os.path.getsize(audio_path))
+        processor.cleanup(audio_path)
+
+    return {
+        "format": audio_format,
+        "extract_s": round(statistics.median(extract), 3),
+        "load_s": round(statistics.median(load), 3),
+        "total_s": round(statistics.median(e + l for e, l in zip(extract, load)), 3),
+        "file_mb": round(sizes[0] / (1024 * 1024), 1)
+    }
+
+
+async def run(minutes: float, runs: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = os.path.join(tmp, "lecture.mp4")
+        make_video(video_path, minutes)
+        settings.output_dir = tmp
+        results = [await time_format(fmt, video_path, runs) for fmt in AUDIO_FORMATS]
+
+    return {"video_minutes": minutes, "runs": runs, "formats": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=30)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.minutes, args.runs)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
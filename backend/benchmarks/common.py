@@ -0,0 +1,61 @@
+"""Helpers shared by the benchmark scripts."""
+import asyncio
+import resource
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+
+def make_video(path: str, minutes: float, pause_every: float = 0):
+    """
+    Tiny low-res video with a tone, so the audio track dominates the work.
+
+    Args:
+        path: Output file
+        minutes: Length of the video
+        pause_every: If set, a one-second silence every this many seconds
+            (speech-like pauses for the silence-aware chunker)
+    """
+    seconds = str(int(minutes * 60))
+    if pause_every:
+        audio = f"aevalsrc=sin(440*2*PI*t)*gt(mod(t\\,{pause_every})\\,1):s=44100:d={seconds}"
+    else:
+        audio = f"sine=frequency=440:sample_rate=44100:duration={seconds}"
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc=size=160x120:rate=5:duration={seconds}",
+        "-f", "lavfi", "-i", audio,
+        "-c:v", "libx264", "-preset", "ultrafast",
+        "-c:a", "aac", "-ac", "2",
+        path
+    ], check=True)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak /= 1024
+    return peak / 1024
+
+
+async def watch_loop(lags: list, stop: asyncio.Event, interval: float = 0.01):
+    """Record how late the loop wakes us up compared to the requested interval."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+def percentiles(values: List[float], scale: float = 1.0, digits: int = 3) -> Dict[str, float]:
+    """p50/p95/p99/max of values (nearest rank), multiplied by scale."""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+        return round(ordered[index] * scale, digits)
+
+    return {"p50": rank(50), "p95": rank(95), "p99": rank(99), "max": round(ordered[-1] * scale, digits)}
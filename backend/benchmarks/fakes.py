@@ -0,0 +1,148 @@
+"""
+Deterministic local stand-ins for the external services.
+
+They have configurable latency so benchmarks can model a real deployment
+without network access, API keys or model downloads.
+"""
+import json
+import time
+import asyncio
+import httpx
+
+from app.services.model_registry import ModelRegistry
+
+# An MPEG-1 Layer III frame header (128 kbps, 44.1 kHz) padded to frame size
+FAKE_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+class FakeTTSBackend:
+    """Sleeps in proportion to text length and returns fake MP3 frames."""
+
+    def __init__(self, seconds_per_kchar: float, base_latency: float = 0.2):
+        self.seconds_per_kchar = seconds_per_kchar
+        self.base_latency = base_latency
+        self.calls = 0
+
+    async def synthesize(self, text: str, voice: str) -> bytes:
+        self.calls += 1
+        await asyncio.sleep(self.base_latency + len(text) / 1000 * self.seconds_per_kchar)
+        return FAKE_FRAME * max(1, len(text) // 15)
+
+
+class FakeLLM:
+    """
+    OpenAI-compatible chat completions served from an httpx MockTransport.
+
+    Answers notes, quiz, narration and combined prompts with fixed, valid
+    responses, streamed as server-sent events when asked to. Latency is
+    base_latency plus the reply's tokens (estimated) divided by
+    tokens_per_second.
+    """
+
+    def __init__(self, base_latency: float = 0.3, tokens_per_second: float = 500):
+        self.base_latency = base_latency
+        self.tokens_per_second = tokens_per_second
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        payload = json.loads(request.content)
+        prompt = payload["messages"][-1]["content"]
+        answer = self.answer(prompt)
+        completion_tokens = len(answer) // 4
+        prompt_tokens = len(prompt) // 4
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+        if payload.get("stream"):
+            return httpx.Response(
+                200, headers={"content-type": "text/event-stream"}, content=self.events(answer, usage)
+            )
+
+        await asyncio.sleep(self.base_latency + completion_tokens / self.tokens_per_second)
+
+        return httpx.Response(200, json={
+            "choices": [{"message": {"role": "assistant", "content": answer}}],
+            "usage": usage
+        })
+
+    async def events(self, answer: str, usage: dict):
+        """Server-sent chunks of about 8 tokens at tokens_per_second."""
+        await asyncio.sleep(self.base_latency)
+        for i in range(0, len(answer), 32):
+            await asyncio.sleep(8 / self.tokens_per_second)
+            chunk = {"choices": [{"delta": {"content": answer[i:i + 32]}}]}
+            yield f"data: {json.dumps(chunk)}\n\n".encode()
+        yield f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n".encode()
+        yield b"data: [DONE]\n\n"
+
+    @classmethod
+    def answer(cls, prompt: str) -> str:
+        if '"narration"' in prompt:
+            return json.dumps({
+                "sections": cls.sections(), "narration": cls.narration(), "questions": cls.questions()
+            })
+        if '"questions"' in prompt:
+            return json.dumps({"questions": cls.questions()})
+        if '"sections"' in prompt:
+            return json.dumps({"sections": cls.sections()})
+        return cls.narration()
+
+    @staticmethod
+    def sections() -> list:
+        return [
+            {"title": f"Topic {i + 1}", "content": [f"Key point {j + 1} of topic {i + 1}." for j in range(4)]}
+            for i in range(4)
+        ]
+
+    @staticmethod
+    def questions(count: int = 5) -> list:
+        return [
+            {
+                "id": i + 1,
+                "question": f"Which statement about concept {i + 1} is correct?",
+                "options": [{"id": o, "text": f"Option {o}"} for o in "ABCD"],
+                "correct_answer": "A",
+                "explanation": "Option A restates the definition from the lecture."
+            }
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def narration() -> str:
+        return " ".join(
+            f"In part {i + 1} the lecture explains one of its central ideas in plain words."
+            for i in range(20)
+        )
+
+
+class FakeWhisperModel:
+    """Blocks for rtf seconds per second of audio, like Whisper on a CPU."""
+
+    def __init__(self, rtf: float):
+        self.rtf = rtf
+
+    def transcribe(self, audio, **options) -> dict:
+        seconds = len(audio) / 16000
+        time.sleep(seconds * self.rtf)
+        text = " This part of the lecture covers an important idea." * max(1, int(seconds / 5))
+        return {"text": text, "segments": [{"id": 0, "start": 0.0, "end": seconds, "text": text}]}
+
+
+class FakeModelRegistry(ModelRegistry):
+    """ModelRegistry that hands out FakeWhisperModels instead of loading Whisper."""
+
+    def __init__(self, rtf: float):
+        super().__init__()
+        self.rtf = rtf
+
+    def _load(self, name: str):
+        self._stats[name] = {
+            "load_seconds": 0.0, "warmup_seconds": 0.0, "memory_mb": 0.0, "last_used": time.time()
+        }
+        return FakeWhisperModel(self.rtf)
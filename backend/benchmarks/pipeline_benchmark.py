@@ -0,0 +1,326 @@
+"""
+End-to-end pipeline benchmark.
+
+Generates a synthetic lecture video with ffmpeg, starts the API on a local
+port and pushes --jobs uploads through the full pipeline at each
+--concurrency level. Groq and Edge-TTS are replaced by deterministic local
+stand-ins with configurable latency (see benchmarks/fakes.py); Whisper is
+faked too unless --whisper real is given.
+
+Reports per-stage p50/p95/p99 latency (time running and time waiting for a
+resource slot), time until the first note section is readable, end-to-end
+latency, jobs/minute, peak RSS and event-loop
+lag. Results are JSON, tagged with the current git commit, so runs can be
+compared between commits.
+
+With --batch, each level instead uploads --jobs lectures as one batch
+(POST /api/batch) with --concurrency as the batch scheduler's concurrency,
+and reports lectures/hour.
+
+Usage (from the backend folder):
+    python -m benchmarks.pipeline_benchmark --jobs 12 --concurrency 1,4 --output bench.json
+    python -m benchmarks.pipeline_benchmark --jobs 12 --concurrency 1,2,4 --batch
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import uvicorn
+
+from app.config import settings
+from app.api import routes
+from app.models import ProcessingStatus
+from app.services import (
+    AdmissionController,
+    AIGeneratorService,
+    BatchScheduler,
+    LLMClient,
+    MemoryTaskStore,
+    ResultCache,
+    StageGraph,
+    TranscriptionService,
+    TTSService
+)
+from main import app
+from benchmarks.common import make_video, peak_rss_mb, percentiles, watch_loop
+from benchmarks.fakes import FakeLLM, FakeModelRegistry, FakeTTSBackend
+
+FINISHED = (ProcessingStatus.COMPLETED.value, ProcessingStatus.FAILED.value)
+
+
+class RecordingStageGraph(StageGraph):
+    """StageGraph that keeps every finished graph for its timings."""
+
+    finished: list = []
+
+    async def run(self, on_change=None):
+        try:
+            return await super().run(on_change)
+        finally:
+            RecordingStageGraph.finished.append(self)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def install_fakes(args) -> FakeLLM:
+    """Point the API's services at local stand-ins and disable caching."""
+    llm = FakeLLM(base_latency=args.llm_latency, tokens_per_second=args.llm_tokens_per_second)
+    routes.ai_generator = AIGeneratorService(
+        client=LLMClient(api_key="benchmark", transport=llm.transport())
+    )
+    routes.tts_service = TTSService(
+        backend=FakeTTSBackend(args.tts_seconds_per_kchar),
+        phrase_cache=ResultCache(enabled=False)
+    )
+    routes.result_cache = ResultCache(enabled=False)
+    routes.tasks = MemoryTaskStore()
+    routes.StageGraph = RecordingStageGraph
+
+    # Every job gets its own client id; 429s are retried after Retry-After
+    if args.admission:
+        settings.admission_trust_proxy = True
+        routes.admission = AdmissionController()
+    else:
+        routes.admission = None
+
+    if args.whisper == "fake":
+        settings.transcription_workers = 0
+        routes.transcription_service = TranscriptionService()
+        routes.transcription_service.registry = FakeModelRegistry(args.whisper_rtf)
+    return llm
+
+
+async def run_level(client: httpx.AsyncClient, video_path: str, jobs: int, concurrency: int) -> dict:
+    RecordingStageGraph.finished = []
+    slots = asyncio.Semaphore(concurrency)
+    uploads, latencies, failed, rejected = [], [], 0, 0
+    first_notes = []  # Until the first note section is readable
+
+    async def one_job(number: int):
+        nonlocal failed, rejected
+        async with slots:
+            while True:
+                start = time.perf_counter()
+                with open(video_path, "rb") as f:
+                    response = await client.post(
+                        "/api/upload",
+                        files={"file": ("lecture.mp4", f, "video/mp4")},
+                        headers={"X-Forwarded-For": f"10.0.{number // 256}.{number % 256}"}
+                    )
+                if response.status_code != 429:
+                    break
+                rejected += 1
+                await asyncio.sleep(min(5.0, float(response.headers.get("retry-after", 1))))
+            uploads.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                failed += 1
+                return
+
+            task_id = response.json()["task_id"]
+            notes_seen = False
+            while True:
+                task = routes.tasks.get(task_id)
+                if task and task.get("notes") and not notes_seen:
+                    notes_seen = True
+                    first_notes.append(time.perf_counter() - start)
+                if task and task["status"] in FINISHED:
+                    break
+                await asyncio.sleep(0.05)
+            if task["status"] == ProcessingStatus.FAILED.value:
+                failed += 1
+                print(f"Job failed: {task['error']}", file=sys.stderr)
+            else:
+                latencies.append(time.perf_counter() - start)
+            routes.tasks.delete(task_id)
+
+    lags: list = []
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_loop(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(one_job(n) for n in range(jobs)))
+    wall = time.perf_counter() - start
+    stop.set()
+    await watcher
+
+    return {
+        "concurrency": concurrency,
+        "jobs": jobs,
+        "failed": failed,
+        "rejected_429": rejected,
+        "wall_s": round(wall, 3),
+        "jobs_per_minute": round((jobs - failed) * 60 / wall, 2),
+        "latency_s": {
+            "upload": percentiles(uploads),
+            "first_notes": percentiles(first_notes),
+            "end_to_end": percentiles(latencies)
+        },
+        "stages_s": stage_percentiles(),
+        "loop_lag_ms": percentiles(lags, scale=1000, digits=2),
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+
+def stage_percentiles() -> dict:
+    stages: dict = {}
+    for graph in RecordingStageGraph.finished:
+        for name, seconds in graph.timings.items():
+            stages.setdefault(name, {"run": [], "wait": []})["run"].append(seconds)
+        for name, seconds in graph.waits.items():
+            stages.setdefault(name, {"run": [], "wait": []})["wait"].append(seconds)
+    return {
+        name: {"run": percentiles(t["run"]), "wait": percentiles(t["wait"])}
+        for name, t in stages.items()
+    }
+
+
+async def run_batch_level(client: httpx.AsyncClient, video_path: str, jobs: int, concurrency: int) -> dict:
+    """Upload jobs lectures as one batch and follow it through GET /api/batch/{id}."""
+    RecordingStageGraph.finished = []
+    routes.batch_scheduler = BatchScheduler(concurrency)
+
+    lags: list = []
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_loop(lags, stop))
+    start = time.perf_counter()
+    response = await client.post("/api/batch", json={"total": jobs, "name": "benchmark"})
+    response.raise_for_status()
+    batch_id = response.json()["batch_id"]
+
+    for number in range(jobs):
+        with open(video_path, "rb") as f:
+            response = await client.post(
+                f"/api/batch/{batch_id}/upload",
+                files={"file": (f"lecture{number}.mp4", f, "video/mp4")}
+            )
+        response.raise_for_status()
+    uploaded = time.perf_counter() - start
+
+    while True:
+        status = (await client.get(f"/api/batch/{batch_id}")).json()
+        if status["finished"]:
+            break
+        await asyncio.sleep(0.1)
+    wall = time.perf_counter() - start
+    stop.set()
+    await watcher
+
+    for lecture in status["lectures"]:
+        if lecture["status"] == ProcessingStatus.FAILED.value:
+            print(f"Job failed: {lecture['error']}", file=sys.stderr)
+        routes.tasks.delete(lecture["task_id"])
+    routes.tasks.delete(batch_id)
+
+    return {
+        "batch_concurrency": concurrency,
+        "jobs": jobs,
+        "failed": status["failed"],
+        "upload_s": round(uploaded, 3),
+        "wall_s": round(wall, 3),
+        "lectures_per_hour": round(status["completed"] * 3600 / wall, 1),
+        "stages_s": stage_percentiles(),
+        "loop_lag_ms": percentiles(lags, scale=1000, digits=2),
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+
+async def run(args) -> dict:
+    levels = [int(n) for n in args.concurrency.split(",")]
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.upload_dir = routes.upload_service.upload_dir = os.path.join(tmp, "uploads")
+        settings.output_dir = os.path.join(tmp, "outputs")
+        os.makedirs(settings.upload_dir)
+        os.makedirs(settings.output_dir)
+        routes.video_processor.output_dir = settings.output_dir
+
+        llm = install_fakes(args)
+        routes.tts_service.output_dir = settings.output_dir
+        routes.transcription_service.start()
+
+        video_path = os.path.join(tmp, "lecture.mp4")
+        make_video(video_path, args.minutes, pause_every=10)
+
+        config = uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning", lifespan="off")
+        server = uvicorn.Server(config)
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", timeout=None) as client:
+                run_one = run_batch_level if args.batch else run_level
+                results = [await run_one(client, video_path, args.jobs, n) for n in levels]
+        finally:
+            server.should_exit = True
+            await serving
+            await routes.transcription_service.shutdown()
+            await routes.ai_generator.close()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": int(time.time()),
+        "config": {
+            "video_minutes": args.minutes,
+            "whisper": args.whisper,
+            "whisper_rtf": args.whisper_rtf if args.whisper == "fake" else None,
+            "llm_latency_s": args.llm_latency,
+            "llm_tokens_per_second": args.llm_tokens_per_second,
+            "tts_seconds_per_kchar": args.tts_seconds_per_kchar,
+            "stream_audio": settings.stream_audio,
+            "llm_combined_generation": settings.llm_combined_generation,
+            "llm_stream": settings.llm_stream,
+            "batch": args.batch,
+            "chunked_transcription": settings.chunked_transcription
+        },
+        "llm": {
+            "calls": llm.calls,
+            "prompt_tokens": llm.prompt_tokens,
+            "completion_tokens": llm.completion_tokens
+        },
+        "admission": routes.admission.stats() if routes.admission else None,
+        "levels": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=8, help="Uploads per concurrency level")
+    parser.add_argument("--concurrency", default="1,4", help="Comma-separated uploads in flight")
+    parser.add_argument("--minutes", type=float, default=2.0, help="Synthetic lecture length")
+    parser.add_argument("--whisper", choices=["fake", "real"], default="fake")
+    parser.add_argument("--whisper-rtf", type=float, default=0.05)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=250)
+    parser.add_argument("--tts-seconds-per-kchar", type=float, default=0.5)
+    parser.add_argument("--admission", action="store_true",
+                        help="Keep admission control on (ADMISSION_* settings)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Upload each level as one batch; --concurrency is the batch concurrency")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Status polling vs. Server-Sent Events load test.
+
+Starts the API on a local port, walks a fake task through every processing
+status, and watches it with N polling clients (GET /api/status every
+--poll-interval seconds, like the frontend) and N SSE clients. Reports how
+many HTTP requests each approach needed and how quickly clients saw each
+change.
+
+Usage (from the backend folder):
+    python -m benchmarks.status_stream_benchmark --clients 200 --duration 60
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import uvicorn
+
+from app.api import routes
+from app.models import ProcessingStatus
+from main import app
+
+STEPS = [
+    ProcessingStatus.EXTRACTING_AUDIO,
+    ProcessingStatus.TRANSCRIBING,
+    ProcessingStatus.GENERATING_NOTES,
+    ProcessingStatus.CREATING_VOICE,
+    ProcessingStatus.BUILDING_QUIZ,
+    ProcessingStatus.COMPLETED
+]
+
+FINISHED = (ProcessingStatus.COMPLETED.value, ProcessingStatus.FAILED.value)
+
+
+async def drive_task(task_id: str, duration: float, changes: dict):
+    """Move the fake task through every status over the run."""
+    for i, status in enumerate(STEPS):
+        await asyncio.sleep(duration / len(STEPS))
+        changes[status.value] = time.perf_counter()
+        routes.tasks.update(task_id, status=status, progress=int((i + 1) * 100 / len(STEPS)))
+
+
+async def poller(client: httpx.AsyncClient, task_id: str, interval: float, seen: dict) -> int:
+    requests = 0
+    while True:
+        response = await client.get(f"/api/status/{task_id}")
+        requests += 1
+        status = response.json()["status"]
+        seen.setdefault(status, time.perf_counter())
+        if status in FINISHED:
+            return requests
+        await asyncio.sleep(interval)
+
+
+async def subscriber(client: httpx.AsyncClient, task_id: str, seen: dict) -> int:
+    async with client.stream("GET", f"/api/status/{task_id}/stream") as response:
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                status = json.loads(line[6:])["status"]
+                seen.setdefault(status, time.perf_counter())
+    return 1
+
+
+def _lag_ms(changes: dict, seen_by_client: list) -> float:
+    lags = [
+        seen[status] - changes[status]
+        for seen in seen_by_client
+        for status in changes
+        if status in seen
+    ]
+    return round(sum(lags) / len(lags) * 1000, 1) if lags else 0.0
+
+
+async def run_mode(mode: str, clients: int, duration: float, interval: float, port: int) -> dict:
+    task_id = f"bench-{mode}"
+    routes.tasks.create(task_id, {
+        "status": ProcessingStatus.PENDING,
+        "progress": 0,
+        "current_step": "Queued for processing...",
+        "audio_path": None
+    })
+
+    changes: dict = {}
+    seen_by_client = [{} for _ in range(clients)]
+    limits = httpx.Limits(max_connections=clients + 10)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=None) as client:
+        start = time.perf_counter()
+        driver = asyncio.create_task(drive_task(task_id, duration, changes))
+        if mode == "poll":
+            watchers = [poller(client, task_id, interval, seen) for seen in seen_by_client]
+        else:
+            watchers = [subscriber(client, task_id, seen) for seen in seen_by_client]
+        requests = sum(await asyncio.gather(*watchers))
+        await driver
+        elapsed = time.perf_counter() - start
+
+    routes.tasks.delete(task_id)
+    return {
+        "mode": mode,
+        "clients": clients,
+        "requests": requests,
+        "requests_per_minute": round(requests * 60 / elapsed, 1),
+        "mean_update_lag_ms": _lag_ms(changes, seen_by_client)
+    }
+
+
+async def run(clients: int, duration: float, interval: float, port: int) -> dict:
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off")
+    server = uvicorn.Server(config)
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    try:
+        poll = await run_mode("poll", clients, duration, interval, port)
+        sse = await run_mode("sse", clients, duration, interval, port)
+    finally:
+        server.should_exit = True
+        await serving
+
+    return {
+        "poll": poll,
+        "sse": sse,
+        "request_reduction": round(1 - sse["requests"] / poll["requests"], 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.clients, args.duration, args.poll_interval, args.port))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+TTS benchmark: one-shot vs. parallel sentence-chunked synthesis.
+
+Uses a local fake TTS backend whose latency grows with text length (like a
+real TTS service), so it runs without network access. Reports total time
+and time to the first streamable audio for different concurrency limits,
+and for a second lecture that shares most sentences with the first one
+(phrase cache cold vs. warm).
+
+Usage (from the backend folder):
+    python -m benchmarks.tts_benchmark --sentences 60 --seconds-per-kchar 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.services import TTSService, ResultCache
+from benchmarks.fakes import FakeTTSBackend
+
+
+def make_narration(sentences: int, lecture: int = 0, new_every: int = 5) -> str:
+    """Sentences shared between lectures, with every new_every-th one unique."""
+    return " ".join(
+        f"Sentence {i} explains one of the key ideas from "
+        f"{f'lecture {lecture}' if i % new_every == 0 else 'the course'} in plain words."
+        for i in range(sentences)
+    )
+
+
+async def time_render(
+    text: str,
+    concurrency: int,
+    chunk_chars: int,
+    seconds_per_kchar: float,
+    phrase_cache: ResultCache = None,
+    label: str = "chunked"
+) -> dict:
+    settings.tts_max_concurrency = concurrency
+    settings.tts_chunk_chars = chunk_chars
+    backend = FakeTTSBackend(seconds_per_kchar)
+    service = TTSService(backend=backend, phrase_cache=phrase_cache or ResultCache(enabled=False))
+    task_id = f"bench_{label}_{concurrency}_{chunk_chars}"
+
+    start = time.perf_counter()
+    render = asyncio.create_task(service.generate_audio(text, task_id))
+    await asyncio.sleep(0)
+
+    first_byte = None
+    async for _ in service.stream(task_id):
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+    path = await render
+    total = time.perf_counter() - start
+
+    size = os.path.getsize(path)
+    os.remove(path)
+    return {
+        "mode": label,
+        "concurrency": concurrency,
+        "chunk_chars": chunk_chars,
+        "requests": backend.calls,
+        "first_audio_s": round(first_byte if first_byte is not None else total, 3),
+        "total_s": round(total, 3),
+        "file_kb": round(size / 1024, 1)
+    }
+
+
+async def run(sentences: int, seconds_per_kchar: float) -> dict:
+    text = make_narration(sentences)
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.output_dir = tmp
+        results = [
+            # Whole narration in one request, as before chunking
+            await time_render(text, 1, len(text) * 2, seconds_per_kchar, label="one-shot"),
+            await time_render(text, 1, 400, seconds_per_kchar),
+            await time_render(text, 4, 400, seconds_per_kchar),
+            await time_render(text, 8, 400, seconds_per_kchar),
+        ]
+
+        # Two lectures from the same course, sharing most sentences
+        phrases = ResultCache(cache_dir=os.path.join(tmp, "phrases"), max_size_mb=64, enabled=True)
+        results.append(await time_render(text, 4, 400, seconds_per_kchar, phrases, "phrases-cold"))
+        second = make_narration(sentences, lecture=1)
+        results.append(await time_render(second, 4, 400, seconds_per_kchar, phrases, "phrases-warm"))
+
+    return {"narration_chars": len(text), "runs": results, "phrase_cache": phrases.stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=60)
+    parser.add_argument("--seconds-per-kchar", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.sentences, args.seconds_per_kchar)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
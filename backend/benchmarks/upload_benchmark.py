@@ -0,0 +1,89 @@
+"""
+Upload ingest benchmark.
+
+Sends N concurrent uploads of a synthetic video file through POST /api/upload
+in-process and reports peak RSS and event-loop latency while they stream.
+
+Usage (from the backend folder):
+    python -m benchmarks.upload_benchmark --uploads 10 --size-mb 400
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.config import settings
+from app.api import routes
+from main import app
+from benchmarks.common import peak_rss_mb, watch_loop
+
+
+async def _noop_pipeline(task_id: str, video_path: str):
+    """Skip processing so only the ingest path is measured."""
+    os.remove(video_path)
+
+
+async def run(uploads: int, size_mb: int) -> dict:
+    settings.max_file_size_mb = max(settings.max_file_size_mb, size_mb + 1)
+    routes.upload_service.max_bytes = settings.max_file_size_mb * 1024 * 1024
+    routes.process_video_task = _noop_pipeline
+    routes.admission = None  # Measure ingest, not upload quotas
+
+    # Sparse file so generating the input doesn't dominate the run
+    source = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
+    source.truncate(size_mb * 1024 * 1024)
+    source.close()
+
+    lags: list = []
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_loop(lags, stop))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        async def upload_one():
+            with open(source.name, "rb") as f:
+                response = await client.post(
+                    "/api/upload",
+                    files={"file": ("lecture.mp4", f, "video/mp4")}
+                )
+            response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(upload_one() for _ in range(uploads)))
+        elapsed = time.perf_counter() - start
+
+    stop.set()
+    await watcher
+    os.remove(source.name)
+
+    lags.sort()
+    return {
+        "uploads": uploads,
+        "size_mb": size_mb,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_mb_s": round(uploads * size_mb / elapsed, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "loop_lag_p50_ms": round(lags[len(lags) // 2] * 1000, 2) if lags else 0.0,
+        "loop_lag_max_ms": round(lags[-1] * 1000, 2) if lags else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=10)
+    parser.add_argument("--size-mb", type=int, default=400)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.uploads, args.size_mb)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
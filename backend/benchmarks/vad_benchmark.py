@@ -0,0 +1,117 @@
+"""
+VAD benchmark: transcription time with and without the silence pre-pass.
+
+Builds a synthetic lecture of speech-like sound (amplitude-modulated voiced
+tone plus noise) broken up by pauses, setup time and a long break over a
+quiet noise floor, or uses a real 16 kHz recording given with --audio.
+Reports how much audio the detector skips, how much known speech it keeps
+(synthetic audio only), its own speed, and transcription wall time with a
+fake CPU Whisper (--whisper-rtf seconds per audio second) with VAD off and
+on.
+
+Usage (from the backend folder):
+    python -m benchmarks.vad_benchmark --minutes 20 --whisper-rtf 0.05
+    python -m benchmarks.vad_benchmark --audio lecture.wav
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.config import settings
+from app.services import TranscriptionService
+from app.services.audio_io import load_audio
+from app.services.vad import SAMPLE_RATE, SpeechDetector
+from benchmarks.fakes import FakeModelRegistry
+
+
+def make_lecture(minutes: float, seed: int = 0):
+    """
+    Speech-like audio with classroom-style gaps.
+
+    Returns:
+        (samples, speech mask) where the mask marks the synthetic speech
+    """
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    audio = (0.003 * rng.standard_normal(total)).astype(np.float32)
+    mask = np.zeros(total, dtype=bool)
+
+    # Setup time before the lecture starts and a break halfway through
+    position = int(min(300, minutes * 60 * 0.1) * SAMPLE_RATE)
+    break_at = total // 2
+    while position < total:
+        length = int(rng.uniform(5, 40) * SAMPLE_RATE)
+        end = min(total, position + length)
+        t = np.arange(end - position) / SAMPLE_RATE
+        envelope = (0.5 + 0.5 * np.sin(2 * np.pi * rng.uniform(3, 5) * t)) ** 2
+        voice = np.sin(2 * np.pi * rng.uniform(100, 220) * t) + 0.4 * rng.standard_normal(len(t))
+        audio[position:end] += (0.15 * envelope * voice).astype(np.float32)
+        mask[position:end] = True
+
+        pause = rng.choice([0.5, 1.0, 3.0, 8.0], p=[0.4, 0.3, 0.2, 0.1])
+        position = end + int(pause * SAMPLE_RATE)
+        if position >= break_at > end - length:
+            position += int(min(600, minutes * 60 * 0.15) * SAMPLE_RATE)
+    return audio, mask
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=20.0, help="Synthetic lecture length")
+    parser.add_argument("--audio", help="Use this recording instead of synthetic audio")
+    parser.add_argument("--whisper-rtf", type=float, default=0.05)
+    args = parser.parse_args()
+
+    if args.audio:
+        audio, mask = np.asarray(load_audio(args.audio), dtype=np.float32), None
+    else:
+        audio, mask = make_lecture(args.minutes)
+    seconds = len(audio) / SAMPLE_RATE
+
+    detector = SpeechDetector()
+    start = time.perf_counter()
+    regions = detector.detect(audio)
+    detect_seconds = time.perf_counter() - start
+    kept = np.zeros(len(audio), dtype=bool)
+    for region_start, region_end in regions:
+        kept[region_start:region_end] = True
+
+    settings.transcription_workers = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lecture.f32")
+        audio.tofile(path)
+
+        timings = {}
+        for vad in (False, True):
+            settings.vad_enabled = vad
+            service = TranscriptionService()
+            service.registry = FakeModelRegistry(args.whisper_rtf)
+            start = time.perf_counter()
+            asyncio.run(service.transcribe(path, model="base"))
+            timings["vad" if vad else "no_vad"] = round(time.perf_counter() - start, 3)
+
+    result = {
+        "audio_s": round(seconds, 1),
+        "speech_regions": len(regions),
+        "skipped_fraction": round(1 - kept.mean(), 3),
+        "detect_s": round(detect_seconds, 3),
+        "detect_x_realtime": round(seconds / detect_seconds, 1),
+        "transcription_s": timings,
+        "speedup": round(timings["no_vad"] / timings["vad"], 2)
+    }
+    if mask is not None:
+        result["speech_fraction"] = round(mask.mean(), 3)
+        result["speech_recall"] = round(kept[mask].mean(), 4)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Whisper backend benchmark: real-time factor and word error rate.
+
+Transcribes a fixed local corpus with each configuration and compares the
+output with reference transcripts. The corpus is a directory of 16 kHz
+compatible audio files (wav, mp3, flac, f32, ...), each with a reference
+transcript next to it under the same name with a .txt extension, e.g.
+LibriSpeech test-clean utterances or a few of your own lectures.
+
+A configuration is backend:model:compute_type, e.g.
+    openai:base:float32  openai:base:int8  faster:base:int8  faster:small:int8
+
+Reports per configuration: load time, model memory, total audio and
+transcription seconds, real-time factor (processing seconds per audio
+second, lower is faster) and corpus WER.
+
+Usage (from the backend folder):
+    python -m benchmarks.whisper_benchmark --corpus corpus/ \\
+        --configs openai:base:float32,openai:base:int8,faster:base:int8 --beam-size 1
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.config import settings
+from app.services.audio_io import SAMPLE_RATE, load_audio
+from app.services.whisper_backends import inference_threads, load_model
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def normalize(text: str) -> list:
+    return _WORD.findall(text.lower())
+
+
+def edit_distance(reference: list, hypothesis: list) -> int:
+    """Word-level Levenshtein distance, one NumPy row at a time."""
+    if not reference:
+        return len(hypothesis)
+    offsets = np.arange(len(reference) + 1)
+    row = offsets.copy()
+    reference = np.array(reference, dtype=object)
+    for i, word in enumerate(hypothesis, start=1):
+        substitution = row[:-1] + (reference != word)
+        deletion = row[1:] + 1
+        candidates = np.concatenate(([i], np.minimum(substitution, deletion)))
+        # Insertions chain along the row: new[j] = min(candidates[j], new[j-1] + 1)
+        row = np.minimum.accumulate(candidates - offsets) + offsets
+    return int(row[-1])
+
+
+def load_corpus(path: str) -> list:
+    clips = []
+    for name in sorted(os.listdir(path)):
+        stem, ext = os.path.splitext(name)
+        reference = os.path.join(path, stem + ".txt")
+        if ext != ".txt" and os.path.exists(reference):
+            with open(reference) as f:
+                clips.append((os.path.join(path, name), f.read()))
+    if not clips:
+        raise SystemExit(f"No audio files with .txt references found in {path}")
+    return clips
+
+
+def run_config(config: str, clips: list) -> dict:
+    backend, model_name, compute_type = config.split(":")
+    settings.whisper_backend = backend
+    settings.whisper_compute_type = compute_type
+    result = {"config": config}
+
+    try:
+        start = time.perf_counter()
+        model = load_model(model_name)
+        result["load_s"] = round(time.perf_counter() - start, 3)
+    except (ImportError, ValueError, RuntimeError, OSError) as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    result["memory_mb"] = round(model.memory_bytes / (1024 * 1024), 1)
+    options = {"language": settings.whisper_language or None, "task": "transcribe"}
+    model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), **options)
+
+    audio_seconds = elapsed = 0.0
+    errors = words = 0
+    for path, reference in clips:
+        audio = np.asarray(load_audio(path), dtype=np.float32)
+        start = time.perf_counter()
+        text = model.transcribe(audio, **options)["text"]
+        elapsed += time.perf_counter() - start
+        audio_seconds += len(audio) / SAMPLE_RATE
+
+        expected = normalize(reference)
+        errors += edit_distance(expected, normalize(text))
+        words += len(expected)
+
+    result.update({
+        "audio_s": round(audio_seconds, 1),
+        "transcribe_s": round(elapsed, 3),
+        "rtf": round(elapsed / audio_seconds, 4),
+        "wer": round(errors / max(1, words), 4)
+    })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", required=True, help="Directory of audio files with .txt references")
+    parser.add_argument(
+        "--configs", default="openai:base:float32,openai:base:int8,faster:base:int8",
+        help="Comma-separated backend:model:compute_type"
+    )
+    parser.add_argument("--beam-size", type=int, default=settings.whisper_beam_size)
+    parser.add_argument("--threads", type=int, default=settings.whisper_threads, help="0 = all cores")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    settings.whisper_beam_size = args.beam_size
+    settings.whisper_threads = args.threads
+    settings.transcription_workers = 1  # One process owns every core here
+    clips = load_corpus(args.corpus)
+
+    output = json.dumps({
+        "clips": len(clips),
+        "beam_size": args.beam_size,
+        "threads": inference_threads(),
+        "results": [run_config(config, clips) for config in args.configs.split(",")]
+    }, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
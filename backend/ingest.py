@@ -0,0 +1,143 @@
+"""
+Batch lecture ingestion client.
+
+Uploads every lecture video of a course to a running API as one batch,
+follows its aggregate progress and prints the throughput when done.
+Arguments are video files and/or directories (searched recursively for
+.mp4, .avi, .mov and .mkv, in name order).
+
+    python ingest.py lectures/ --name "Linear Algebra" --server http://localhost:8000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import httpx
+
+CONTENT_TYPES = {
+    ".mp4": "video/mp4",
+    ".avi": "video/avi",
+    ".mov": "video/mov",
+    ".mkv": "video/x-matroska"
+}
+
+
+class IngestError(Exception):
+    pass
+
+
+def collect_videos(paths: list) -> list:
+    """Video files named in paths, with directories expanded."""
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in sorted(os.walk(path)):
+                videos += [
+                    os.path.join(root, name) for name in sorted(names)
+                    if os.path.splitext(name)[1].lower() in CONTENT_TYPES
+                ]
+        elif os.path.splitext(path)[1].lower() in CONTENT_TYPES:
+            videos.append(path)
+        else:
+            raise SystemExit(f"Not a directory or a supported video file: {path}")
+    return videos
+
+
+async def post(client: httpx.AsyncClient, url: str, **kwargs) -> dict:
+    """POST, waiting out 429 responses as Retry-After asks."""
+    while True:
+        response = await client.post(url, **kwargs)
+        if response.status_code != 429:
+            break
+        wait = float(response.headers.get("retry-after", 5))
+        print(f"Server is busy, retrying in {wait:.0f}s...", file=sys.stderr)
+        await asyncio.sleep(wait)
+    if response.status_code != 200:
+        raise IngestError(f"{url} failed ({response.status_code}): {response.text}")
+    return response.json()
+
+
+async def upload(client: httpx.AsyncClient, batch_id: str, path: str, slots: asyncio.Semaphore) -> str:
+    async with slots:
+        content_type = CONTENT_TYPES[os.path.splitext(path)[1].lower()]
+        with open(path, "rb") as f:
+            result = await post(
+                client,
+                f"/api/batch/{batch_id}/upload",
+                files={"file": (os.path.basename(path), f, content_type)}
+            )
+        print(f"Uploaded {path}")
+        return result["task_id"]
+
+
+async def run(args) -> dict:
+    videos = collect_videos(args.paths)
+    if not videos:
+        raise SystemExit("No lecture videos found")
+
+    async with httpx.AsyncClient(base_url=args.server, timeout=None) as client:
+        batch = await post(client, "/api/batch", json={"total": len(videos), "name": args.name})
+        batch_id = batch["batch_id"]
+        print(f"Batch {batch_id}: {len(videos)} lectures")
+
+        # Lectures start processing as soon as they are uploaded
+        slots = asyncio.Semaphore(args.parallel_uploads)
+        uploads = asyncio.gather(*(upload(client, batch_id, path, slots) for path in videos))
+
+        last = None
+        while True:
+            await asyncio.sleep(args.poll_seconds)
+            response = await client.get(f"/api/batch/{batch_id}")
+            response.raise_for_status()
+            status = response.json()
+            line = (
+                f"{status['progress']:3d}% | {status['completed']} done, {status['failed']} failed, "
+                f"{status['running']} running, {status['pending']} queued, "
+                f"{status['total'] - status['uploaded']} to upload"
+            )
+            if line != last:
+                last = line
+                print(line)
+            if status["finished"]:
+                break
+            if uploads.done() and uploads.exception():
+                raise uploads.exception()
+        await uploads
+
+    for lecture in status["lectures"]:
+        if lecture["status"] == "failed":
+            print(f"Failed: {lecture['filename']}: {lecture['error']}", file=sys.stderr)
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="Video files and/or directories of them")
+    parser.add_argument("--name", help="Batch name, e.g. the course title")
+    parser.add_argument("--server", default="http://localhost:8000")
+    parser.add_argument("--parallel-uploads", type=int, default=2)
+    parser.add_argument("--poll-seconds", type=float, default=5.0)
+    parser.add_argument("--output", help="Write the final batch status as JSON to this file")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        status = asyncio.run(run(args))
+    except (IngestError, httpx.HTTPError) as e:
+        raise SystemExit(f"Batch ingestion failed: {e}")
+    elapsed = time.perf_counter() - started
+    print(
+        f"{status['completed']}/{status['total']} lectures processed in {elapsed / 60:.1f} min "
+        f"({status['lectures_per_hour'] or 0:.1f} lectures/hour)"
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(json.dumps(status, indent=2) + "\n")
+    sys.exit(1 if status["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
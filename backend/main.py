@@ -1,15 +1,66 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from app.api.routes import router
+from app.api.routes import (
+    router,
+    transcription_service,
+    ai_generator,
+    expire_tasks,
+    recover_interrupted_tasks
+)
+from app.api.admission import AdmissionMiddleware
+from app.api.upload_limit import UploadLimitMiddleware
 from app.config import settings
+from app.services import metrics
+
+metrics.configure_logging()
+
+
+async def expire_tasks_periodically():
+    while True:
+        await asyncio.sleep(settings.task_expiry_interval_seconds)
+        try:
+            expired = expire_tasks()
+            if expired:
+                print(f"Expired {expired} finished task(s)")
+        except Exception as e:
+            print(f"Task expiry failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start worker pools on startup, drain them on shutdown. With the job
+    # queue on, transcription happens in worker.py processes instead.
+    if not settings.job_queue_enabled:
+        recovered = recover_interrupted_tasks()
+        if recovered:
+            print(f"Marked {recovered} interrupted task(s) as failed")
+        transcription_service.start()
+    expiry = asyncio.create_task(expire_tasks_periodically())
+    yield
+    expiry.cancel()
+    await transcription_service.shutdown()
+    await ai_generator.close()
+
 
 app = FastAPI(
     title=settings.app_name,
     description="AI-powered video lecture to study materials converter",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Stop oversized uploads as soon as they cross max_file_size_mb
+app.add_middleware(UploadLimitMiddleware)
+
+# Reject uploads over quota before their body is read (inside CORS, so
+# 429 responses still carry CORS headers)
+app.add_middleware(AdmissionMiddleware)
+
 # CORS configuration - allow frontend to communicate
 app.add_middleware(
     CORSMiddleware,
@@ -45,6 +96,14 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Pipeline, Whisper, LLM, TTS and ffmpeg metrics in Prometheus format."""
+    return PlainTextResponse(
+        metrics.registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
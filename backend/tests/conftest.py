@@ -0,0 +1,19 @@
+import os
+import sys
+import tempfile
+
+# Run from anywhere: make the backend's "app" package importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep databases, caches, uploads and outputs out of the working tree
+_state_dir = tempfile.mkdtemp(prefix="cramai-tests-")
+for _name, _value in {
+    "UPLOAD_DIR": "uploads",
+    "OUTPUT_DIR": "outputs",
+    "CACHE_DIR": "cache",
+    "TTS_PHRASE_CACHE_DIR": "phrase_cache",
+    "TASK_DB_PATH": "tasks.db",
+    "JOB_DB_PATH": "jobs.db",
+    "DEDUP_DB_PATH": "dedup.db"
+}.items():
+    os.environ.setdefault(_name, os.path.join(_state_dir, _value))
@@ -0,0 +1,194 @@
+"""LLMClient retries, timeouts, concurrency and streaming, over httpx.MockTransport (no network)."""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services.llm_client import LLMClient, LLMError
+
+_sleep = asyncio.sleep
+
+
+def reply(text: str) -> httpx.Response:
+    return httpx.Response(200, json={
+        "choices": [{"message": {"role": "assistant", "content": text}}],
+        "usage": {"prompt_tokens": 3, "completion_tokens": 2}
+    })
+
+
+def events(*pieces, fail_after: bool = False):
+    """Server-sent chat completion chunks, optionally cut off after the last piece."""
+    async def stream():
+        for piece in pieces:
+            yield f"data: {json.dumps({'choices': [{'delta': {'content': piece}}]})}\n\n".encode()
+        if fail_after:
+            raise httpx.ReadError("connection reset")
+        yield b"data: [DONE]\n\n"
+
+    return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=stream())
+
+
+class FakeAPI:
+    """Plays back one response (or exception) per request, then repeats the last."""
+
+    def __init__(self, *responses, latency: float = 0):
+        self.responses = list(responses)
+        self.latency = latency
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await _sleep(self.latency)
+            response = self.responses[min(len(self.requests), len(self.responses)) - 1]
+            if isinstance(response, Exception):
+                raise response
+            return response
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def backoffs(monkeypatch):
+    """Record retry delays instead of sleeping through them."""
+    delays = []
+
+    async def sleep(seconds):
+        delays.append(seconds)
+        await _sleep(0)
+
+    monkeypatch.setattr(settings, "llm_max_retries", 3)
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    return delays
+
+
+def run(client: LLMClient, call):
+    async def main():
+        try:
+            return await call()
+        finally:
+            await client.close()
+
+    return asyncio.run(main())
+
+
+def collect(client: LLMClient, prompt: str = "hi"):
+    async def call():
+        return [piece async for piece in client.stream(prompt)]
+
+    return run(client, call)
+
+
+def test_retries_5xx_and_429_with_jittered_backoff(backoffs):
+    api = FakeAPI(httpx.Response(503), httpx.Response(429), httpx.Response(502), reply("done"))
+    client = LLMClient(api_key="test", transport=api.transport())
+
+    assert run(client, lambda: client.complete("hi")) == "done"
+
+    assert len(api.requests) == 4
+    assert len(backoffs) == 3
+    # Full jitter: anywhere up to 0.5s, 1s, 2s
+    assert all(0 <= delay <= 0.5 * 2 ** attempt for attempt, delay in enumerate(backoffs))
+
+
+def test_retry_after_is_honoured(backoffs):
+    api = FakeAPI(httpx.Response(429, headers={"retry-after": "7"}), reply("done"))
+    client = LLMClient(api_key="test", transport=api.transport())
+
+    assert run(client, lambda: client.complete("hi")) == "done"
+
+    assert backoffs == [7.0]
+
+
+def test_gives_up_after_max_retries(backoffs):
+    api = FakeAPI(httpx.Response(500))
+    client = LLMClient(api_key="test", transport=api.transport())
+
+    with pytest.raises(LLMError, match="after 4 attempts"):
+        run(client, lambda: client.complete("hi"))
+
+    assert len(api.requests) == 4
+
+
+def test_client_errors_are_not_retried(backoffs):
+    api = FakeAPI(httpx.Response(400, text="bad request"), reply("done"))
+    client = LLMClient(api_key="test", transport=api.transport())
+
+    with pytest.raises(LLMError, match="400"):
+        run(client, lambda: client.complete("hi"))
+
+    assert len(api.requests) == 1
+    assert backoffs == []
+
+
+def test_timeouts_are_retried(backoffs, monkeypatch):
+    monkeypatch.setattr(settings, "llm_timeout_seconds", 12.5)
+    api = FakeAPI(httpx.ReadTimeout("slow"), httpx.ConnectTimeout("slow"), reply("done"))
+    client = LLMClient(api_key="test", transport=api.transport())
+
+    assert run(client, lambda: client.complete("hi")) == "done"
+
+    assert len(api.requests) == 3
+    assert api.requests[0].extensions["timeout"]["read"] == 12.5
+
+
+def test_timeouts_fail_after_max_retries(backoffs):
+    api = FakeAPI(httpx.ReadTimeout("slow"))
+    client = LLMClient(api_key="test", transport=api.transport())
+
+    with pytest.raises(LLMError, match="ReadTimeout"):
+        run(client, lambda: client.complete("hi"))
+
+
+def test_concurrent_requests_are_capped(monkeypatch):
+    monkeypatch.setattr(settings, "llm_max_concurrency", 2)
+    api = FakeAPI(reply("done"), latency=0.02)
+    client = LLMClient(api_key="test", transport=api.transport())
+
+    async def call():
+        return await asyncio.gather(*(client.complete(f"prompt {i}") for i in range(6)))
+
+    assert run(client, call) == ["done"] * 6
+    assert api.peak == 2
+
+
+def test_stream_yields_pieces_in_order(backoffs):
+    api = FakeAPI(events("Hello", ", ", "world"))
+    client = LLMClient(api_key="test", transport=api.transport())
+
+    assert collect(client) == ["Hello", ", ", "world"]
+    assert json.loads(api.requests[0].content)["stream"] is True
+
+
+def test_stream_retries_before_first_piece(backoffs):
+    api = FakeAPI(httpx.Response(503), httpx.ReadTimeout("slow"), events("Hello"))
+    client = LLMClient(api_key="test", transport=api.transport())
+
+    assert collect(client) == ["Hello"]
+    assert len(api.requests) == 3
+    assert len(backoffs) == 2
+
+
+def test_stream_is_not_replayed_after_first_piece(backoffs):
+    api = FakeAPI(events("Hello", fail_after=True), events("Hello", "world"))
+    client = LLMClient(api_key="test", transport=api.transport())
+    received = []
+
+    async def call():
+        async for piece in client.stream("hi"):
+            received.append(piece)
+
+    with pytest.raises(LLMError, match="interrupted"):
+        run(client, call)
+
+    assert received == ["Hello"]
+    assert len(api.requests) == 1
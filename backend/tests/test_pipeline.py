@@ -0,0 +1,71 @@
+"""process_video_task end to end with local stand-ins for ffmpeg, Groq and Edge-TTS."""
+import asyncio
+
+import pytest
+
+from app.api import routes
+from app.config import settings
+from app.models import ProcessingStatus
+from app.services import (
+    AIGeneratorService,
+    LLMClient,
+    ResultCache,
+    SQLiteTaskStore,
+    TTSService
+)
+from benchmarks.fakes import FakeLLM, FakeTTSBackend
+
+TRANSCRIPT = " ".join(f"Today we cover topic number {i} in some detail." for i in range(20))
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    """Route services pointed at fakes, with a SQLite task store and a real result cache."""
+    monkeypatch.setattr(settings, "output_dir", str(tmp_path))
+    monkeypatch.setattr(routes, "tasks", SQLiteTaskStore(str(tmp_path / "tasks.db")))
+    monkeypatch.setattr(routes, "result_cache", ResultCache(cache_dir=str(tmp_path / "cache"), enabled=True))
+    monkeypatch.setattr(routes, "transcript_index", None)
+    monkeypatch.setattr(routes, "ai_generator", AIGeneratorService(
+        client=LLMClient(api_key="test", transport=FakeLLM(base_latency=0, tokens_per_second=1e6).transport())
+    ))
+    tts = TTSService(backend=FakeTTSBackend(0, base_latency=0), phrase_cache=ResultCache(enabled=False))
+    tts.output_dir = str(tmp_path)
+    monkeypatch.setattr(routes, "tts_service", tts)
+
+    async def no_duration(video_path):
+        raise RuntimeError("no ffprobe in tests")
+
+    monkeypatch.setattr(routes.video_processor, "get_video_duration", no_duration)
+    return routes
+
+
+def test_transcript_cache_hit_completes_on_sqlite_store(pipeline, tmp_path):
+    # A re-upload: the transcript for these bytes is already cached
+    keys = pipeline.result_cache.stage_keys("hash", settings.whisper_model)
+    pipeline.result_cache.put(keys["transcript"], TRANSCRIPT)
+    pipeline.tasks.create("task", {
+        "status": ProcessingStatus.PENDING,
+        "progress": 0,
+        "current_step": "Queued for processing...",
+        "transcript": None,
+        "notes": None,
+        "quiz": None,
+        "audio_path": None,
+        "ready": [],
+        "content_hash": "hash",
+        "error": None
+    })
+
+    async def run():
+        try:
+            await pipeline.process_video_task("task", str(tmp_path / "lecture.mp4"))
+        finally:
+            await pipeline.ai_generator.close()
+
+    asyncio.run(run())
+
+    task = pipeline.tasks.get("task")
+    assert task["error"] is None
+    assert task["status"] == ProcessingStatus.COMPLETED.value
+    assert task["transcript"] == TRANSCRIPT
+    assert set(task["ready"]) == {"transcript", "notes", "quiz", "audio"}
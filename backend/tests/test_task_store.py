@@ -0,0 +1,92 @@
+"""Task expiry, restart recovery and transaction rollback, for both task stores."""
+import sqlite3
+import time
+
+import pytest
+
+from app.models import ProcessingStatus
+from app.services.task_store import MemoryTaskStore, SQLiteTaskStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryTaskStore()
+    return SQLiteTaskStore(str(tmp_path / "tasks.db"))
+
+
+def add(store, task_id: str, status, **fields):
+    store.create(task_id, {"status": status, "progress": 0, "error": None, **fields})
+
+
+def test_expire_removes_only_old_finished_tasks(store):
+    add(store, "done", "completed")
+    add(store, "failed", ProcessingStatus.FAILED)
+    add(store, "running", ProcessingStatus.TRANSCRIBING)
+    time.sleep(0.01)
+    cutoff = time.time()
+    time.sleep(0.01)
+    add(store, "recent", "completed")
+
+    expired = store.expire(cutoff)
+
+    assert sorted(task["task_id"] for task in expired) == ["done", "failed"]
+    assert "done" not in store and "failed" not in store
+    assert "running" in store and "recent" in store
+    assert store.expire(cutoff) == []
+
+
+def test_fail_unfinished_fails_interrupted_lectures_only(store):
+    add(store, "running", ProcessingStatus.GENERATING_NOTES, progress=60)
+    add(store, "pending", "pending")
+    add(store, "done", "completed", progress=100)
+    add(store, "batch", "pending", kind="batch")
+    notified = []
+    store.add_listener(notified.append)
+
+    failed = store.fail_unfinished("Interrupted by a restart")
+
+    assert sorted(task["task_id"] for task in failed) == ["pending", "running"]
+    assert sorted(notified) == ["pending", "running"]
+    task = store.get("running")
+    assert task["status"] == "failed"
+    assert task["error"] == "Interrupted by a restart"
+    assert task["progress"] == 60
+    assert store.get("done")["status"] == "completed"
+    assert store.get("batch")["status"] == "pending"
+    # Failed tasks can then expire
+    assert len(store.expire(time.time() + 1)) == 3
+
+
+class FailingConnection:
+    """Wraps a sqlite3 connection and fails the first DELETE statement."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.failed = False
+
+    def execute(self, sql, *args):
+        if sql.startswith("DELETE") and not self.failed:
+            self.failed = True
+            raise sqlite3.OperationalError("disk I/O error")
+        return self.conn.execute(sql, *args)
+
+
+@pytest.mark.parametrize("remove", [
+    lambda store: store.delete("done"),
+    lambda store: store.expire(time.time() + 1)
+])
+def test_failed_removal_rolls_back(tmp_path, remove):
+    store = SQLiteTaskStore(str(tmp_path / "tasks.db"))
+    add(store, "done", "completed")
+    store._conn = FailingConnection(store._conn)
+
+    with pytest.raises(sqlite3.OperationalError):
+        remove(store)
+
+    # The transaction was rolled back, so the store stays usable
+    assert "done" in store
+    store.update("done", progress=100)
+    assert store.get("done")["progress"] == 100
+    assert remove(store)
+    assert "done" not in store
@@ -0,0 +1,106 @@
+"""TTSService chunked synthesis, against a local fake backend (no network)."""
+import asyncio
+import os
+
+import pytest
+
+from app.config import settings
+from app.services import ResultCache, TTSService
+
+NARRATION = " ".join(f"This is sentence number {i}." for i in range(6))
+
+
+class FakeBackend:
+    """Returns each chunk's text as its "audio", after an optional per-chunk delay."""
+
+    def __init__(self, delays=None, fail_on=None):
+        self.delays = delays or {}
+        self.fail_on = fail_on
+        self.active = 0
+        self.peak = 0
+        self.gates = {}  # Chunk text -> asyncio.Event it waits for
+
+    async def synthesize(self, text: str, voice: str) -> bytes:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(text, 0.01))
+            if text in self.gates:
+                await self.gates[text].wait()
+            if text == self.fail_on:
+                raise RuntimeError("synthesis failed")
+            return f"[{text}]".encode()
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def make_service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "tts_chunk_chars", 40)  # One sentence per chunk
+
+    def make(backend: FakeBackend, max_concurrency: int = 4) -> TTSService:
+        service = TTSService(backend=backend, phrase_cache=ResultCache(enabled=False))
+        service.output_dir = str(tmp_path)
+        service.max_concurrency = max_concurrency
+        return service
+
+    return make
+
+
+def test_chunks_are_joined_in_order(make_service):
+    service = make_service(FakeBackend())
+    chunks = service.split(NARRATION)
+    # Later chunks finish first
+    service.backend.delays = {chunk: 0.01 * (len(chunks) - i) for i, chunk in enumerate(chunks)}
+
+    path = asyncio.run(service.generate_audio(NARRATION, "task"))
+
+    with open(path, "rb") as f:
+        assert f.read() == b"".join(f"[{chunk}]".encode() for chunk in chunks)
+    assert len(chunks) == 6
+    assert not service.is_rendering("task")
+
+
+def test_concurrency_cap_is_respected(make_service):
+    backend = FakeBackend()
+    service = make_service(backend, max_concurrency=2)
+
+    asyncio.run(service.generate_audio(NARRATION, "task"))
+
+    assert backend.peak == 2
+
+
+def test_errors_are_propagated(make_service, tmp_path):
+    service = make_service(FakeBackend())
+    service.backend.fail_on = service.split(NARRATION)[3]
+
+    with pytest.raises(RuntimeError, match="synthesis failed"):
+        asyncio.run(service.generate_audio(NARRATION, "task"))
+
+    assert os.listdir(tmp_path) == []  # No partial or final file left behind
+    assert not service.is_rendering("task")
+
+
+def test_stream_yields_leading_chunks_first(make_service):
+    backend = FakeBackend()
+    service = make_service(backend)
+    chunks = service.split(NARRATION)
+
+    async def scenario():
+        release = asyncio.Event()
+        backend.gates = {chunk: release for chunk in chunks[1:]}
+        rendering = asyncio.create_task(service.generate_audio(NARRATION, "task"))
+        await asyncio.sleep(0)
+        assert service.is_rendering("task")
+
+        stream = service.stream("task")
+        # The first chunk arrives while the rest are still being synthesized
+        first = await asyncio.wait_for(stream.__anext__(), timeout=1)
+        assert not rendering.done()
+
+        release.set()
+        rest = [chunk async for chunk in stream]
+        await rendering
+        return [first] + rest
+
+    assert asyncio.run(scenario()) == [f"[{chunk}]".encode() for chunk in chunks]
@@ -0,0 +1,62 @@
+import asyncio
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services.video_processor import VideoProcessor
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+
+@pytest.fixture
+def lecture(tmp_path):
+    """A 3-second tone standing in for a lecture video."""
+    path = tmp_path / "lecture.wav"
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=3", "-y", str(path)],
+        check=True
+    )
+    return str(path)
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "output_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "ffmpeg_max_concurrency", 1)
+    monkeypatch.setattr(settings, "ffmpeg_max_streams", 1)
+    return VideoProcessor()
+
+
+def test_slow_consumer_does_not_time_out_stream(processor, lecture):
+    processor.stall_timeout = 2.0
+
+    async def consume():
+        blocks = []
+        async for block in processor.stream_audio(lecture, block_seconds=0.5):
+            blocks.append(block)
+            # Whisper taking its time: longer in total than the stall timeout
+            await asyncio.sleep(0.5)
+        return blocks
+
+    blocks = asyncio.run(consume())
+
+    assert sum(len(block) for block in blocks) == 3 * 16000
+    assert all(block.dtype == np.float32 for block in blocks)
+
+
+def test_stream_does_not_hold_ffmpeg_slot(processor, lecture):
+    async def run():
+        stream = processor.stream_audio(lecture, block_seconds=0.5)
+        await stream.__anext__()
+        try:
+            # The only ffmpeg slot stays free while the stream is open
+            return await asyncio.wait_for(processor.extract_audio(lecture, "task"), 10)
+        finally:
+            await stream.aclose()
+
+    audio_path = asyncio.run(run())
+
+    assert audio_path.endswith("task_audio.wav")
@@ -0,0 +1,126 @@
+"""
+Standalone pipeline worker.
+
+Claims jobs from the durable job queue and runs them through the same
+pipeline the API uses. Start as many of these as the hardware allows;
+they share the job queue, task store, uploads and outputs with the API.
+
+    JOB_QUEUE_ENABLED=true python worker.py
+"""
+import asyncio
+import os
+import signal
+import socket
+
+from app.api.routes import (
+    process_video_task,
+    tasks,
+    transcription_service,
+    ai_generator
+)
+from app.config import settings
+from app.models import ProcessingStatus
+from app.services import JobQueue, metrics
+
+
+class Worker:
+    """Claims queued jobs and runs up to worker_concurrency of them at once."""
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.queue = JobQueue()
+        self.concurrency = settings.worker_concurrency
+        self.running: set = set()
+        self.stopping = asyncio.Event()
+
+    async def run(self):
+        print(f"Worker {self.worker_id} started (concurrency {self.concurrency})")
+        transcription_service.start()
+
+        while not self.stopping.is_set():
+            self.fail_abandoned()
+            job = None
+            if len(self.running) < self.concurrency:
+                job = self.queue.claim(self.worker_id)
+
+            if job:
+                task = asyncio.create_task(self.handle(job))
+                self.running.add(task)
+                task.add_done_callback(self.running.discard)
+                continue
+
+            try:
+                await asyncio.wait_for(self.stopping.wait(), settings.worker_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+        # Let running jobs finish; anything killed later is re-leased elsewhere
+        print(f"Worker {self.worker_id} draining {len(self.running)} job(s)")
+        if self.running:
+            await asyncio.gather(*self.running, return_exceptions=True)
+        await transcription_service.shutdown()
+        await ai_generator.close()
+
+    async def handle(self, job: dict):
+        job_id, task_id = job["job_id"], job["task_id"]
+        heartbeat = asyncio.create_task(self.keep_leased(job_id))
+
+        try:
+            if job["attempts"] > 1:
+                tasks.update(
+                    task_id,
+                    status=ProcessingStatus.PENDING,
+                    error=None,
+                    current_step=f"Retrying (attempt {job['attempts']})..."
+                )
+
+            await process_video_task(task_id, job["payload"]["video_path"])
+
+            task = tasks.get(task_id)
+            if task and task["status"] == ProcessingStatus.FAILED:
+                if self.queue.fail(job_id, task.get("error") or "Unknown error"):
+                    tasks.update(
+                        task_id,
+                        status=ProcessingStatus.PENDING,
+                        current_step="Failed, will retry shortly..."
+                    )
+            else:
+                self.queue.complete(job_id)
+        except Exception as e:
+            self.queue.fail(job_id, str(e))
+        finally:
+            heartbeat.cancel()
+
+    def fail_abandoned(self):
+        """Fail the tasks of jobs whose workers kept dying on them."""
+        for job in self.queue.release_expired():
+            tasks.update(
+                job["task_id"],
+                status=ProcessingStatus.FAILED,
+                error=job["error"],
+                current_step=f"Error: {job['error']}"
+            )
+
+    async def keep_leased(self, job_id: str):
+        while True:
+            await asyncio.sleep(settings.job_lease_seconds / 3)
+            self.queue.heartbeat(job_id, self.worker_id)
+
+    def stop(self):
+        self.stopping.set()
+
+
+async def main():
+    metrics.configure_logging()
+    worker = Worker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            pass  # Windows
+    await worker.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -28,6 +28,7 @@ export interface StatusResponse {
   status: string;
   progress: number;
   current_step: string;
+  queue_position?: number | null;
 }
 
 export interface ResultsResponse {
@@ -66,6 +67,10 @@ export const api = {
     return response.json();
   },
 
+  getStatusStreamUrl(taskId: string): string {
+    return `${API_BASE_URL}/api/status/${taskId}/stream`;
+  },
+
   async getResults(taskId: string): Promise<ResultsResponse> {
     const response = await fetch(`${API_BASE_URL}/api/results/${taskId}`);
 
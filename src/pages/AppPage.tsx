@@ -4,7 +4,7 @@ import { VideoUploader } from "@/components/upload/VideoUploader";
 import { ProcessingState } from "@/components/results/ProcessingState";
 import { ResultsSection } from "@/components/results/ResultsSection";
 import { Footer } from "@/components/layout/Footer";
-import { api, NoteSection, QuizQuestion } from "@/lib/api";
+import { api, NoteSection, QuizQuestion, StatusResponse } from "@/lib/api";
 import { toast } from "sonner";
 
 type AppState = "idle" | "processing" | "complete";
@@ -74,14 +74,22 @@ const AppPage = () => {
   const [taskId, setTaskId] = useState<string | null>(null);
   const [results, setResults] = useState<Results | null>(null);
   const pollingRef = useRef<NodeJS.Timeout | null>(null);
+  const streamRef = useRef<EventSource | null>(null);
 
-  // Cleanup polling on unmount
+  const stopStatusUpdates = () => {
+    if (pollingRef.current) {
+      clearInterval(pollingRef.current);
+      pollingRef.current = null;
+    }
+    if (streamRef.current) {
+      streamRef.current.close();
+      streamRef.current = null;
+    }
+  };
+
+  // Cleanup polling and status stream on unmount
   useEffect(() => {
-    return () => {
-      if (pollingRef.current) {
-        clearInterval(pollingRef.current);
-      }
-    };
+    return stopStatusUpdates;
   }, []);
 
   const handleUploadComplete = (newTaskId: string) => {
@@ -95,69 +103,87 @@ const AppPage = () => {
   };
 
   const startPolling = (taskIdToCheck: string) => {
-    // Clear any existing polling
-    if (pollingRef.current) {
-      clearInterval(pollingRef.current);
-    }
+    // Clear any existing polling or stream
+    stopStatusUpdates();
+
+    const handleStatus = async (status: StatusResponse) => {
+      const stepIndex = statusToStepIndex[status.status] ?? -1;
+
+      // Update steps based on current status
+      setSteps((prev) =>
+        prev.map((s, i) => ({
+          ...s,
+          status: i < stepIndex ? "complete" : i === stepIndex ? "processing" : "pending",
+        }))
+      );
+      setCurrentStep(Math.max(0, stepIndex));
+
+      // Check if completed
+      if (status.status === "completed") {
+        stopStatusUpdates();
+
+        // Mark all steps as complete
+        setSteps((prev) => prev.map((s) => ({ ...s, status: "complete" })));
+
+        // Fetch results
+        const resultsData = await api.getResults(taskIdToCheck);
+        setResults({
+          notes: resultsData.notes,
+          quiz: resultsData.quiz,
+          audioUrl: api.getAudioUrl(taskIdToCheck),
+        });
+
+        setAppState("complete");
+        toast.success("Your study materials are ready!");
+      }
+
+      // Check if failed
+      if (status.status === "failed") {
+        stopStatusUpdates();
+        toast.error("Processing failed. Please try again.");
+        setAppState("idle");
+        setSteps(initialProcessingSteps.map((s) => ({ ...s, status: "pending" })));
+      }
+    };
 
     const pollStatus = async () => {
       try {
-        const status = await api.getStatus(taskIdToCheck);
-
-        const stepIndex = statusToStepIndex[status.status] ?? -1;
-
-        // Update steps based on current status
-        setSteps((prev) =>
-          prev.map((s, i) => ({
-            ...s,
-            status: i < stepIndex ? "complete" : i === stepIndex ? "processing" : "pending",
-          }))
-        );
-        setCurrentStep(Math.max(0, stepIndex));
-
-        // Check if completed
-        if (status.status === "completed") {
-          if (pollingRef.current) {
-            clearInterval(pollingRef.current);
-            pollingRef.current = null;
-          }
-
-          // Mark all steps as complete
-          setSteps((prev) => prev.map((s) => ({ ...s, status: "complete" })));
-
-          // Fetch results
-          const resultsData = await api.getResults(taskIdToCheck);
-          setResults({
-            notes: resultsData.notes,
-            quiz: resultsData.quiz,
-            audioUrl: api.getAudioUrl(taskIdToCheck),
-          });
-
-          setAppState("complete");
-          toast.success("Your study materials are ready!");
-        }
-
-        // Check if failed
-        if (status.status === "failed") {
-          if (pollingRef.current) {
-            clearInterval(pollingRef.current);
-            pollingRef.current = null;
-          }
-          toast.error("Processing failed. Please try again.");
-          setAppState("idle");
-          setSteps(initialProcessingSteps.map((s) => ({ ...s, status: "pending" })));
-        }
+        await handleStatus(await api.getStatus(taskIdToCheck));
       } catch (error) {
         console.error("Polling error:", error);
         // Don't show error toast for every poll failure - server might be busy processing
       }
     };
 
-    // Initial poll
-    pollStatus();
+    const startIntervalPolling = () => {
+      // Initial poll
+      pollStatus();
+
+      // Poll every 2 seconds
+      pollingRef.current = setInterval(pollStatus, 2000);
+    };
 
-    // Poll every 2 seconds
-    pollingRef.current = setInterval(pollStatus, 2000);
+    // Prefer server-pushed updates; fall back to polling if the stream fails
+    if (typeof EventSource === "undefined") {
+      startIntervalPolling();
+      return;
+    }
+
+    const source = new EventSource(api.getStatusStreamUrl(taskIdToCheck));
+    streamRef.current = source;
+
+    source.addEventListener("status", (event) => {
+      handleStatus(JSON.parse((event as MessageEvent).data)).catch((error) =>
+        console.error("Status stream error:", error)
+      );
+    });
+
+    source.onerror = () => {
+      if (streamRef.current !== source) return;
+      source.close();
+      streamRef.current = null;
+      startIntervalPolling();
+    };
   };
 
   const handleStartOver = () => {